@@ -3,15 +3,23 @@ ASR Processor Module
 Automatic Speech Recognition using NVIDIA Parakeet TDT model
 """
 
-import torch
-import nemo.collections.asr as nemo_asr
-import librosa
-import soundfile as sf
-import os
+import math
+import numpy as np
+import subprocess
+import threading
+import queue
 import gc
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Callable
 from pathlib import Path
 
+from lazy_imports import lazy_import
+from execution_profile import is_cpu, quantize_linear_layers, resolve_device
+from model_residency import module_footprint
+from pipeline_tracing import span
+
+torch = lazy_import('torch')
+librosa = lazy_import('librosa')
+
 
 class ASRProcessor:
     """
@@ -21,21 +29,54 @@ class ASRProcessor:
     def __init__(
         self,
         model_name: str = "nvidia/parakeet-tdt-0.6b-v2",
-        device: str = "cuda"
+        device: str = "auto",
+        use_cascade: bool = False,
+        cascade_model_name: str = "nvidia/parakeet-tdt_ctc-110m",
+        cascade_threshold: float = 0.85,
+        cascade_chunk_seconds: int = 30,
+        quantize: bool = False
     ):
         """
         Initialize ASR processor.
 
         Args:
             model_name: Pretrained ASR model name
-            device: Device to run on (cuda/cpu)
+            device: Device to run on (cuda/cpu, auto = cuda if available)
+            use_cascade: Transcribe with a small model first and re-decode
+                only low-confidence chunks with the large model
+            cascade_model_name: Small first-pass model used in cascade mode
+            cascade_threshold: Mean token confidence below which a chunk is
+                re-decoded with the large model
+            cascade_chunk_seconds: Chunk duration used for escalation decisions
+            quantize: On CPU, quantize the models' linear layers to int8
         """
         self.model_name = model_name
         self.device = device
+        self.use_cascade = use_cascade
+        self.cascade_model_name = cascade_model_name
+        self.cascade_threshold = cascade_threshold
+        self.cascade_chunk_seconds = cascade_chunk_seconds
+        self.quantize = quantize
+        self.sample_rate = 16000
         self.model = None
+        self.cascade_model = None
+        # Shards are transcribed from several threads; model calls are serialized
+        self._inference_lock = threading.Lock()
 
     def load_model(self):
-        """Load ASR model into memory."""
+        """
+        Load ASR model into memory.
+
+        In cascade mode only the small first-pass model is loaded here; the
+        large model is loaded on demand when the first chunk is escalated.
+        """
+        if self.use_cascade:
+            self._load_cascade_model()
+        else:
+            self._load_main_model()
+
+    def _load_main_model(self):
+        """Load the large ASR model."""
         if self.model is not None:
             print("Model already loaded")
             return
@@ -44,86 +85,304 @@ class ASRProcessor:
         if torch.cuda.is_available():
             torch.cuda.reset_peak_memory_stats()
 
-        self.model = nemo_asr.models.ASRModel.from_pretrained(
-            model_name = self.model_name
-        )
+        with span('asr.load_model', 'asr', model = self.model_name):
+            self.model = self._from_pretrained(self.model_name)
         print("ASR model loaded successfully")
 
+    def _load_cascade_model(self):
+        """Load the small first-pass model with token confidence enabled."""
+        if self.cascade_model is not None:
+            print("Cascade model already loaded")
+            return
+
+        print(f"Loading cascade ASR model: {self.cascade_model_name}")
+        if torch.cuda.is_available():
+            torch.cuda.reset_peak_memory_stats()
+
+        with span('asr.load_model', 'asr', model = self.cascade_model_name):
+            self.cascade_model = self._from_pretrained(self.cascade_model_name)
+
+        from nemo.collections.asr.parts.utils.asr_confidence_utils import (
+            ConfidenceConfig,
+            ConfidenceMethodConfig
+        )
+        from omegaconf import open_dict
+
+        # Greedy decoding with per-token confidence preserved in hypotheses
+        decoding_cfg = self.cascade_model.cfg.decoding
+        with open_dict(decoding_cfg):
+            decoding_cfg.strategy = "greedy_batch"
+            decoding_cfg.confidence_cfg = ConfidenceConfig(
+                preserve_token_confidence = True,
+                aggregation = "mean",
+                method_cfg = ConfidenceMethodConfig(
+                    name = "entropy",
+                    entropy_type = "tsallis",
+                    alpha = 0.5,
+                    entropy_norm = "exp"
+                )
+            )
+        self.cascade_model.change_decoding_strategy(decoding_cfg)
+        print("Cascade ASR model loaded successfully")
+
+    def _from_pretrained(self, model_name: str):
+        """Load a NeMo model onto the configured device (int8 linear layers on CPU if enabled)."""
+        import nemo.collections.asr as nemo_asr
+
+        device = resolve_device(self.device)
+        model = nemo_asr.models.ASRModel.from_pretrained(
+            model_name = model_name,
+            map_location = torch.device(device)
+        ).eval()
+        if self.quantize and is_cpu(device):
+            print(f"Quantizing linear layers of {model_name} to int8")
+            quantize_linear_layers(model)
+        return model
+
     def unload_model(self):
         """Unload model to free memory."""
+        if self.model is None and self.cascade_model is None:
+            return
+
         if self.model is not None:
             del self.model
             self.model = None
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
-            gc.collect()
-            print("ASR model unloaded")
+        if self.cascade_model is not None:
+            del self.cascade_model
+            self.cascade_model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.synchronize()
+        gc.collect()
+        print("ASR model unloaded")
 
-    def _auto_split_transcribe(
+    def is_loaded(self) -> bool:
+        """Whether any ASR model is in memory."""
+        return self.model is not None or self.cascade_model is not None
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """Bytes held by the loaded models, split into 'ram_bytes' and 'vram_bytes'."""
+        return module_footprint(self.model, self.cascade_model)
+
+    def _decode_audio_stream(
         self,
         input_file: str,
-        chunk_seconds: int = 300,
-        batch_size: int = 3,
-        temp_dir: str = "temp_chunks"
-    ) -> Optional[str]:
+        chunk_seconds: float,
+        follow: bool = False,
+        idle_timeout: float = 30.0,
+        start: float = 0.0,
+        duration: Optional[float] = None
+    ) -> Iterator[Dict[str, any]]:
         """
-        Split audio file and transcribe in batches.
+        Decode the audio track of any container into 16 kHz mono chunks.
+
+        ffmpeg streams raw float32 PCM through a pipe, so video files (MP4
+        screen recordings etc.) are read directly without an intermediate
+        audio file. Falls back to librosa when ffmpeg is not installed.
 
         Args:
-            input_file: Input audio file path
+            input_file: Input audio or video file path
             chunk_seconds: Chunk duration in seconds
-            batch_size: Batch size for processing
-            temp_dir: Temporary directory for chunks
-
-        Returns:
-            Full transcript or None if no splitting needed
+            follow: Keep reading at end of file while the file is still growing
+            idle_timeout: In follow mode, stop after this many seconds without new data
+            start: Seconds into the file to start decoding at
+            duration: Seconds to decode (None = to the end)
+
+        Yields:
+            Dicts with 'audio' (float32 samples), 'start' and 'end' (seconds
+            from the start of the file)
         """
-        print(f"Loading audio file: {input_file}")
+        chunk_samples = int(chunk_seconds * self.sample_rate)
+        cmd = ['ffmpeg', '-nostdin', '-v', 'error']
+        if follow:
+            cmd += ['-follow', '1', '-rw_timeout', str(int(idle_timeout * 1e6))]
+        if start:
+            cmd += ['-ss', f"{start:.3f}"]
+        if duration is not None:
+            cmd += ['-t', f"{duration:.3f}"]
+        cmd += [
+            '-i', input_file,
+            '-vn', '-ac', '1', '-ar', str(self.sample_rate),
+            '-f', 'f32le', 'pipe:1'
+        ]
 
-        # Load audio file as mono
-        audio, sr = librosa.load(input_file, sr = None, mono = True)
-        total_duration = len(audio) / sr
-
-        print(f"Total duration: {total_duration:.1f}s ({total_duration/60:.1f}min)")
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdout = subprocess.PIPE,
+                stderr = subprocess.PIPE
+            )
+        except FileNotFoundError:
+            if follow:
+                raise RuntimeError("ffmpeg is required to follow a growing recording")
+            print("ffmpeg not found, decoding with librosa instead")
+            with span('asr.decode', 'asr') as args:
+                audio, _ = librosa.load(
+                    input_file, sr = self.sample_rate, mono = True, offset = start, duration = duration
+                )
+                args['seconds'] = len(audio) / self.sample_rate
+            for offset in range(0, len(audio), chunk_samples):
+                yield self._make_chunk(audio[offset:offset + chunk_samples], offset, start)
+            return
 
-        # If file is short enough, don't split
-        if total_duration <= chunk_seconds:
-            print("File is short enough, no splitting needed")
-            return None
+        offset = 0
+        try:
+            while True:
+                with span('asr.decode', 'asr') as args:
+                    data = process.stdout.read(chunk_samples * 4)
+                    args['seconds'] = len(data) // 4 / self.sample_rate
+                if len(data) < 4:
+                    break
+                audio = np.frombuffer(data[:len(data) // 4 * 4], dtype = np.float32)
+                yield self._make_chunk(audio, offset, start)
+                offset += len(audio)
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors = 'replace')
+            process.stderr.close()
+            process.wait()
+
+        if process.returncode != 0 and offset == 0:
+            raise RuntimeError(f"ffmpeg could not decode {input_file}: {stderr.strip()}")
+
+    def read_audio(self, audio_path: str, start: float = 0.0, duration: Optional[float] = None) -> np.ndarray:
+        """
+        Decode (part of) a recording to 16 kHz mono float32 samples.
 
-        # Create temp directory
-        os.makedirs(temp_dir, exist_ok = True)
+        Args:
+            audio_path: Path to audio or video file
+            start: Seconds into the file to start at
+            duration: Seconds to decode (None = to the end)
 
-        # Split audio
-        chunk_samples = chunk_seconds * sr
-        chunk_files = []
+        Returns:
+            Samples at self.sample_rate
+        """
+        chunks = [
+            chunk["audio"]
+            for chunk in self._decode_audio_stream(audio_path, 60, start = start, duration = duration)
+        ]
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype = np.float32)
+
+    def _make_chunk(self, audio: np.ndarray, offset: int, start: float = 0.0) -> Dict[str, any]:
+        """Wrap chunk samples with their position in the recording."""
+        return {
+            "audio": audio,
+            "start": start + offset / self.sample_rate,
+            "end": start + (offset + len(audio)) / self.sample_rate
+        }
 
-        print(f"Splitting into {chunk_seconds}s chunks...")
+    def _prefetch(
+        self,
+        iterator: Iterator,
+        max_pending: int
+    ) -> Iterator:
+        """
+        Run an iterator in a background thread.
 
-        chunk_num = 0
-        for i in range(0, len(audio), chunk_samples):
-            chunk = audio[i:i + chunk_samples]
+        Keeps up to `max_pending` items decoded ahead of the consumer, so that
+        ffmpeg decoding overlaps with model inference.
+        """
+        pending = queue.Queue(maxsize = max_pending)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pending.put(item, timeout = 0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                for item in iterator:
+                    if not put((item, None)):
+                        break
+            except BaseException as e:
+                put((None, e))
+            finally:
+                if hasattr(iterator, 'close'):
+                    iterator.close()
+                put((done, None))
+
+        worker = threading.Thread(target = producer, daemon = True)
+        worker.start()
 
-            # Skip chunks shorter than 1 second
-            if len(chunk) < sr:
-                continue
+        try:
+            while True:
+                item, error = pending.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+    def _iter_chunk_batches(
+        self,
+        input_file: str,
+        chunk_seconds: int,
+        batch_size: int,
+        start: float = 0.0,
+        duration: Optional[float] = None
+    ) -> Iterator[List[Dict[str, any]]]:
+        """
+        Yield batches of decoded chunks, decoding ahead in the background.
 
-            chunk_num += 1
-            chunk_file = os.path.join(temp_dir, f"chunk_{chunk_num:03d}.wav")
+        Trailing chunks shorter than 1 second are skipped, as before.
+        """
+        chunks = self._prefetch(
+            self._decode_audio_stream(input_file, chunk_seconds, start = start, duration = duration),
+            max_pending = batch_size * 2
+        )
 
-            # Save chunk
-            sf.write(chunk_file, chunk, sr)
-            chunk_files.append(chunk_file)
+        batch = []
+        for chunk_num, chunk in enumerate(chunks):
+            if chunk_num > 0 and len(chunk["audio"]) < self.sample_rate:
+                continue
+            batch.append(chunk)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _chunked_transcribe(
+        self,
+        input_file: str,
+        chunk_seconds: int = 300,
+        batch_size: int = 3,
+        words: Optional[List[Dict[str, any]]] = None,
+        start: float = 0.0,
+        duration: Optional[float] = None
+    ) -> str:
+        """
+        Stream audio through ffmpeg and transcribe it chunk by chunk.
 
-            chunk_duration = len(chunk) / sr
-            print(f"Chunk {chunk_num}: {chunk_duration:.1f}s")
+        Args:
+            input_file: Input audio or video file path
+            chunk_seconds: Chunk duration in seconds
+            batch_size: Batch size for processing
+            words: Optional list that receives word timestamps (in seconds
+                from the start of the file)
+            start: Seconds into the file to start at
+            duration: Seconds to transcribe (None = to the end)
 
-        print(f"Total {len(chunk_files)} chunks created")
-        print(f"Processing with batch size {batch_size}")
+        Returns:
+            Full transcript
 
-        # Batch processing
-        print("Starting batch processing...")
+        Raises:
+            Exception: Decoding or model errors (e.g. CUDA out of memory),
+                after GPU memory has been released
+        """
+        print(f"Streaming audio from: {input_file}")
+        print(f"Processing {chunk_seconds}s chunks with batch size {batch_size}")
 
         # Clear GPU memory
         if torch.cuda.is_available():
@@ -131,20 +390,27 @@ class ASRProcessor:
             torch.cuda.synchronize()
         gc.collect()
 
-        try:
-            # Process all chunks at once with batch_size
-            with torch.no_grad():
-                outputs = self.model.transcribe(
-                    chunk_files,
-                    batch_size = batch_size
-                )
+        transcripts = []
+        total_duration = 0.0
 
-            # Extract transcripts
-            transcripts = []
-            for idx, output in enumerate(outputs, 1):
-                transcript = output.text if hasattr(output, 'text') else str(output)
-                transcripts.append(transcript)
-                print(f"Chunk {idx}/{len(chunk_files)}: {len(transcript)} characters")
+        try:
+            for batch in self._iter_chunk_batches(input_file, chunk_seconds, batch_size, start, duration):
+                with span('asr.transcribe_batch', 'asr', chunks = len(batch),
+                          seconds = sum(chunk["end"] - chunk["start"] for chunk in batch)), \
+                        self._inference_lock, torch.no_grad():
+                    outputs = self.model.transcribe(
+                        [chunk["audio"] for chunk in batch],
+                        batch_size = batch_size,
+                        timestamps = words is not None
+                    )
+
+                for chunk, output in zip(batch, outputs):
+                    transcript = output.text if hasattr(output, 'text') else str(output)
+                    transcripts.append(transcript)
+                    if words is not None:
+                        words.extend(self._chunk_words(output, chunk["start"]))
+                    total_duration = chunk["end"]
+                    print(f"Chunk {len(transcripts)} [{chunk['start']:.0f}s-{chunk['end']:.0f}s]: {len(transcript)} characters")
 
             # Show GPU memory usage
             if torch.cuda.is_available():
@@ -155,73 +421,218 @@ class ASRProcessor:
             print(f"Batch processing error: {e}")
             print(f"Error type: {type(e).__name__}")
 
-            # Clean up on error
+            # Clean up on error; the caller must not mistake a failure for an empty transcript
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
                 torch.cuda.synchronize()
             gc.collect()
+            raise
 
-            return ""
-
-        # Clean up temp files
-        print("\nCleaning up temporary files...")
-        for chunk_file in chunk_files:
-            try:
-                os.remove(chunk_file)
-            except:
-                pass
-
-        try:
-            os.rmdir(temp_dir)
-        except:
-            pass
+        print(f"Total duration: {total_duration - start:.1f}s ({(total_duration - start)/60:.1f}min)")
 
         # Merge results
         full_transcript = ' '.join(filter(None, transcripts))
         return full_transcript
 
+    def _chunk_words(self, output, chunk_start: float) -> List[Dict[str, any]]:
+        """Word timestamps of one chunk, shifted to file time."""
+        timestamp = getattr(output, 'timestamp', None) or {}
+        return [
+            {
+                "word": word["word"],
+                "start": round(chunk_start + word["start"], 3),
+                "end": round(chunk_start + word["end"], 3)
+            }
+            for word in timestamp.get("word", [])
+        ]
+
+    def _chunk_confidence(self, hypothesis) -> float:
+        """
+        Mean token confidence of a hypothesis.
+
+        Chunks without any decoded tokens (silence) count as fully confident
+        so that they are never escalated.
+        """
+        token_confidence = getattr(hypothesis, 'token_confidence', None)
+        if not token_confidence:
+            return 1.0
+        return float(np.mean([float(c) for c in token_confidence]))
+
+    def _cascade_transcribe(
+        self,
+        input_file: str,
+        chunk_seconds: Optional[float] = None,
+        batch_size: int = 4,
+        words: Optional[List[Dict[str, any]]] = None,
+        start: float = 0.0,
+        duration: Optional[float] = None
+    ) -> tuple:
+        """
+        Transcribe with the small model and re-decode low-confidence chunks.
+
+        Every chunk is decoded by the cascade model first. Chunks whose mean
+        token confidence falls below `cascade_threshold` are decoded again by
+        the large model and their text replaces the first-pass result. Only
+        escalated chunks are kept in memory until the second pass.
+
+        Args:
+            input_file: Input audio or video file path
+            chunk_seconds: Chunk duration, i.e. the granularity of escalation
+                decisions (None = cascade_chunk_seconds)
+            batch_size: Batch size for processing
+            words: Optional list that receives word timestamps (in seconds
+                from the start of the file)
+            start: Seconds into the file to start at
+            duration: Seconds to transcribe (None = to the end)
+
+        Returns:
+            Tuple of (full transcript, cascade report)
+        """
+        chunk_seconds = chunk_seconds or self.cascade_chunk_seconds
+        print(f"Streaming audio from: {input_file}")
+        print(f"First pass with {self.cascade_model_name} ({chunk_seconds}s chunks)...")
+
+        chunks = []
+        transcripts = []
+        chunk_words = []
+        escalated = []
+
+        for batch in self._iter_chunk_batches(input_file, chunk_seconds, batch_size, start, duration):
+            with span('asr.cascade_batch', 'asr', chunks = len(batch),
+                      seconds = sum(chunk["end"] - chunk["start"] for chunk in batch)), \
+                    self._inference_lock, torch.no_grad():
+                hypotheses = self.cascade_model.transcribe(
+                    [chunk["audio"] for chunk in batch],
+                    batch_size = batch_size,
+                    return_hypotheses = True,
+                    timestamps = words is not None
+                )
+            if isinstance(hypotheses, tuple):
+                hypotheses = hypotheses[0]
+
+            for chunk, hypothesis in zip(batch, hypotheses):
+                chunk["confidence"] = round(self._chunk_confidence(hypothesis), 4)
+                chunk["escalated"] = chunk["confidence"] < self.cascade_threshold
+                if chunk["escalated"]:
+                    escalated.append(len(chunks))
+                else:
+                    del chunk["audio"]
+                chunks.append(chunk)
+                transcripts.append(hypothesis.text)
+                chunk_words.append(self._chunk_words(hypothesis, chunk["start"]))
+
+        # Second pass: large model on low-confidence chunks only
+        if escalated:
+            print(f"Re-decoding {len(escalated)}/{len(chunks)} chunks with {self.model_name}...")
+            with span('asr.escalate', 'asr', chunks = len(escalated)), \
+                    self._inference_lock, torch.no_grad():
+                if self.model is None:
+                    self._load_main_model()
+                outputs = self.model.transcribe(
+                    [chunks[idx].pop("audio") for idx in escalated],
+                    batch_size = batch_size,
+                    timestamps = words is not None
+                )
+            for idx, output in zip(escalated, outputs):
+                transcripts[idx] = output.text if hasattr(output, 'text') else str(output)
+                chunk_words[idx] = self._chunk_words(output, chunks[idx]["start"])
+
+        if words is not None:
+            for entries in chunk_words:
+                words.extend(entries)
+
+        # Escalation report
+        transcribed_seconds = sum(chunk["end"] - chunk["start"] for chunk in chunks)
+        escalated_seconds = sum(
+            chunk["end"] - chunk["start"] for chunk in chunks if chunk["escalated"]
+        )
+        report = {
+            "small_model": self.cascade_model_name,
+            "large_model": self.model_name,
+            "threshold": self.cascade_threshold,
+            "chunk_seconds": chunk_seconds,
+            "total_chunks": len(chunks),
+            "escalated_chunks": len(escalated),
+            "total_seconds": round(transcribed_seconds, 3),
+            "escalated_seconds": round(escalated_seconds, 3),
+            "escalated_fraction": round(escalated_seconds / transcribed_seconds, 4) if transcribed_seconds else 0.0,
+            "chunks": [
+                {
+                    "start": round(chunk["start"], 3),
+                    "end": round(chunk["end"], 3),
+                    "confidence": chunk["confidence"],
+                    "escalated": chunk["escalated"]
+                }
+                for chunk in chunks
+            ]
+        }
+
+        print(f"\nCascade: escalated {report['escalated_chunks']}/{report['total_chunks']} chunks "
+              f"({report['escalated_fraction'] * 100:.1f}% of audio)")
+
+        full_transcript = ' '.join(filter(None, transcripts))
+        return full_transcript, report
+
     def transcribe(
         self,
         audio_path: str,
-        chunk_seconds: int = 300,
+        chunk_seconds: Optional[int] = None,
         batch_size: int = 4,
-        output_path: Optional[str] = None
+        output_path: Optional[str] = None,
+        word_timestamps: bool = False,
+        start: float = 0.0,
+        duration: Optional[float] = None
     ) -> Dict[str, any]:
         """
         Transcribe audio file with automatic chunking.
 
+        Safe to call from several threads (e.g. one per shard): decoding runs
+        concurrently, but model calls are serialized by one lock, so threads
+        do not speed up inference.
+
         Args:
-            audio_path: Path to audio file
-            chunk_seconds: Chunk duration for long files
+            audio_path: Path to audio or video file (any container ffmpeg can read)
+            chunk_seconds: Chunk duration for long files (None = 300s, or
+                cascade_chunk_seconds in cascade mode)
             batch_size: Batch size for processing (adjust based on VRAM)
             output_path: Optional path to save transcript
+            word_timestamps: Also return per-word start/end times under 'words'
+            start: Seconds into the file to start at (timestamps stay file times)
+            duration: Seconds to transcribe (None = to the end)
 
         Returns:
             Dictionary with transcript and metadata
         """
-        if self.model is None:
+        if self.use_cascade:
+            if self.cascade_model is None:
+                self.load_model()
+        elif self.model is None:
             self.load_model()
 
         print("="*60)
         print("ASR Transcription")
         print("="*60)
 
-        # Try auto-split transcription
-        split_result = self._auto_split_transcribe(
-            audio_path,
-            chunk_seconds = chunk_seconds,
-            batch_size = batch_size
-        )
-
-        if split_result is None:
-            # Process original file directly
-            print("Processing original file directly:")
-            with torch.no_grad():
-                output = self.model.transcribe([audio_path])
-            transcript = output[0].text
+        cascade_report = None
+        words = [] if word_timestamps else None
+        if self.use_cascade:
+            transcript, cascade_report = self._cascade_transcribe(
+                audio_path,
+                chunk_seconds = chunk_seconds,
+                batch_size = batch_size,
+                words = words,
+                start = start,
+                duration = duration
+            )
         else:
-            # Use split result
-            transcript = split_result
+            transcript = self._chunked_transcribe(
+                audio_path,
+                chunk_seconds = chunk_seconds or 300,
+                batch_size = batch_size,
+                words = words,
+                start = start,
+                duration = duration
+            )
 
         print()
         print("="*60)
@@ -245,9 +656,259 @@ class ASRProcessor:
             "audio_path": audio_path,
             "length": len(transcript)
         }
+        if cascade_report is not None:
+            result["cascade"] = cascade_report
+        if words is not None:
+            result["words"] = words
 
         return result
 
+    def create_session(
+        self,
+        chunk_seconds: float = 30,
+        on_segment: Optional[Callable[[Dict[str, any]], None]] = None,
+        overlap_seconds: float = 2.0
+    ) -> "ASRStreamingSession":
+        """
+        Start an incremental transcription session.
+
+        Args:
+            chunk_seconds: Audio duration transcribed per step
+            on_segment: Optional callback for each finalized segment
+            overlap_seconds: Audio shared by consecutive chunks, so that
+                words at chunk edges are transcribed whole
+
+        Returns:
+            ASRStreamingSession accepting audio blocks via feed()
+        """
+        with self._inference_lock:
+            if self.model is None:
+                self._load_main_model()
+        return ASRStreamingSession(
+            self,
+            chunk_seconds = chunk_seconds,
+            on_segment = on_segment,
+            overlap_seconds = overlap_seconds
+        )
+
+    def follow(
+        self,
+        audio_path: str,
+        chunk_seconds: float = 30,
+        idle_timeout: float = 30.0,
+        on_segment: Optional[Callable[[Dict[str, any]], None]] = None,
+        output_path: Optional[str] = None,
+        overlap_seconds: float = 2.0
+    ) -> Dict[str, any]:
+        """
+        Transcribe a recording that is still being written.
+
+        The file is read with ffmpeg in follow mode, so new audio is picked
+        up as the recorder appends it. Finalized segments are emitted through
+        `on_segment` as soon as each chunk is transcribed. The container must
+        be streamable (WAV, MKV, MPEG-TS, Ogg, fragmented MP4).
+
+        Args:
+            audio_path: Path to the growing recording
+            chunk_seconds: Audio duration transcribed per step
+            idle_timeout: Stop after this many seconds without new data
+            on_segment: Optional callback for each finalized segment
+            output_path: Optional path to save the final transcript
+            overlap_seconds: Audio shared by consecutive chunks
+
+        Returns:
+            Dictionary with transcript, segments and metadata
+        """
+        session = self.create_session(
+            chunk_seconds = chunk_seconds,
+            on_segment = on_segment,
+            overlap_seconds = overlap_seconds
+        )
+
+        print("="*60)
+        print(f"Following recording: {audio_path}")
+        print("="*60)
+
+        blocks = self._prefetch(
+            self._decode_audio_stream(
+                audio_path,
+                chunk_seconds = 1.0,
+                follow = True,
+                idle_timeout = idle_timeout
+            ),
+            max_pending = max(1, math.ceil(chunk_seconds * 2))
+        )
+        for block in blocks:
+            session.feed(block["audio"])
+        session.finish()
+
+        transcript = session.transcript
+        if output_path:
+            Path(output_path).parent.mkdir(parents = True, exist_ok = True)
+            with open(output_path, "w", encoding = "utf-8") as f:
+                f.write(transcript)
+            print(f"\nTranscript saved to: {output_path}")
+
+        return {
+            "transcript": transcript,
+            "audio_path": audio_path,
+            "length": len(transcript),
+            "segments": session.segments
+        }
+
+
+class ASRStreamingSession:
+    """
+    Incremental transcription of audio that arrives in blocks.
+
+    Audio blocks of any size are buffered until a full chunk is available.
+    Consecutive chunks overlap by overlap_seconds, and each word is taken
+    from the chunk in which its midpoint lies before the middle of that
+    overlap. A word cut at the edge of one chunk is therefore read whole
+    from the neighbouring chunk, and no word is emitted twice. Each
+    completed chunk is transcribed immediately and its words are emitted as
+    finalized segments with timestamps relative to the session start.
+    """
+
+    def __init__(
+        self,
+        processor: ASRProcessor,
+        chunk_seconds: float = 30,
+        on_segment: Optional[Callable[[Dict[str, any]], None]] = None,
+        overlap_seconds: float = 2.0
+    ):
+        """
+        Initialize streaming session.
+
+        Args:
+            processor: ASRProcessor with the model loaded
+            chunk_seconds: Audio duration transcribed per step
+            on_segment: Optional callback for each finalized segment
+            overlap_seconds: Audio shared by consecutive chunks (at most
+                half a chunk)
+        """
+        self.processor = processor
+        self.chunk_samples = int(chunk_seconds * processor.sample_rate)
+        self.overlap_samples = min(int(overlap_seconds * processor.sample_rate), self.chunk_samples // 2)
+        self.on_segment = on_segment
+        self.segments = []
+        self._buffer = []
+        self._buffered = 0
+        self._offset = 0
+        # Session time up to which words have been emitted
+        self._emitted_until = 0.0
+
+    @property
+    def transcript(self) -> str:
+        """Finalized transcript so far."""
+        return ' '.join(filter(None, (segment["text"] for segment in self.segments)))
+
+    def feed(self, audio: np.ndarray) -> List[Dict[str, any]]:
+        """
+        Add a block of 16 kHz mono audio.
+
+        Args:
+            audio: Audio samples (any length)
+
+        Returns:
+            Segments finalized by this call
+        """
+        self._buffer.append(np.asarray(audio, dtype = np.float32))
+        self._buffered += len(audio)
+
+        finalized = []
+        while self._buffered >= self.chunk_samples:
+            buffered = np.concatenate(self._buffer)
+            chunk = buffered[:self.chunk_samples]
+            # The next chunk starts overlap_samples before this one ends
+            rest = buffered[self.chunk_samples - self.overlap_samples:]
+            self._buffer = [rest] if len(rest) else []
+            self._buffered = len(rest)
+            finalized.extend(self._transcribe_chunk(chunk, final = False))
+        return finalized
+
+    def finish(self) -> List[Dict[str, any]]:
+        """
+        Transcribe any remaining buffered audio.
+
+        The remainder always includes the end of the last chunk past its
+        cut, so it is transcribed however short it is.
+
+        Returns:
+            Segments finalized by this call
+        """
+        buffered_until = (self._offset + self._buffered) / self.processor.sample_rate
+        if self._buffered == 0 or buffered_until <= self._emitted_until:
+            self._buffer = []
+            self._buffered = 0
+            return []
+
+        chunk = np.concatenate(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        return self._transcribe_chunk(chunk, final = True)
+
+    def _transcribe_chunk(self, chunk: np.ndarray, final: bool) -> List[Dict[str, any]]:
+        """Transcribe one chunk and emit the words it owns as segments."""
+        sr = self.processor.sample_rate
+        chunk_start = self._offset / sr
+        chunk_end = (self._offset + len(chunk)) / sr
+        # Words past the middle of the overlap belong to the next chunk
+        cut = float('inf') if final else chunk_end - self.overlap_samples / sr / 2
+        self._offset += len(chunk) if final else len(chunk) - self.overlap_samples
+
+        with span('asr.stream_chunk', 'asr', seconds = round(len(chunk) / sr, 3)), \
+                self.processor._inference_lock, torch.no_grad():
+            # Very short remainders are padded with silence for the model
+            audio = np.pad(chunk, (0, max(0, sr // 2 - len(chunk))))
+            output = self.processor.model.transcribe([audio], timestamps = True)[0]
+
+        # Word timestamps when the model provides them, else segment or chunk level
+        timestamp = getattr(output, 'timestamp', None) or {}
+        entries = [
+            {"text": word["word"], "start": word["start"], "end": word["end"]}
+            for word in self.processor._chunk_words(output, chunk_start)
+        ]
+        if not entries:
+            entries = [
+                {
+                    "text": segment["segment"],
+                    "start": round(chunk_start + segment["start"], 3),
+                    "end": round(chunk_start + segment["end"], 3)
+                }
+                for segment in timestamp.get("segment", [])
+            ]
+        if not entries and output.text:
+            entries = [{"text": output.text, "start": round(chunk_start, 3), "end": round(chunk_end, 3)}]
+
+        owned = [
+            entry for entry in entries
+            if self._emitted_until <= (entry["start"] + entry["end"]) / 2 < cut
+        ]
+        if not final:
+            self._emitted_until = cut
+
+        # Group words into sentence segments
+        segments = []
+        current = []
+        for entry in owned:
+            current.append(entry)
+            if entry["text"].endswith(('.', '?', '!')) or entry is owned[-1]:
+                segments.append({
+                    "text": ' '.join(item["text"] for item in current),
+                    "start": current[0]["start"],
+                    "end": current[-1]["end"]
+                })
+                current = []
+
+        for segment in segments:
+            self.segments.append(segment)
+            print(f"[{segment['start']:.1f}s-{segment['end']:.1f}s] {segment['text']}")
+            if self.on_segment is not None:
+                self.on_segment(segment)
+
+        return segments
+
 
 if __name__ == "__main__":
     # Example usage
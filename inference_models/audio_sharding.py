@@ -0,0 +1,175 @@
+"""
+Audio Sharding Module
+Splits long recordings into time shards at pauses and stitches per-shard ASR results
+"""
+
+import json
+import math
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+librosa = lazy_import('librosa')
+
+
+def probe_duration(audio_path: str) -> float:
+    """
+    Duration of the audio track in seconds.
+
+    Uses ffprobe (container metadata, no decoding); falls back to librosa.
+    """
+    cmd = [
+        'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+        '-show_entries', 'stream=duration:format=duration', '-of', 'json', audio_path
+    ]
+    try:
+        completed = subprocess.run(cmd, capture_output = True, text = True, check = True)
+    except FileNotFoundError:
+        return float(librosa.get_duration(path = audio_path))
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffprobe could not read {audio_path}: {e.stderr.strip()}")
+
+    info = json.loads(completed.stdout or '{}')
+    for entry in info.get('streams', []) + [info.get('format', {})]:
+        try:
+            return float(entry['duration'])
+        except (KeyError, TypeError, ValueError):
+            continue
+    raise RuntimeError(f"Could not determine the duration of {audio_path}")
+
+
+def find_quiet_point(
+    audio: np.ndarray,
+    sample_rate: int,
+    frame_seconds: float = 0.025,
+    smooth_seconds: float = 0.5
+) -> float:
+    """
+    Offset (seconds) of the middle of the quietest stretch of audio.
+
+    Frame energies are averaged over smooth_seconds, so the cut lands inside
+    a pause rather than in a short dip between two words.
+
+    Args:
+        audio: Mono samples
+        sample_rate: Sample rate of audio
+        frame_seconds: Energy frame length
+        smooth_seconds: Length of the moving average over frames
+
+    Returns:
+        Offset from the start of audio in seconds
+    """
+    frame = max(1, int(frame_seconds * sample_rate))
+    num_frames = len(audio) // frame
+    if num_frames == 0:
+        return len(audio) / sample_rate / 2
+
+    frames = audio[:num_frames * frame].reshape(num_frames, frame).astype(np.float64)
+    energy = np.mean(frames ** 2, axis = 1)
+    width = max(1, min(num_frames, int(round(smooth_seconds / frame_seconds))))
+    smoothed = np.convolve(energy, np.ones(width) / width, mode = 'same')
+    return (int(np.argmin(smoothed)) + 0.5) * frame / sample_rate
+
+
+def plan_shards(
+    duration: float,
+    shard_seconds: float,
+    read_window: Optional[Callable[[float, float], np.ndarray]] = None,
+    sample_rate: int = 16000,
+    search_seconds: float = 30.0
+) -> List[Dict[str, float]]:
+    """
+    Split a recording into shards of about shard_seconds, cut at pauses.
+
+    The recording is divided into equally long shards; each cut is then
+    moved to the quietest point within search_seconds of its target. Only
+    the audio around the cuts is read, not the whole recording.
+
+    Args:
+        duration: Recording duration in seconds
+        shard_seconds: Maximum shard duration before cuts are moved
+        read_window: Function (start, duration) -> mono samples at
+            sample_rate; without it the cuts stay at their targets
+        sample_rate: Sample rate returned by read_window
+        search_seconds: How far a cut may move towards a pause
+
+    Returns:
+        List of dicts with 'index', 'start' and 'end' (seconds), covering
+        the recording without gaps
+    """
+    num_shards = max(1, math.ceil(duration / shard_seconds))
+    length = duration / num_shards
+    # Neighbouring search windows must not overlap
+    search_seconds = min(search_seconds, length / 3)
+
+    cuts = []
+    for k in range(1, num_shards):
+        target = k * length
+        cut = target
+        if read_window is not None and search_seconds > 0:
+            window_start = target - search_seconds
+            audio = read_window(window_start, 2 * search_seconds)
+            if len(audio):
+                cut = window_start + find_quiet_point(audio, sample_rate)
+        cuts.append(round(cut, 3))
+
+    edges = [0.0] + cuts + [round(duration, 3)]
+    return [
+        {"index": index, "start": start, "end": end}
+        for index, (start, end) in enumerate(zip(edges[:-1], edges[1:]))
+    ]
+
+
+def stitch_asr_results(
+    results: List[Dict[str, any]],
+    shards: List[Dict[str, float]]
+) -> Dict[str, any]:
+    """
+    Combine per-shard ASR results into the result of the whole recording.
+
+    Shards are transcribed with file timestamps, so words only need to be
+    concatenated. Cascade reports are summed.
+
+    Args:
+        results: ASRProcessor.transcribe() results, in shard order
+        shards: Shards the results belong to
+
+    Returns:
+        ASR result dictionary (as from transcribe) with an added 'shards' list
+    """
+    transcript = ' '.join(filter(None, (result['transcript'] for result in results)))
+    stitched = {
+        "transcript": transcript,
+        "audio_path": results[0]['audio_path'] if results else None,
+        "length": len(transcript),
+        "shards": [
+            {
+                "index": shard['index'],
+                "start": shard['start'],
+                "end": shard['end'],
+                "length": len(result['transcript'])
+            }
+            for shard, result in zip(shards, results)
+        ]
+    }
+
+    if any('words' in result for result in results):
+        stitched['words'] = [word for result in results for word in result.get('words', [])]
+
+    reports = [result['cascade'] for result in results if 'cascade' in result]
+    if reports:
+        total_seconds = sum(report['total_seconds'] for report in reports)
+        escalated_seconds = sum(report['escalated_seconds'] for report in reports)
+        stitched['cascade'] = {
+            **{key: reports[0][key] for key in ('small_model', 'large_model', 'threshold', 'chunk_seconds')},
+            "total_chunks": sum(report['total_chunks'] for report in reports),
+            "escalated_chunks": sum(report['escalated_chunks'] for report in reports),
+            "total_seconds": round(total_seconds, 3),
+            "escalated_seconds": round(escalated_seconds, 3),
+            "escalated_fraction": round(escalated_seconds / total_seconds, 4) if total_seconds else 0.0,
+            "chunks": [chunk for report in reports for chunk in report['chunks']]
+        }
+    return stitched
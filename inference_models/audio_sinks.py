@@ -0,0 +1,751 @@
+"""
+Audio Sink Module
+Incremental writers for synthesized lecture audio
+"""
+
+import os
+import json
+import math
+import queue
+import struct
+import subprocess
+import threading
+import numpy as np
+import soundfile as sf
+from typing import BinaryIO, Dict, Iterator, List, Optional
+from pathlib import Path
+
+from pipeline_checkpoint import atomic_write_json, atomic_write_text
+
+
+# Output extension and ffmpeg codec arguments per export format
+ENCODER_FORMATS = {
+    'opus': ('.opus', ['-c:a', 'libopus', '-b:a', '64k', '-compression_level', '10']),
+    'aac': ('.m4a', ['-c:a', 'aac', '-b:a', '192k', '-movflags', '+faststart'])
+}
+
+# Slide segment formats. Only AAC (ADTS packed audio) is a valid HLS media
+# segment; the others are written as plain files listed in the manifest.
+SEGMENT_FORMATS = {
+    'aac': ('.aac', ['-c:a', 'aac', '-b:a', '128k', '-f', 'adts']),
+    'opus': ENCODER_FORMATS['opus'],
+    'wav': ('.wav', None)
+}
+HLS_SEGMENT_FORMATS = ('aac',)
+
+# Silent samples ffmpeg's native AAC encoder emits before the first input sample
+AAC_PRIMING_SAMPLES = 1024
+AAC_FRAME_SAMPLES = 1024
+
+
+class AudioSink:
+    """
+    Base class for writers that receive lecture audio one sentence at a time.
+
+    The configured silence is inserted between consecutive sentences (never
+    after the last one), so only the current sentence is held in memory.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2
+    ):
+        """
+        Initialize audio sink.
+
+        Args:
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+        """
+        self.sample_rate = sample_rate
+        self.silence = np.zeros(int(silence_duration * sample_rate), dtype = np.float32)
+        self.sentences_written = 0
+        self.samples_written = 0
+
+    def write_sentence(self, info: Dict[str, any], audio: np.ndarray):
+        """
+        Append one sentence, preceded by silence unless it is the first.
+
+        Args:
+            info: Timestamp entry of the sentence
+            audio: Sentence audio samples
+        """
+        if self.sentences_written > 0 and len(self.silence):
+            self._write(self.silence)
+        self._write(np.asarray(audio, dtype = np.float32))
+        self.sentences_written += 1
+
+    def _write(self, samples: np.ndarray):
+        """Write float32 samples to the output."""
+        raise NotImplementedError
+
+    def close(self) -> Dict[str, any]:
+        """
+        Finish writing.
+
+        Returns:
+            Dictionary describing the written output
+        """
+        return {}
+
+    def abort(self):
+        """Stop writing after an error, discarding incomplete output."""
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class SoundFileSink(AudioSink):
+    """
+    Streaming writer backed by an open soundfile (libsndfile) handle.
+
+    Samples are written as soon as they arrive. Output goes to a temporary
+    sibling file that is renamed over `path` on close, so a previous file
+    stays readable while the new one is written.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2,
+        format: str = 'WAV',
+        subtype: str = 'PCM_16'
+    ):
+        """
+        Initialize soundfile sink.
+
+        Args:
+            path: Output file path
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+            format: libsndfile container format ('WAV', 'OGG', 'FLAC', ...)
+            subtype: libsndfile sample format ('PCM_16', 'FLOAT', 'OPUS', ...)
+        """
+        super().__init__(sample_rate, silence_duration)
+        self.path = path
+        self.temp_path = f"{path}.partial"
+        self.format = format
+        self.subtype = subtype
+        self.file: Optional[sf.SoundFile] = None
+
+    def _write(self, samples: np.ndarray):
+        if self.file is None:
+            Path(self.path).parent.mkdir(parents = True, exist_ok = True)
+            self.file = sf.SoundFile(
+                self.temp_path,
+                mode = 'w',
+                samplerate = self.sample_rate,
+                channels = 1,
+                format = self.format,
+                subtype = self.subtype
+            )
+        self.file.write(samples)
+        self.samples_written += len(samples)
+
+    def close(self) -> Dict[str, any]:
+        if self.file is None:
+            return {}
+
+        self.file.close()
+        self.file = None
+        os.replace(self.temp_path, self.path)
+        return {
+            "path": self.path,
+            "duration": self.samples_written / self.sample_rate,
+            "size_mb": os.path.getsize(self.path) / (1024 * 1024)
+        }
+
+    def abort(self):
+        if self.file is None:
+            return
+
+        self.file.close()
+        self.file = None
+        os.remove(self.temp_path)
+
+
+class WavSink(SoundFileSink):
+    """
+    Streaming WAV writer.
+
+    Samples are written as 16-bit PCM ('PCM_16') or 32-bit float ('FLOAT')
+    as soon as they arrive, so memory use is bounded by one sentence.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2,
+        subtype: str = 'PCM_16'
+    ):
+        """
+        Initialize WAV sink.
+
+        Args:
+            path: Output WAV file path
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+            subtype: WAV sample format ('PCM_16' or 'FLOAT')
+        """
+        super().__init__(path, sample_rate, silence_duration, format = 'WAV', subtype = subtype)
+
+
+class FfmpegEncoderSink(AudioSink):
+    """
+    Encoder that pipes PCM into an ffmpeg process as it is produced.
+
+    A feeder thread writes to ffmpeg's stdin from a bounded queue, so several
+    encoders run concurrently with synthesis and a slow encoder only blocks
+    once its queue is full. The file is encoded under a temporary name and
+    renamed on success.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        codec_args: List[str],
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2,
+        max_pending: int = 64
+    ):
+        """
+        Initialize ffmpeg encoder sink.
+
+        Args:
+            path: Output file path (extension selects the container)
+            codec_args: ffmpeg output codec arguments
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+            max_pending: Maximum number of buffered blocks per encoder
+
+        Raises:
+            FileNotFoundError: If ffmpeg is not installed
+        """
+        super().__init__(sample_rate, silence_duration)
+        self.path = path
+        root, ext = os.path.splitext(path)
+        self.temp_path = f"{root}.partial{ext}"
+        self.error = None
+
+        Path(path).parent.mkdir(parents = True, exist_ok = True)
+        self.process = subprocess.Popen(
+            [
+                'ffmpeg', '-y', '-nostdin', '-v', 'error',
+                '-f', 'f32le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0',
+                *codec_args,
+                self.temp_path
+            ],
+            stdin = subprocess.PIPE,
+            stdout = subprocess.DEVNULL,
+            stderr = subprocess.PIPE
+        )
+        self.pending = queue.Queue(maxsize = max_pending)
+        self.feeder = threading.Thread(target = self._feed, daemon = True)
+        self.feeder.start()
+
+    def _feed(self):
+        """Copy queued PCM blocks into ffmpeg's stdin."""
+        while True:
+            data = self.pending.get()
+            if data is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self.process.stdin.write(data)
+            except OSError as e:
+                self.error = e
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def _write(self, samples: np.ndarray):
+        self.pending.put(samples.astype('<f4').tobytes())
+        self.samples_written += len(samples)
+
+    def _finish(self) -> str:
+        """Stop feeding, wait for ffmpeg and return its error output."""
+        self.pending.put(None)
+        self.feeder.join()
+        stderr = self.process.stderr.read().decode(errors = 'replace')
+        self.process.stderr.close()
+        self.process.wait()
+        return stderr
+
+    def close(self) -> Dict[str, any]:
+        if self.process is None:
+            return {}
+
+        stderr = self._finish()
+        returncode = self.process.returncode
+        self.process = None
+
+        if returncode != 0 or self.samples_written == 0:
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            return {"path": self.path, "error": stderr.strip() or str(self.error)}
+
+        os.replace(self.temp_path, self.path)
+        return {
+            "path": self.path,
+            "duration": self.samples_written / self.sample_rate,
+            "size_mb": os.path.getsize(self.path) / (1024 * 1024)
+        }
+
+    def abort(self):
+        if self.process is None:
+            return
+
+        self.process.kill()
+        self._finish()
+        self.process = None
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+
+class SlideSegmentSink(AudioSink):
+    """
+    Writes lecture audio as short segments aligned to slide changes.
+
+    A new segment starts whenever the slide number changes, or when the
+    current segment would exceed `max_segment_seconds` (long slides are split
+    at sentence boundaries). The silence after a sentence belongs to the
+    segment it follows, so every segment starts at a sentence start.
+
+    With 'aac' the lecture is encoded as one continuous ADTS stream, which is
+    cut into HLS packed-audio segments on close. Each cut falls on the AAC
+    frame nearest its sentence boundary (within half a frame, 21 ms at
+    24 kHz). Encoder priming therefore occurs once at the start instead of
+    at every slide, and playback across segments is gapless. Every segment
+    begins with the ID3 timestamp tag that HLS requires of packed audio, and
+    the segments are listed in playlist.m3u8. 'opus' and 'wav' segments are
+    not valid HLS media segments; they are written as plain files. A JSON
+    manifest with slide numbers and time ranges is written for every format.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        segment_format: str = 'aac',
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2,
+        max_segment_seconds: Optional[float] = 20.0
+    ):
+        """
+        Initialize slide segment sink.
+
+        Args:
+            output_dir: Directory for segments, playlist and manifest
+            segment_format: Segment format ('aac' with an HLS playlist,
+                'opus' or 'wav' as plain files)
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+            max_segment_seconds: Split slides longer than this (None = never)
+        """
+        super().__init__(sample_rate, silence_duration)
+        if segment_format not in SEGMENT_FORMATS:
+            raise ValueError(f"Unsupported segment format: {segment_format}")
+
+        self.output_dir = output_dir
+        self.segment_format = segment_format
+        self.max_segment_seconds = max_segment_seconds
+        self.hls = segment_format in HLS_SEGMENT_FORMATS
+        self.segments = []
+        self.current = None
+        self.current_info = None
+        self.stream = None
+        os.makedirs(output_dir, exist_ok = True)
+
+    def write_sentence(self, info: Dict[str, any], audio: np.ndarray):
+        if self.sentences_written > 0 and len(self.silence):
+            self._write(self.silence)
+
+        if self._needs_new_segment(info, len(audio)):
+            self._close_segment()
+            self._open_segment(info)
+
+        self._write(np.asarray(audio, dtype = np.float32))
+        self.current_info['last_sentence_id'] = info['sentence_id']
+        self.sentences_written += 1
+
+    def _needs_new_segment(self, info: Dict[str, any], num_samples: int) -> bool:
+        if self.current_info is None:
+            return True
+        if info['slide_number'] != self.current_info['slide_number']:
+            return True
+        if self.max_segment_seconds is None:
+            return False
+        duration = (self.samples_written - self.current_info['start_sample'] + num_samples) / self.sample_rate
+        return duration > self.max_segment_seconds
+
+    def _open_segment(self, info: Dict[str, any]):
+        ext, codec_args = SEGMENT_FORMATS[self.segment_format]
+        filename = f"segment_{len(self.segments):04d}_slide_{info['slide_number']:03d}{ext}"
+
+        if self.hls:
+            # One encoder for the whole lecture; cut into segments on close
+            if self.stream is None:
+                self.stream = FfmpegEncoderSink(
+                    os.path.join(self.output_dir, f"stream{ext}"), codec_args, self.sample_rate, 0.0
+                )
+        elif codec_args is None:
+            self.current = WavSink(os.path.join(self.output_dir, filename), self.sample_rate, 0.0)
+        else:
+            self.current = FfmpegEncoderSink(os.path.join(self.output_dir, filename), codec_args, self.sample_rate, 0.0)
+
+        self.current_info = {
+            "index": len(self.segments),
+            "file": filename,
+            "slide_number": info['slide_number'],
+            "start_sample": self.samples_written,
+            "first_sentence_id": info['sentence_id'],
+            "last_sentence_id": info['sentence_id']
+        }
+
+    def _close_segment(self):
+        if self.current_info is None:
+            return
+
+        if self.current is not None:
+            result = self.current.close()
+            if 'error' in result:
+                raise RuntimeError(f"Segment encoding failed: {result['path']}: {result['error']}")
+            self.current = None
+
+        self.current_info["end_sample"] = self.samples_written
+        self.segments.append(self.current_info)
+        self.current_info = None
+
+    def _write(self, samples: np.ndarray):
+        (self.stream if self.hls else self.current)._write(samples)
+        self.samples_written += len(samples)
+
+    def close(self) -> Dict[str, any]:
+        if self.current_info is None and not self.segments:
+            return {}
+        self._close_segment()
+
+        if self.hls:
+            self._cut_stream()
+        else:
+            for segment in self.segments:
+                segment["start_time"] = round(segment["start_sample"] / self.sample_rate, 3)
+                segment["end_time"] = round(segment["end_sample"] / self.sample_rate, 3)
+                segment["duration"] = round(segment["end_time"] - segment["start_time"], 3)
+        for segment in self.segments:
+            del segment["start_sample"], segment["end_sample"]
+
+        manifest_path = os.path.join(self.output_dir, "manifest.json")
+        atomic_write_json(manifest_path, {
+            "format": self.segment_format,
+            "sample_rate": self.sample_rate,
+            "total_duration": round(self.samples_written / self.sample_rate, 3),
+            "hls": self.hls,
+            "segments": self.segments
+        })
+
+        playlist_path = None
+        if self.hls:
+            playlist_path = os.path.join(self.output_dir, "playlist.m3u8")
+            atomic_write_text(playlist_path, self._playlist())
+
+        segments = self.segments
+        self.segments = []
+        return {
+            "path": manifest_path,
+            "playlist": playlist_path,
+            "segments": len(segments)
+        }
+
+    def _cut_stream(self):
+        """
+        Split the encoded ADTS stream into one file per segment.
+
+        Segment times are those of the player timeline: the decoded stream
+        starts with AAC_PRIMING_SAMPLES of encoder priming, and every cut is
+        moved to the nearest frame boundary.
+        """
+        result = self.stream.close()
+        self.stream = None
+        if 'error' in result:
+            raise RuntimeError(f"Segment encoding failed: {result['path']}: {result['error']}")
+
+        stream_path = result['path']
+        targets = [segment["start_sample"] + AAC_PRIMING_SAMPLES for segment in self.segments[1:]]
+        position = 0
+        index = -1
+        frames_in_segment = 0
+        output = None
+        try:
+            with open(stream_path, 'rb') as stream:
+                for frame, frame_samples in _adts_frames(stream):
+                    # Start the next segment at the frame boundary nearest its target
+                    starts_next = index + 1 < len(self.segments) and (
+                        index < 0 or (index < len(targets) and position + frame_samples / 2 > targets[index])
+                    )
+                    if starts_next and (output is None or frames_in_segment > 0):
+                        if output is not None:
+                            output.close()
+                            self.segments[index]["end_time"] = round(position / self.sample_rate, 3)
+                        index += 1
+                        self.segments[index]["start_time"] = round(position / self.sample_rate, 3)
+                        output = open(os.path.join(self.output_dir, self.segments[index]["file"]), 'wb')
+                        output.write(_id3_timestamp_tag(position / self.sample_rate))
+                        frames_in_segment = 0
+                    output.write(frame)
+                    frames_in_segment += 1
+                    position += frame_samples
+        finally:
+            if output is not None:
+                output.close()
+            os.remove(stream_path)
+
+        self.segments[index]["end_time"] = round(position / self.sample_rate, 3)
+        # Trailing segments too short to receive a frame of their own are
+        # part of the last written one
+        self.segments[index]["last_sentence_id"] = self.segments[-1]["last_sentence_id"]
+        del self.segments[index + 1:]
+        for segment in self.segments:
+            segment["duration"] = round(segment["end_time"] - segment["start_time"], 3)
+
+    def _playlist(self) -> str:
+        """HLS playlist of the AAC segments."""
+        target_duration = max(math.ceil(segment['duration']) for segment in self.segments)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:VOD"
+        ]
+        for segment in self.segments:
+            lines.append(f"#EXTINF:{segment['duration']:.3f},Slide {segment['slide_number']}")
+            lines.append(segment['file'])
+        lines.append("#EXT-X-ENDLIST")
+        return '\n'.join(lines) + '\n'
+
+    def abort(self):
+        if self.current is not None:
+            self.current.abort()
+            self.current = None
+        if self.stream is not None:
+            self.stream.abort()
+            self.stream = None
+
+
+def _adts_frames(stream: BinaryIO) -> Iterator[tuple]:
+    """
+    Frames of an ADTS (AAC) stream.
+
+    Yields:
+        Tuples of (frame bytes, decoded samples in the frame)
+
+    Raises:
+        ValueError: If the data is not an ADTS stream
+    """
+    while True:
+        header = stream.read(7)
+        if len(header) < 7:
+            return
+        if header[0] != 0xFF or header[1] & 0xF0 != 0xF0:
+            raise ValueError("Not an ADTS stream")
+        length = ((header[3] & 0x03) << 11) | (header[4] << 3) | (header[5] >> 5)
+        blocks = (header[6] & 0x03) + 1
+        yield header + stream.read(length - 7), blocks * AAC_FRAME_SAMPLES
+
+
+def _syncsafe(value: int) -> bytes:
+    """ID3v2 syncsafe integer (7 bits per byte)."""
+    return bytes([(value >> 21) & 0x7F, (value >> 14) & 0x7F, (value >> 7) & 0x7F, value & 0x7F])
+
+
+def _id3_timestamp_tag(seconds: float) -> bytes:
+    """
+    ID3 tag carrying the 90 kHz timestamp of a packed-audio HLS segment.
+
+    HLS requires every packed audio segment to start with this PRIV frame
+    so that players can place it on the timeline.
+    """
+    timestamp = int(round(seconds * 90000)) & ((1 << 33) - 1)
+    payload = b'com.apple.streaming.transportStreamTimestamp\x00' + struct.pack('>Q', timestamp)
+    frame = b'PRIV' + _syncsafe(len(payload)) + b'\x00\x00' + payload
+    return b'ID3\x04\x00\x00' + _syncsafe(len(frame)) + frame
+
+
+class MultiSink(AudioSink):
+    """
+    Fans each sentence out to several sinks in a single pass.
+    """
+
+    def __init__(self, sinks: List[AudioSink]):
+        """
+        Initialize multi sink.
+
+        Args:
+            sinks: Sinks receiving every sentence
+        """
+        super().__init__()
+        self.sinks = sinks
+
+    def write_sentence(self, info: Dict[str, any], audio: np.ndarray):
+        for sink in self.sinks:
+            sink.write_sentence(info, audio)
+        self.sentences_written += 1
+
+    def close(self) -> List[Dict[str, any]]:
+        return [sink.close() for sink in self.sinks]
+
+    def abort(self):
+        for sink in self.sinks:
+            sink.abort()
+
+
+def create_encoder_sinks(
+    base_path: str,
+    formats: List[str],
+    sample_rate: int = 24000,
+    silence_duration: float = 0.2
+) -> List[AudioSink]:
+    """
+    Create one encoder sink per requested format.
+
+    Formats are encoded by ffmpeg through stdin pipes. If ffmpeg is not
+    installed, Opus falls back to libsndfile's Ogg/Opus encoder when
+    available; other formats are skipped.
+
+    Args:
+        base_path: Output path without extension
+        formats: Requested formats ('opus', 'aac')
+        sample_rate: Audio sample rate
+        silence_duration: Silence between sentences (seconds)
+
+    Returns:
+        List of encoder sinks
+    """
+    sinks = []
+    for fmt in formats:
+        if fmt.lower() not in ENCODER_FORMATS:
+            print(f"  ⚠ Unsupported format: {fmt}")
+            continue
+
+        ext, codec_args = ENCODER_FORMATS[fmt.lower()]
+        try:
+            sinks.append(FfmpegEncoderSink(
+                f"{base_path}{ext}",
+                codec_args,
+                sample_rate = sample_rate,
+                silence_duration = silence_duration
+            ))
+        except FileNotFoundError:
+            if fmt.lower() == 'opus' and 'OPUS' in sf.available_subtypes('OGG'):
+                print(f"  ⚠ ffmpeg not found, encoding Opus with libsndfile")
+                sinks.append(SoundFileSink(
+                    f"{base_path}{ext}",
+                    sample_rate = sample_rate,
+                    silence_duration = silence_duration,
+                    format = 'OGG',
+                    subtype = 'OPUS'
+                ))
+            else:
+                print(f"  ✗ ffmpeg not found. Install ffmpeg to export {fmt.upper()}.")
+
+    return sinks
+
+
+def _find_chunk(f, chunk_id: bytes) -> int:
+    """
+    Offset of a chunk header in a RIFF/WAVE file.
+
+    Raises:
+        ValueError: If the file has no such chunk
+    """
+    f.seek(12)
+    while True:
+        offset = f.tell()
+        header = f.read(8)
+        if len(header) < 8:
+            raise ValueError(f"No {chunk_id.decode()} chunk in WAV file")
+        current_id, size = struct.unpack('<4sI', header)
+        if current_id == chunk_id:
+            return offset
+        # Chunks are padded to an even size
+        f.seek(size + (size & 1), os.SEEK_CUR)
+
+
+class ProgressiveWavSink(WavSink):
+    """
+    WAV writer that keeps the output playable while it is being written.
+
+    Audio is written directly to `path`. After every sentence the RIFF and
+    data chunk sizes in the header are rewritten to cover the audio written
+    so far (libsndfile only fills them in on close), so any player can open
+    the file before generation finishes. Each timestamp entry is appended to
+    a JSON Lines file as soon as its audio is on disk.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sample_rate: int = 24000,
+        silence_duration: float = 0.2,
+        subtype: str = 'PCM_16',
+        timestamps_path: Optional[str] = None
+    ):
+        """
+        Initialize progressive WAV sink.
+
+        Args:
+            path: Output WAV file path
+            sample_rate: Audio sample rate
+            silence_duration: Silence between sentences (seconds)
+            subtype: WAV sample format ('PCM_16' or 'FLOAT')
+            timestamps_path: JSON Lines file for timestamp entries
+                (defaults to the WAV path with a .jsonl extension)
+        """
+        super().__init__(path, sample_rate, silence_duration, subtype)
+        self.temp_path = path
+        self.timestamps_path = timestamps_path or f"{os.path.splitext(path)[0]}.jsonl"
+        self.timestamps_file = None
+        self._data_offset = None
+
+    def write_sentence(self, info: Dict[str, any], audio: np.ndarray):
+        super().write_sentence(info, audio)
+        self.file.flush()
+        self._update_header()
+
+        if self.timestamps_file is None:
+            self.timestamps_file = open(self.timestamps_path, 'w', encoding = 'utf-8')
+        self.timestamps_file.write(json.dumps(info, ensure_ascii = False) + '\n')
+        self.timestamps_file.flush()
+
+    def _update_header(self):
+        """Set the RIFF and data chunk sizes to the current file size."""
+        size = os.path.getsize(self.path)
+        with open(self.path, 'r+b') as f:
+            if self._data_offset is None:
+                self._data_offset = _find_chunk(f, b'data')
+            f.seek(4)
+            f.write(struct.pack('<I', size - 8))
+            f.seek(self._data_offset + 4)
+            f.write(struct.pack('<I', size - self._data_offset - 8))
+
+    def close(self) -> Dict[str, any]:
+        if self.timestamps_file is not None:
+            self.timestamps_file.close()
+            self.timestamps_file = None
+        return super().close()
+
+    def abort(self):
+        # Keep what was already written; it may be playing
+        self.close()
@@ -0,0 +1,338 @@
+"""
+Batch Runner Module
+Stage-major processing of many lectures with one model load per stage
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+from lecture_pipeline import LecturePipeline
+from pipeline_checkpoint import atomic_write_json, hash_text
+from pipeline_tracing import Tracer, span, tracing
+from sentence_segmenter import SentenceSegmenter
+
+
+class BatchRunner:
+    """
+    Runs a list of lectures stage by stage instead of lecture by lecture.
+
+    ASR runs for every lecture, then matching, then audio generation, so
+    each model is loaded once per batch instead of once per lecture. Every
+    lecture keeps its own manifest, so an interrupted batch resumes where it
+    stopped; a lecture that fails is recorded in batch_state.json and
+    skipped in later stages without stopping the others. Work that does not
+    use a model (PDF rendering, original-audio transcoding) runs for up to
+    max_concurrency lectures at once.
+    """
+
+    def __init__(
+        self,
+        pipeline: LecturePipeline,
+        max_concurrency: int = 2,
+        state_filename: str = 'batch_state.json'
+    ):
+        """
+        Initialize batch runner.
+
+        Args:
+            pipeline: Configured pipeline (its output_dir holds all lectures)
+            max_concurrency: Lectures whose model-free work may run at once
+            state_filename: Batch state file in the pipeline output directory
+        """
+        self.pipeline = pipeline
+        self.max_concurrency = max(1, max_concurrency)
+        self.state_path = os.path.join(pipeline.output_dir, state_filename)
+
+    @staticmethod
+    def _normalize_jobs(jobs: Sequence[Union[Dict[str, str], Sequence[str]]]) -> List[Dict[str, str]]:
+        """
+        Convert jobs to dictionaries with audio_path, pdf_path and lecture_name.
+
+        Raises:
+            ValueError: If two jobs share a lecture name
+        """
+        normalized = []
+        for job in jobs:
+            if isinstance(job, dict):
+                audio_path, pdf_path = job['audio_path'], job['pdf_path']
+                lecture_name = job.get('lecture_name')
+            else:
+                audio_path, pdf_path, *rest = job
+                lecture_name = rest[0] if rest else None
+            normalized.append({
+                'audio_path': audio_path,
+                'pdf_path': pdf_path,
+                'lecture_name': lecture_name or Path(audio_path).stem
+            })
+
+        names = [job['lecture_name'] for job in normalized]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate lecture names: {duplicates}")
+        return normalized
+
+    def run(
+        self,
+        jobs: Sequence[Union[Dict[str, str], Sequence[str]]],
+        sentence_splitter: Optional[callable] = None,
+        export_audio_formats: Optional[List[str]] = None,
+        segment_audio: bool = False,
+        use_original_audio: bool = False,
+        force_stages: Optional[List[str]] = None
+    ) -> Dict[str, any]:
+        """
+        Process all lectures stage-major.
+
+        Args:
+            jobs: (audio_path, pdf_path[, lecture_name]) tuples or dictionaries
+                with those keys; lecture_name defaults to the audio file stem
+            sentence_splitter: Optional function to split transcripts into sentences
+            export_audio_formats: Optional list of audio formats to export ['opus', 'aac']
+            segment_audio: Also write slide-aligned audio segments and a playlist
+            use_original_audio: Skip TTS and align the original recordings
+            force_stages: Stages to rerun for every lecture even if unchanged
+
+        Returns:
+            Dictionary with per-lecture results (or errors), stage timings
+            and model load statistics
+        """
+        jobs = self._normalize_jobs(jobs)
+        os.makedirs(self.pipeline.output_dir, exist_ok = True)
+
+        print("\n" + "="*60)
+        print(f"Running Batch: {len(jobs)} lectures")
+        print("="*60)
+
+        self.state = {
+            'started': datetime.now().isoformat(),
+            'jobs': {
+                job['lecture_name']: {**job, 'stages': {}, 'error': None}
+                for job in jobs
+            },
+            'timing': {}
+        }
+
+        runs = []
+        for job in jobs:
+            run = {**job, 'error': None}
+            try:
+                run['dir'], run['results'], run['manifest'], run['audio_hash'] = self.pipeline._prepare_run(
+                    job['audio_path'], job['pdf_path'], job['lecture_name'],
+                    save_intermediate = True,
+                    force_stages = force_stages
+                )
+            except (OSError, ValueError) as e:
+                self._fail(run, 'setup', e)
+            runs.append(run)
+
+        models = self.pipeline.models
+
+        tracer = Tracer('batch')
+        sampler = self.pipeline._resource_sampler(tracer)
+        with tracing(tracer), (sampler or nullcontext()):
+            self._run_phase('asr', runs, lambda run, _: self.pipeline._run_asr(
+                run['audio_path'], run['audio_hash'], run['dir'], run['manifest'], run['results'],
+                word_timestamps = use_original_audio
+            ))
+            models.evict('asr')
+
+            def render_pages(run):
+                if self._matching_current(run, sentence_splitter):
+                    return None
+                return self.pipeline.matcher.extract_pdf_pages(run['pdf_path'])
+
+            self._run_phase('matching', runs, lambda run, pages: self.pipeline._run_matching(
+                run['asr']['transcript'], run['pdf_path'], sentence_splitter,
+                run['dir'], run['manifest'], run['results'],
+                page_images = pages
+            ), prepare = render_pages)
+            models.evict('matcher')
+
+            self._run_phase('audio', runs, lambda run, _: self.pipeline._run_audio(
+                run['matching'], run['asr'], run['audio_path'], run['audio_hash'], run['dir'],
+                run['manifest'], run['results'],
+                export_audio_formats = export_audio_formats,
+                segment_audio = segment_audio,
+                use_original_audio = use_original_audio
+            ), concurrent = use_original_audio)
+
+        report = models.report()
+        self.state['models'] = report
+        self.state['trace'] = tracer.summary()
+        if sampler is not None:
+            self.state['resources'] = sampler.report()
+            print("\nResources:\n" + sampler.format_report(self.state['resources'], prefix = 'batch.'))
+        self.state['trace_files'] = tracer.save(self.pipeline.output_dir, prefix = 'batch_trace')
+        for run in runs:
+            if run['error'] is None:
+                run['results']['models'] = report
+                self.pipeline._save_results(run['dir'], run['results'])
+        self.state['finished'] = datetime.now().isoformat()
+        self._save_state()
+
+        self._print_summary(runs, report)
+        return {
+            'jobs': [
+                run['results'] if run['error'] is None
+                else {'lecture_name': run['lecture_name'], 'error': run['error']}
+                for run in runs
+            ],
+            'timing': self.state['timing'],
+            'models': report
+        }
+
+    def _run_phase(
+        self,
+        stage: str,
+        runs: List[Dict[str, any]],
+        fn: Callable[[Dict[str, any], any], any],
+        prepare: Optional[Callable[[Dict[str, any]], any]] = None,
+        concurrent: bool = False
+    ):
+        """
+        Run one stage for every lecture that has not failed.
+
+        Args:
+            stage: Stage name; fn's result is stored in run[stage]
+            runs: Per-lecture run state
+            fn: Stage function receiving (run, prepared value)
+            prepare: Optional model-free preparation, run in threads for up
+                to max_concurrency lectures ahead of fn
+            concurrent: Run fn itself for up to max_concurrency lectures at once
+        """
+        active = [run for run in runs if run['error'] is None]
+        print("\n" + "="*60)
+        print(f"BATCH STAGE: {stage} ({len(active)} lectures)")
+        print("="*60)
+        start = time.perf_counter()
+
+        def execute(run, prepared):
+            try:
+                with span(f"batch.{stage}", 'batch', lecture = run['lecture_name']):
+                    run[stage] = fn(run, prepared)
+                self.state['jobs'][run['lecture_name']]['stages'][stage] = run['results']['stages'][stage]
+            except Exception as e:
+                self._fail(run, stage, e)
+
+        with ThreadPoolExecutor(max_workers = self.max_concurrency) as pool:
+            if concurrent:
+                list(pool.map(lambda run: execute(run, None), active))
+            else:
+                upcoming = deque(active)
+                prepared = deque()
+                while upcoming or prepared:
+                    # Keep up to max_concurrency preparations ahead of the model
+                    while upcoming and len(prepared) < self.max_concurrency:
+                        run = upcoming.popleft()
+                        prepared.append((run, pool.submit(prepare, run) if prepare else None))
+                    run, future = prepared.popleft()
+                    try:
+                        value = future.result() if future else None
+                    except Exception as e:
+                        self._fail(run, stage, e)
+                        continue
+                    execute(run, value)
+
+        self.state['timing'][stage] = round(time.perf_counter() - start, 3)
+        self._save_state()
+
+    def _matching_current(self, run: Dict[str, any], sentence_splitter: Optional[callable]) -> bool:
+        """Whether a lecture's matching stage will be skipped (no pages needed)."""
+        manifest = run['manifest']
+        inputs = {'transcript': hash_text(run['asr']['transcript']), 'pdf': manifest.file_hash(run['pdf_path'])}
+        key = manifest.stage_key('matching', self.pipeline._matching_params(sentence_splitter), inputs)
+        return manifest.is_complete('matching', key)
+
+    def _fail(self, run: Dict[str, any], stage: str, error: Exception):
+        """Record a failed lecture; later stages skip it."""
+        run['error'] = f"{stage}: {type(error).__name__}: {error}"
+        job_state = self.state['jobs'][run['lecture_name']]
+        job_state['stages'][stage] = 'failed'
+        job_state['error'] = run['error']
+        print(f"⚠ {run['lecture_name']} failed in {stage}: {error}")
+
+    def _save_state(self):
+        atomic_write_json(self.state_path, self.state)
+
+    def _print_summary(self, runs: List[Dict[str, any]], report: Dict[str, any]):
+        """Print per-lecture stage status, stage times and model loads."""
+        print("\n" + "="*60)
+        print("BATCH COMPLETE!")
+        print("="*60)
+        for run in runs:
+            stages = self.state['jobs'][run['lecture_name']]['stages']
+            status = ', '.join(f"{stage} {result}" for stage, result in stages.items())
+            print(f"  {run['lecture_name']:<30} {status}")
+        print("Stage times: " + ', '.join(f"{stage} {seconds:.1f}s" for stage, seconds in self.state['timing'].items()))
+        print("Model loads: " + ', '.join(f"{name} {stats['loads']}" for name, stats in report['models'].items()))
+        print(f"Trace: {self.state['trace_files']['chrome_trace']}")
+        failed = sum(1 for run in runs if run['error'] is not None)
+        if failed:
+            print(f"⚠ {failed} lectures failed (see {self.state_path})")
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description = "Reconstruct a batch of lectures stage by stage")
+    parser.add_argument('jobs_file',
+                        help = "JSON list of {\"audio_path\", \"pdf_path\", \"lecture_name\"} objects")
+    parser.add_argument('--output-dir', default = './pipeline_output')
+    parser.add_argument('--device', default = 'auto', help = "cuda, cpu or auto (cuda if available)")
+    parser.add_argument('--cpu-threads', type = int, default = None,
+                        help = "Intra-op threads on CPU (default: usable cores)")
+    parser.add_argument('--cpu-quantize', action = 'store_true',
+                        help = "On CPU, quantize the models' linear layers to int8")
+    parser.add_argument('--max-concurrency', type = int, default = 2,
+                        help = "Lectures whose PDF rendering or transcoding may run at once")
+    parser.add_argument('--tts-voice', default = 'af_heart')
+    parser.add_argument('--tts-speed', type = float, default = 1.0)
+    parser.add_argument('--export-format', action = 'append', dest = 'export_formats',
+                        choices = ['opus', 'aac'], help = "Additional audio format (repeatable)")
+    parser.add_argument('--segment-audio', action = 'store_true',
+                        help = "Write slide-aligned segments and an HLS playlist")
+    parser.add_argument('--original-audio', action = 'store_true',
+                        help = "Align the original recordings instead of running TTS")
+    parser.add_argument('--min-sentence-words', type = int, default = 5,
+                        help = "Merge shorter sentences with a neighbour")
+    parser.add_argument('--max-sentence-words', type = int, default = 40,
+                        help = "Split longer sentences at clause boundaries")
+    parser.add_argument('--force-stage', action = 'append', dest = 'force_stages',
+                        choices = LecturePipeline.STAGES, help = "Rerun a stage even if unchanged (repeatable)")
+    args = parser.parse_args()
+
+    with open(args.jobs_file, 'r', encoding = 'utf-8') as f:
+        jobs = json.load(f)
+
+    pipeline = LecturePipeline(
+        tts_voice = args.tts_voice,
+        tts_speed = args.tts_speed,
+        cpu_threads = args.cpu_threads,
+        cpu_quantize = args.cpu_quantize,
+        device = args.device,
+        output_dir = args.output_dir
+    )
+    runner = BatchRunner(pipeline, max_concurrency = args.max_concurrency)
+    results = runner.run(
+        jobs,
+        sentence_splitter = SentenceSegmenter(args.min_sentence_words, args.max_sentence_words),
+        export_audio_formats = args.export_formats,
+        segment_audio = args.segment_audio,
+        use_original_audio = args.original_audio,
+        force_stages = args.force_stages
+    )
+    pipeline.unload_models()
+
+    if any('error' in job for job in results['jobs']):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Execution Profile Module
+Device selection and CPU inference settings (threads, int8 quantization) shared by the processors
+"""
+
+import os
+from typing import Dict, Optional
+
+from lazy_imports import lazy_import
+
+torch = lazy_import('torch')
+
+
+def resolve_device(device: Optional[str]) -> str:
+    """
+    Device to run on: 'auto' (or None) picks CUDA when available, else CPU.
+
+    Args:
+        device: 'auto', 'cuda', 'cuda:N' or 'cpu'
+
+    Returns:
+        Concrete device string
+    """
+    if device in (None, 'auto'):
+        return 'cuda' if torch.cuda.is_available() else 'cpu'
+    return device
+
+
+def is_cpu(device: Optional[str]) -> bool:
+    """Whether a (possibly 'auto') device resolves to the CPU."""
+    return resolve_device(device).startswith('cpu')
+
+
+def configure_cpu_threads(
+    intra_op_threads: Optional[int] = None,
+    inter_op_threads: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Set the torch thread pools of this process.
+
+    Intra-op threads parallelize a single operator (matrix multiplication,
+    convolution) and default to the number of usable cores. Inter-op
+    threads run independent operators concurrently; torch only accepts this
+    setting before its first parallel operation, so a later attempt is
+    reported and ignored.
+
+    Args:
+        intra_op_threads: Threads per operator (None = usable cores)
+        inter_op_threads: Concurrent operators (None = torch default)
+
+    Returns:
+        Dictionary with the resulting 'intra_op' and 'inter_op' thread counts
+    """
+    if intra_op_threads is None:
+        intra_op_threads = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    torch.set_num_threads(max(1, intra_op_threads))
+
+    if inter_op_threads is not None:
+        try:
+            torch.set_num_interop_threads(max(1, inter_op_threads))
+        except RuntimeError as e:
+            print(f"⚠ Inter-op threads left at {torch.get_num_interop_threads()}: {e}")
+
+    return {"intra_op": torch.get_num_threads(), "inter_op": torch.get_num_interop_threads()}
+
+
+def quantize_linear_layers(module):
+    """
+    Quantize the linear layers of a model to int8 in place (CPU inference only).
+
+    Weights are stored as int8 and activations are quantized on the fly
+    (dynamic quantization), which roughly quarters the memory of the linear
+    weights and uses int8 matrix kernels. Other layers stay float32.
+
+    Args:
+        module: torch.nn.Module on the CPU
+
+    Returns:
+        The same module
+    """
+    torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype = torch.qint8, inplace = True)
+    return module
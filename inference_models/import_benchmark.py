@@ -0,0 +1,154 @@
+"""
+Import Benchmark Module
+Measures how long the pipeline modules take to import and which heavy libraries they load
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+
+MODULES = [
+    'lecture_pipeline',
+    'batch_runner',
+    'pipeline_daemon',
+    'asr_processor',
+    'slide_matching_processor',
+    'tts_processor'
+]
+
+# Libraries that must only be executed by load_model() (or the first call needing them)
+HEAVY_MODULES = ['torch', 'nemo', 'transformers', 'kokoro', 'librosa', 'fitz', 'omegaconf']
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = [
+    name for name in {heavy!r}
+    if name in sys.modules and type(sys.modules[name]).__name__ != '_LazyModule'
+]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def write_stub_packages(directory: str, names: List[str] = HEAVY_MODULES) -> str:
+    """
+    Write empty stand-ins for the heavy libraries.
+
+    Without the libraries installed, lazy_import() cannot execute them, so a
+    benchmark without stubs misses code that would run them at import time
+    (such as finding one of their submodules). With the stubs first on the
+    path, such code executes a stub, which the probe reports.
+
+    Args:
+        directory: Directory to create the packages in
+        names: Top-level package names
+
+    Returns:
+        The directory, for PYTHONPATH
+    """
+    for name in names:
+        package = os.path.join(directory, name)
+        os.makedirs(package, exist_ok = True)
+        with open(os.path.join(package, '__init__.py'), 'w', encoding = 'utf-8') as f:
+            f.write(f'"""Import benchmark stand-in for {name}."""\n')
+    return directory
+
+
+def measure_import(module: str, runs: int = 5, stub_path: Optional[str] = None) -> Dict[str, any]:
+    """
+    Import a module in fresh interpreters.
+
+    Args:
+        module: Module name (imported from this directory)
+        runs: Number of interpreters; the median time is reported
+        stub_path: Optional directory put first on PYTHONPATH (see write_stub_packages)
+
+    Returns:
+        Dictionary with median/min seconds and the heavy libraries that were executed
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = _PROBE.format(module = module, heavy = HEAVY_MODULES)
+    env = dict(os.environ)
+    if stub_path:
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [stub_path, env.get('PYTHONPATH')]))
+    times, heavy = [], set()
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd = here,
+            env = env,
+            capture_output = True,
+            text = True,
+            check = True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        times.append(result['seconds'])
+        heavy.update(result['heavy'])
+    return {
+        "module": module,
+        "median_seconds": round(statistics.median(times), 4),
+        "min_seconds": round(min(times), 4),
+        "heavy_loaded": sorted(heavy)
+    }
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description = "Benchmark pipeline import time")
+    parser.add_argument('modules', nargs = '*', default = MODULES)
+    parser.add_argument('--runs', type = int, default = 5, help = "Fresh interpreters per module")
+    parser.add_argument('--forbid-heavy', action = 'store_true',
+                        help = "Fail if importing a module executes torch, NeMo, transformers, ...")
+    parser.add_argument('--max-seconds', type = float,
+                        help = "Fail if a median import time exceeds this")
+    parser.add_argument('--stub-heavy', action = 'store_true',
+                        help = "Put empty stand-ins for the heavy libraries on the path (for "
+                               "installs without them)")
+    parser.add_argument('--json', dest = 'json_path', help = "Also write the results to this file")
+    args = parser.parse_args()
+
+    results: List[Dict[str, any]] = []
+    with tempfile.TemporaryDirectory(prefix = 'import_stubs_') as stub_dir:
+        stub_path = write_stub_packages(stub_dir) if args.stub_heavy else None
+        print(f"{'module':<28} {'median s':>9} {'min s':>8}  heavy libraries loaded")
+        for module in args.modules:
+            try:
+                result = measure_import(module, runs = args.runs, stub_path = stub_path)
+            except subprocess.CalledProcessError as e:
+                print(f"{module:<28} failed to import:\n{e.stderr}")
+                raise SystemExit(1)
+            results.append(result)
+            print(f"{module:<28} {result['median_seconds']:>9.3f} {result['min_seconds']:>8.3f}  "
+                  f"{', '.join(result['heavy_loaded']) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding = 'utf-8') as f:
+            json.dump(results, f, indent = 2)
+
+    failures = []
+    if args.forbid_heavy:
+        failures += [
+            f"{r['module']} loads {', '.join(r['heavy_loaded'])} at import"
+            for r in results if r['heavy_loaded']
+        ]
+    if args.max_seconds is not None:
+        failures += [
+            f"{r['module']} takes {r['median_seconds']:.3f}s to import (limit {args.max_seconds}s)"
+            for r in results if r['median_seconds'] > args.max_seconds
+        ]
+    for failure in failures:
+        print(f"⚠ {failure}")
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
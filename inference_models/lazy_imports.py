@@ -0,0 +1,62 @@
+"""
+Lazy Imports Module
+Defers importing heavy libraries (torch, NeMo, transformers, Kokoro, ...) until first use
+"""
+
+import importlib.util
+import sys
+import types
+
+
+class _MissingModule(types.ModuleType):
+    """Stand-in for a module that is not installed; fails when it is first used."""
+
+    def __getattr__(self, attr: str):
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name = self.__name__)
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """
+    Return a module that is only executed on first attribute access.
+
+    Processor modules bind heavy libraries with this at module level, so
+    importing them (or lecture_pipeline) is fast and the libraries are
+    loaded by load_model() or whichever call first needs them. Modules
+    imported already are returned as they are. A module that is not
+    installed raises ModuleNotFoundError on first use instead of at import,
+    so an install without e.g. Kokoro can still import and construct the
+    pipeline (CI checks this with none of the model libraries installed).
+
+    Only top-level packages can be deferred: finding a submodule executes
+    its parent packages ('nemo.collections.asr' runs nemo/__init__.py), so
+    submodules are imported inside the function that needs them. Note that
+    annotations are evaluated at definition time: annotate with strings
+    ('torch.Tensor') to keep a module lazy.
+
+    Args:
+        name: Top-level package name
+
+    Returns:
+        The (lazy) module
+
+    Raises:
+        ValueError: If name is a dotted submodule name
+    """
+    if '.' in name:
+        raise ValueError(f"lazy_import() defers top-level packages only, not '{name}'")
+    if name in sys.modules:
+        return sys.modules[name]
+
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        return _MissingModule(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -3,15 +3,36 @@ Integrated Lecture Reconstruction Pipeline
 Combines ASR, Slide Matching, and TTS to reconstruct lectures from audio and PDF
 """
 
+import argparse
+import glob
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
 from datetime import datetime
 
 from asr_processor import ASRProcessor
 from slide_matching_processor import SlideMatchingProcessor
 from tts_processor import TTSProcessor
+from original_audio import OriginalAudioProcessor
+from pipeline_checkpoint import (
+    StageManifest,
+    atomic_write_json,
+    atomic_write_text,
+    hash_text
+)
+from pipeline_dataflow import DataflowExecutor
+from model_residency import ModelResidencyManager
+from pipeline_tracing import Tracer, span, tracing
+from resource_sampler import ResourceSampler
+from sentence_segmenter import SentenceSegmenter
+from audio_sharding import plan_shards, probe_duration, stitch_asr_results
+from execution_profile import configure_cpu_threads, is_cpu, resolve_device
+from lazy_imports import lazy_import
+
+torch = lazy_import('torch')
 
 
 class LecturePipeline:
@@ -20,16 +41,28 @@ class LecturePipeline:
 
     Pipeline flow:
     1. ASR: Transcribe lecture audio to text
+       (PDF pages are rendered, and optionally embedded, concurrently;
+       long lectures can be transcribed as resumable shards)
     2. Slide Matching: Match transcript sentences to PDF slides
     3. TTS: Generate new audio with slide alignment
+       (or align the original recording, with use_original_audio=True)
+
+    Models stay loaded between stages and runs while they fit into the
+    model memory budgets; call unload_models() to release them.
     """
 
+    # Checkpointed stages, in execution order
+    STAGES = ['asr', 'matching', 'audio']
+
     def __init__(
         self,
         # ASR settings
         asr_model: str = "nvidia/parakeet-tdt-0.6b-v2",
         asr_chunk_seconds: int = 300,
         asr_batch_size: int = 4,
+        asr_use_cascade: bool = False,
+        asr_cascade_model: str = "nvidia/parakeet-tdt_ctc-110m",
+        asr_cascade_threshold: float = 0.85,
 
         # Slide matching settings
         matching_model: str = 'nvidia/llama-nemoretriever-colembed-3b-v1',
@@ -47,9 +80,31 @@ class LecturePipeline:
         tts_speed: float = 1.0,
         tts_lang_code: str = 'a',
         tts_silence_duration: float = 0.2,
+        tts_num_workers: int = 1,
+        tts_cache_dir: Optional[str] = None,
+        tts_batch_phonemes: int = 0,
+
+        # Scheduling settings
+        overlap_pdf_rendering: bool = True,
+        overlap_page_embedding: Optional[bool] = None,
+        overlap_memory_gb: float = 16.0,
+        model_ram_budget_gb: Optional[float] = None,
+        model_vram_budget_gb: Optional[float] = None,
+        shard_seconds: Optional[float] = None,
+        shard_search_seconds: float = 30.0,
+        shard_prefetch: int = 1,
+
+        # Monitoring settings
+        resource_sample_interval: Optional[float] = 0.5,
+        track_allocations: bool = False,
+
+        # CPU settings (used when the device resolves to the CPU)
+        cpu_threads: Optional[int] = None,
+        cpu_interop_threads: Optional[int] = None,
+        cpu_quantize: bool = False,
 
         # General settings
-        device: str = 'cuda',
+        device: str = 'auto',
         output_dir: str = './pipeline_output'
     ):
         """
@@ -57,8 +112,12 @@ class LecturePipeline:
 
         Args:
             asr_model: ASR model name
-            asr_chunk_seconds: Chunk duration for long audio files
+            asr_chunk_seconds: Chunk duration for long audio files (the cascade
+                decodes chunks of asr.cascade_chunk_seconds instead)
             asr_batch_size: ASR batch size
+            asr_use_cascade: Transcribe with a small model first, re-decode low-confidence chunks
+            asr_cascade_model: Small first-pass ASR model for cascade mode
+            asr_cascade_threshold: Confidence below which chunks are re-decoded
             matching_model: Multimodal matching model name
             matching_batch_size: Matching batch size
             jump_penalty: Slide jump penalty
@@ -72,11 +131,46 @@ class LecturePipeline:
             tts_speed: TTS playback speed
             tts_lang_code: TTS language code
             tts_silence_duration: Silence between sentences
-            device: Device to use (cuda/cpu)
+            tts_num_workers: Number of parallel TTS worker processes
+            tts_cache_dir: Optional persistent sentence audio cache directory
+            tts_batch_phonemes: Phoneme budget for packing short sentences (0 = off)
+            overlap_pdf_rendering: Render PDF pages while ASR runs
+            overlap_page_embedding: Also embed pages while ASR runs (None = only
+                if enough free GPU memory)
+            overlap_memory_gb: Free GPU memory needed to overlap page embedding
+            model_ram_budget_gb: Host memory for resident models (None = unlimited)
+            model_vram_budget_gb: GPU memory for resident models (None = 90% of
+                the CUDA device); 0 unloads each model before the next loads
+            shard_seconds: Transcribe recordings in shards of about this many
+                seconds, cut at pauses (None = one unit)
+            shard_search_seconds: How far a shard cut may move towards a pause
+            shard_prefetch: Shards decoded ahead of the one being transcribed
+                (0 = one shard at a time). Inference on the shared ASR model
+                is serialized, so this only hides decoding time
+            resource_sample_interval: Seconds between memory/CPU samples (None = off)
+            track_allocations: Also record Python/numpy allocation peaks
+                (tracemalloc; slows allocation-heavy code)
+            cpu_threads: Intra-op threads on CPU (None = usable cores)
+            cpu_interop_threads: Inter-op threads on CPU (None = torch default)
+            cpu_quantize: On CPU, quantize the linear layers of all models to int8
+            device: Device to use (cuda/cpu; auto = cuda if available, else
+                the CPU profile: float32, sdpa attention, thread settings)
             output_dir: Output directory for results
         """
         self.output_dir = output_dir
         self.device = device
+        self.overlap_pdf_rendering = overlap_pdf_rendering
+        self.overlap_page_embedding = overlap_page_embedding
+        self.overlap_memory_gb = overlap_memory_gb
+        self.shard_seconds = shard_seconds
+        self.shard_search_seconds = shard_search_seconds
+        self.shard_prefetch = max(0, shard_prefetch)
+        self.resource_sample_interval = resource_sample_interval
+        self.track_allocations = track_allocations
+        self.cpu_threads = cpu_threads
+        self.cpu_interop_threads = cpu_interop_threads
+        self.cpu_quantize = cpu_quantize
+        self.execution = None
 
         # Initialize processors
         print("="*60)
@@ -85,7 +179,11 @@ class LecturePipeline:
 
         self.asr = ASRProcessor(
             model_name = asr_model,
-            device = device
+            device = device,
+            use_cascade = asr_use_cascade,
+            cascade_model_name = asr_cascade_model,
+            cascade_threshold = asr_cascade_threshold,
+            quantize = cpu_quantize
         )
         self.asr_chunk_seconds = asr_chunk_seconds
         self.asr_batch_size = asr_batch_size
@@ -100,15 +198,31 @@ class LecturePipeline:
             exponential_scale = exponential_scale,
             use_confidence_boost = use_confidence_boost,
             confidence_threshold = confidence_threshold,
-            confidence_weight = confidence_weight
+            confidence_weight = confidence_weight,
+            quantize = cpu_quantize
         )
 
         self.tts = TTSProcessor(
             voice = tts_voice,
             speed = tts_speed,
             lang_code = tts_lang_code,
-            silence_duration = tts_silence_duration
+            silence_duration = tts_silence_duration,
+            num_workers = tts_num_workers,
+            cache_dir = tts_cache_dir,
+            batch_phonemes = tts_batch_phonemes,
+            device = device,
+            quantize = cpu_quantize
+        )
+
+        self.original_audio = OriginalAudioProcessor()
+
+        self.models = ModelResidencyManager(
+            ram_budget_gb = model_ram_budget_gb,
+            vram_budget_gb = model_vram_budget_gb
         )
+        self.models.register('asr', self.asr)
+        self.models.register('matcher', self.matcher)
+        self.models.register('tts', self.tts)
 
         print("\nPipeline initialized successfully!")
 
@@ -119,22 +233,139 @@ class LecturePipeline:
         lecture_name: Optional[str] = None,
         sentence_splitter: Optional[callable] = None,
         export_audio_formats: Optional[List[str]] = None,
-        save_intermediate: bool = True
+        save_intermediate: bool = True,
+        segment_audio: bool = False,
+        use_original_audio: bool = False,
+        force_stages: Optional[List[str]] = None,
+        progress: Optional[Callable[[Dict[str, any]], None]] = None
     ) -> Dict[str, any]:
         """
         Run the complete lecture reconstruction pipeline.
 
+        With save_intermediate, every stage writes its artifacts atomically
+        and records them in manifest.json together with a hash of its inputs
+        and parameters. Rerunning with the same lecture_name skips stages
+        whose inputs have not changed.
+
         Args:
             audio_path: Path to lecture audio file
             pdf_path: Path to lecture PDF file
-            lecture_name: Optional lecture name for output files
+            lecture_name: Optional lecture name for output files (required to resume)
             sentence_splitter: Optional function to split transcript into sentences
             export_audio_formats: Optional list of audio formats to export ['opus', 'aac']
-            save_intermediate: Save intermediate results
+            save_intermediate: Save intermediate results (enables resuming)
+            segment_audio: Also write slide-aligned audio segments and a playlist
+            use_original_audio: Skip TTS and align the original recording to the
+                slides using ASR word timestamps
+            force_stages: Stages to rerun even if unchanged ('asr', 'matching', 'audio')
+            progress: Optional callback receiving task events: dicts with
+                'task', 'status' ('started', 'finished', 'failed'), 'seconds'
+                and, for stages, 'stage_status' ('completed' or 'skipped')
 
         Returns:
             Dictionary with all pipeline results
         """
+        lecture_output_dir, results, manifest, audio_hash = self._prepare_run(
+            audio_path, pdf_path, lecture_name, save_intermediate, force_stages
+        )
+
+        print("\n" + "="*60)
+        print(f"Running Pipeline for: {results['lecture_name']}")
+        print("="*60)
+
+        # Pages do not depend on the transcript: prepare them while ASR runs,
+        # unless ASR is up to date and there is nothing to overlap with
+        asr_params = self._asr_params(word_timestamps = use_original_audio)
+        asr_current = manifest is not None and manifest.is_complete(
+            'asr', manifest.stage_key('asr', asr_params, {'audio': audio_hash})
+        )
+        render_pages = self.overlap_pdf_rendering and not asr_current
+        embed_pages = render_pages and self._can_overlap_embedding()
+
+        def on_task(task, status, seconds):
+            event = {'task': task, 'status': status, 'seconds': round(seconds, 3) if seconds is not None else None}
+            if status == 'finished' and task in results['stages']:
+                event['stage_status'] = results['stages'][task]
+            progress(event)
+
+        executor = DataflowExecutor(on_task = on_task if progress is not None else None)
+        executor.add('asr', lambda: self._run_asr(
+            audio_path, audio_hash, lecture_output_dir, manifest, results,
+            word_timestamps = use_original_audio
+        ))
+        page_deps = []
+        if render_pages:
+            executor.add('pdf_render', lambda: self.matcher.extract_pdf_pages(pdf_path))
+            page_deps = ['pdf_render']
+        if embed_pages:
+            executor.add('page_embedding', self._embed_pages, deps = ['pdf_render'])
+            page_deps = ['page_embedding']
+
+        def matching(asr_result, pages = None):
+            return self._run_matching(
+                asr_result['transcript'], pdf_path, sentence_splitter,
+                lecture_output_dir, manifest, results,
+                page_images = pages if render_pages and not embed_pages else None,
+                image_embeddings = pages if embed_pages else None
+            )
+
+        executor.add('matching', matching, deps = ['asr'] + page_deps)
+        executor.add('audio', lambda asr_result, matching_results: self._run_audio(
+            matching_results, asr_result, audio_path, audio_hash, lecture_output_dir,
+            manifest, results,
+            export_audio_formats = export_audio_formats,
+            segment_audio = segment_audio,
+            use_original_audio = use_original_audio
+        ), deps = ['asr', 'matching'])
+
+        tracer = Tracer(results['lecture_name'])
+        sampler = self._resource_sampler(tracer)
+        with tracing(tracer), (sampler or nullcontext()):
+            executor.run()
+        executor.print_report()
+        print("\nSpans:\n" + tracer.format_summary())
+        results['timing'] = executor.report()
+        results['models'] = self.models.report()
+        results['trace'] = tracer.summary()
+        if sampler is not None:
+            results['resources'] = sampler.report()
+            print("\nResources:\n" + sampler.format_report(results['resources'], prefix = 'task.'))
+
+        if save_intermediate:
+            results['trace_files'] = tracer.save(lecture_output_dir)
+            self._save_results(lecture_output_dir, results)
+
+        print("\n" + "="*60)
+        print("PIPELINE COMPLETE!")
+        print("="*60)
+        print(f"Output directory: {lecture_output_dir}")
+        print(f"Lecture audio: {results['output_audio']}")
+
+        return results
+
+    def _prepare_run(
+        self,
+        audio_path: str,
+        pdf_path: str,
+        lecture_name: Optional[str],
+        save_intermediate: bool,
+        force_stages: Optional[List[str]]
+    ) -> Tuple[str, Dict[str, any], Optional[StageManifest], str]:
+        """
+        Set up the output directory, results and manifest of one lecture.
+
+        Returns:
+            Tuple of (lecture output directory, results dictionary, manifest
+            or None without save_intermediate, audio hash or None without a
+            manifest)
+
+        Raises:
+            ValueError: If force_stages names an unknown stage
+        """
+        unknown = set(force_stages or []) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)} (expected {self.STAGES})")
+
         # Generate lecture name if not provided
         if lecture_name is None:
             lecture_name = f"lecture_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
@@ -143,143 +374,483 @@ class LecturePipeline:
         lecture_output_dir = os.path.join(self.output_dir, lecture_name)
         os.makedirs(lecture_output_dir, exist_ok = True)
 
-        print("\n" + "="*60)
-        print(f"Running Pipeline for: {lecture_name}")
-        print("="*60)
-
         results = {
             'lecture_name': lecture_name,
             'audio_path': audio_path,
             'pdf_path': pdf_path,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(),
+            'execution': self._configure_execution(),
+            'stages': {}
+        }
+
+        manifest = None
+        if save_intermediate:
+            manifest = StageManifest(lecture_output_dir)
+            stages = list(force_stages or [])
+            if 'asr' in stages:
+                stages += [stage for stage in manifest.stages if stage.startswith('asr_shard_')]
+            manifest.invalidate(stages)
+
+        # Hashing reads the whole recording: only needed for checkpoints
+        audio_hash = manifest.file_hash(audio_path) if manifest is not None else None
+        return lecture_output_dir, results, manifest, audio_hash
+
+    def _save_results(self, lecture_output_dir: str, results: Dict[str, any]):
+        """Write pipeline_results.json (transcript shortened, matches counted)."""
+        final_results_path = os.path.join(lecture_output_dir, "pipeline_results.json")
+        # Make results JSON serializable
+        json_results = {
+            'lecture_name': results['lecture_name'],
+            'audio_path': results['audio_path'],
+            'pdf_path': results['pdf_path'],
+            'timestamp': results['timestamp'],
+            'stages': results['stages'],
+            'timing': results.get('timing'),
+            'models': results.get('models'),
+            'trace': results.get('trace'),
+            'trace_files': results.get('trace_files'),
+            'resources': results.get('resources'),
+            'execution': results.get('execution'),
+            'asr': {
+                'transcript_length': results['asr']['length'],
+                'transcript': results['asr']['transcript'][:500] + '...' if len(results['asr']['transcript']) > 500 else results['asr']['transcript'],
+                'cascade': results['asr'].get('cascade')
+            },
+            'matching': {
+                'num_matches': results['matching']['num_matches']
+            },
+            'tts': results['tts'],
+            'output_audio': results['output_audio']
         }
+        atomic_write_json(final_results_path, json_results)
+        print(f"\n✓ Final results saved: {final_results_path}")
+
+    def _resource_sampler(self, tracer: Tracer) -> Optional[ResourceSampler]:
+        """Resource sampler for one run (None when sampling is off)."""
+        if not self.resource_sample_interval:
+            return None
+        return ResourceSampler(
+            interval = self.resource_sample_interval,
+            track_allocations = self.track_allocations,
+            tracer = tracer
+        )
+
+    def _configure_execution(self) -> Dict[str, any]:
+        """
+        Resolve the device and, on CPU, set the torch thread pools (once).
+
+        Returns:
+            Dictionary with the device and, on CPU, thread counts and quantization
+        """
+        if self.execution is None:
+            device = resolve_device(self.device)
+            self.execution = {'device': device}
+            if is_cpu(device):
+                threads = configure_cpu_threads(self.cpu_threads, self.cpu_interop_threads)
+                self.execution.update({'threads': threads, 'quantize': self.cpu_quantize})
+                print(f"CPU profile: {threads['intra_op']} intra-op / {threads['inter_op']} inter-op threads"
+                      + (", int8 linear layers" if self.cpu_quantize else ""))
+        return self.execution
+
+    def unload_models(self):
+        """Release all resident models."""
+        self.models.unload_all()
+
+    def _check_stage(
+        self,
+        manifest: Optional[StageManifest],
+        stage: str,
+        params: Dict[str, any],
+        inputs: Dict[str, str],
+        results: Dict[str, any]
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Check whether a stage can be skipped, and record the decision in results.
+
+        Returns:
+            Tuple of (stage key, or None without a manifest; whether the
+            stage is up to date)
+        """
+        if manifest is None:
+            results['stages'][stage] = 'completed'
+            return None, False
+
+        key = manifest.stage_key(stage, params, inputs)
+        if manifest.is_complete(stage, key):
+            print(f"\n✓ Skipping {stage}: inputs unchanged since last run")
+            results['stages'][stage] = 'skipped'
+            return key, True
+
+        results['stages'][stage] = 'completed'
+        return key, False
+
+    def _asr_params(self, word_timestamps: bool) -> Dict[str, any]:
+        """Parameters that determine the ASR stage output."""
+        params = {
+            'model': self.asr.model_name,
+            'use_cascade': self.asr.use_cascade,
+            'cascade_model': self.asr.cascade_model_name,
+            'cascade_threshold': self.asr.cascade_threshold,
+            'cascade_chunk_seconds': self.asr.cascade_chunk_seconds,
+            'chunk_seconds': self.asr_chunk_seconds,
+            'batch_size': self.asr_batch_size,
+            'word_timestamps': word_timestamps
+        }
+        if self.asr.quantize and is_cpu(self.device):
+            params['quantize'] = True
+        if self.shard_seconds:
+            params['shard_seconds'] = self.shard_seconds
+            params['shard_search_seconds'] = self.shard_search_seconds
+        return params
+
+    def _asr_chunk_seconds(self) -> Optional[int]:
+        """Chunk duration passed to ASRProcessor.transcribe (None = cascade default)."""
+        return None if self.asr.use_cascade else self.asr_chunk_seconds
+
+    def _matching_params(self, sentence_splitter: Optional[callable]) -> Dict[str, any]:
+        """Parameters that determine the matching stage output."""
+        params = {
+            'model': self.matcher.model_name,
+            'jump_penalty': self.matcher.jump_penalty,
+            'backward_weight': self.matcher.backward_weight,
+            'use_exponential_scaling': self.matcher.use_exponential_scaling,
+            'exponential_scale': self.matcher.exponential_scale,
+            'use_confidence_boost': self.matcher.use_confidence_boost,
+            'confidence_threshold': self.matcher.confidence_threshold,
+            'confidence_weight': self.matcher.confidence_weight,
+            'sentence_splitter': _splitter_key(sentence_splitter)
+        }
+        if self.matcher.quantize and is_cpu(self.device):
+            params['quantize'] = True
+        return params
+
+    def _can_overlap_embedding(self) -> bool:
+        """
+        Whether page embedding may run concurrently with ASR.
+
+        Both models are then resident at once, so in auto mode this requires
+        a CUDA device with at least overlap_memory_gb free. On CPU the two
+        stages would only compete for the same cores.
+        """
+        if self.overlap_page_embedding is not None:
+            return self.overlap_page_embedding
+        if is_cpu(self.device) or not torch.cuda.is_available():
+            return False
+        free_bytes, _ = torch.cuda.mem_get_info()
+        return free_bytes / 1024**3 >= self.overlap_memory_gb
+
+    def _embed_pages(self, images: List[any]) -> any:
+        """Embed rendered pages with the matching model (overlapped with ASR)."""
+        with self.models.use('matcher'):
+            return self.matcher.embed_pages(images)
+
+    def _run_asr(
+        self,
+        audio_path: str,
+        audio_hash: str,
+        lecture_output_dir: str,
+        manifest: Optional[StageManifest],
+        results: Dict[str, any],
+        word_timestamps: bool = False
+    ) -> Dict[str, any]:
+        """
+        Stage 1: transcribe the lecture audio.
 
-        # ====================================================================
-        # Step 1: ASR - Transcribe audio
-        # ====================================================================
+        Artifacts: transcript.txt and asr.json (full ASR result, including
+        word timestamps when requested). Model errors propagate and an
+        empty transcript is not checkpointed, so a failed transcription is
+        never skipped as up to date by a later run.
+        """
         print("\n" + "="*60)
         print("STEP 1/3: ASR - Transcribing Audio")
         print("="*60)
 
-        transcript_path = os.path.join(lecture_output_dir, "transcript.txt") if save_intermediate else None
+        transcript_path = os.path.join(lecture_output_dir, "transcript.txt")
+        asr_json_path = os.path.join(lecture_output_dir, "asr.json")
+        params = self._asr_params(word_timestamps)
+        key, up_to_date = self._check_stage(manifest, 'asr', params, {'audio': audio_hash}, results)
 
-        asr_result = self.asr.transcribe(
-            audio_path = audio_path,
-            chunk_seconds = self.asr_chunk_seconds,
-            batch_size = self.asr_batch_size,
-            output_path = transcript_path
-        )
+        if up_to_date:
+            with open(asr_json_path, 'r', encoding = 'utf-8') as f:
+                asr_result = json.load(f)
+        else:
+            with self.models.use('asr'):
+                if self.shard_seconds:
+                    asr_result = self._transcribe_shards(
+                        audio_path, audio_hash, lecture_output_dir, manifest, params, word_timestamps
+                    )
+                else:
+                    asr_result = self.asr.transcribe(
+                        audio_path = audio_path,
+                        chunk_seconds = self._asr_chunk_seconds(),
+                        batch_size = self.asr_batch_size,
+                        word_timestamps = word_timestamps
+                    )
+
+            if manifest is not None:
+                atomic_write_text(transcript_path, asr_result['transcript'])
+                atomic_write_json(asr_json_path, asr_result)
+                print(f"\nTranscript saved to: {transcript_path}")
+                if asr_result['transcript'].strip():
+                    manifest.record('asr', key, params, {'audio': audio_hash}, {
+                        'transcript': transcript_path,
+                        'asr': asr_json_path
+                    })
+                else:
+                    # Silence or a failure: never skip ASR on the strength of an empty transcript
+                    print("⚠ Empty transcript: ASR is not checkpointed and will run again")
 
-        transcript = asr_result['transcript']
         results['asr'] = asr_result
+        print(f"\n✓ ASR Complete: {len(asr_result['transcript'])} characters")
+        if 'shards' in asr_result:
+            print(f"  - Transcribed as {len(asr_result['shards'])} shards")
+        if 'cascade' in asr_result:
+            print(f"  - Escalated to large model: {asr_result['cascade']['escalated_fraction'] * 100:.1f}% of audio")
+        return asr_result
+
+    def _transcribe_shards(
+        self,
+        audio_path: str,
+        audio_hash: str,
+        lecture_output_dir: str,
+        manifest: Optional[StageManifest],
+        params: Dict[str, any],
+        word_timestamps: bool
+    ) -> Dict[str, any]:
+        """
+        Transcribe a recording as resumable time shards cut at pauses.
+
+        Each shard is checkpointed on its own (asr_shards/asr_shard_NNN.json),
+        so an interrupted run only repeats unfinished shards. Shards are
+        transcribed one at a time: every model call takes ASRProcessor's
+        inference lock. Up to shard_prefetch further shards are decoded by
+        ffmpeg meanwhile, so only decoding time is hidden. Shards keep file
+        timestamps, and the stitched transcript is matched as a whole, so
+        sharding does not change the later stages.
+        """
+        with span('asr.plan_shards', 'asr') as args:
+            duration = probe_duration(audio_path)
+            shards = plan_shards(
+                duration,
+                self.shard_seconds,
+                read_window = lambda start, seconds: self.asr.read_audio(audio_path, start, seconds),
+                sample_rate = self.asr.sample_rate,
+                search_seconds = self.shard_search_seconds
+            )
+            args['shards'] = len(shards)
+        print(f"Split {duration / 60:.1f} min of audio into {len(shards)} shards at: "
+              + ', '.join(f"{shard['start']:.1f}s" for shard in shards[1:]))
+        shard_dir = os.path.join(lecture_output_dir, "asr_shards")
+
+        def transcribe_shard(shard):
+            stage = f"asr_shard_{shard['index']:03d}"
+            shard_path = os.path.join(shard_dir, f"{stage}.json")
+            inputs = {'audio': audio_hash, 'start': shard['start'], 'end': shard['end']}
+            key = manifest.stage_key(stage, params, inputs) if manifest is not None else None
+            if manifest is not None and manifest.is_complete(stage, key):
+                print(f"✓ Skipping shard {shard['index'] + 1}/{len(shards)}: transcribed in an earlier run")
+                with open(shard_path, 'r', encoding = 'utf-8') as f:
+                    return json.load(f)
+
+            with span('asr.shard', 'asr', index = shard['index'], seconds = shard['end'] - shard['start']):
+                shard_result = self.asr.transcribe(
+                    audio_path = audio_path,
+                    chunk_seconds = self._asr_chunk_seconds(),
+                    batch_size = self.asr_batch_size,
+                    word_timestamps = word_timestamps,
+                    start = shard['start'],
+                    duration = shard['end'] - shard['start']
+                )
+            if manifest is not None and shard_result['transcript'].strip():
+                atomic_write_json(shard_path, shard_result)
+                manifest.record(stage, key, params, inputs, {'asr': shard_path})
+            return shard_result
+
+        # One worker transcribes while the others decode the next shards
+        with ThreadPoolExecutor(max_workers = 1 + self.shard_prefetch) as pool:
+            shard_results = list(pool.map(transcribe_shard, shards))
+        return stitch_asr_results(shard_results, shards)
+
+    def _run_matching(
+        self,
+        transcript: str,
+        pdf_path: str,
+        sentence_splitter: Optional[callable],
+        lecture_output_dir: str,
+        manifest: Optional[StageManifest],
+        results: Dict[str, any],
+        page_images: Optional[List[any]] = None,
+        image_embeddings: Optional[any] = None
+    ) -> List[Dict[str, any]]:
+        """
+        Stage 2: match transcript sentences to PDF slides.
 
-        print(f"\n✓ ASR Complete: {len(transcript)} characters")
-
-        # Optionally unload ASR model to free memory
-        self.asr.unload_model()
-
-        # ====================================================================
-        # Step 2: Slide Matching - Match transcript to slides
-        # ====================================================================
+        Pages (or their embeddings) prepared while ASR was running are used
+        when given. Artifact: matching.json.
+        """
         print("\n" + "="*60)
         print("STEP 2/3: Slide Matching - Matching to PDF Slides")
         print("="*60)
 
-        # Split transcript into sentences if splitter provided
-        if sentence_splitter is not None:
-            sentences = sentence_splitter(transcript)
-            print(f"Split transcript into {len(sentences)} sentences")
+        matching_json_path = os.path.join(lecture_output_dir, "matching.json")
+        params = self._matching_params(sentence_splitter)
+        inputs = {}
+        if manifest is not None:
+            inputs = {'transcript': hash_text(transcript), 'pdf': manifest.file_hash(pdf_path)}
+        key, up_to_date = self._check_stage(manifest, 'matching', params, inputs, results)
+
+        if up_to_date:
+            with open(matching_json_path, 'r', encoding = 'utf-8') as f:
+                matching_results = json.load(f)
         else:
-            # Use full transcript as single query
-            sentences = None
-            print("Using full transcript as single query")
-
-        matching_results = self.matcher.match_transcript_to_slides(
-            transcript = transcript,
-            pdf_path = pdf_path,
-            sentences = sentences
-        )
+            # Split transcript into sentences if splitter provided
+            if sentence_splitter is not None:
+                sentences = sentence_splitter(transcript)
+                print(f"Split transcript into {len(sentences)} sentences")
+            else:
+                # Use full transcript as single query
+                sentences = None
+                print("Using full transcript as single query")
+
+            with self.models.use('matcher'):
+                matching_results = self.matcher.match_transcript_to_slides(
+                    transcript = transcript,
+                    pdf_path = pdf_path,
+                    sentences = sentences,
+                    page_images = page_images,
+                    image_embeddings = image_embeddings
+                )
+
+            if manifest is not None:
+                atomic_write_json(matching_json_path, matching_results)
+                print(f"\n✓ Matching results saved: {matching_json_path}")
+                manifest.record('matching', key, params, inputs, {'matching': matching_json_path})
 
         results['matching'] = {
             'num_matches': len(matching_results),
             'results': matching_results
         }
-
-        # Save matching results if requested
-        if save_intermediate:
-            matching_json_path = os.path.join(lecture_output_dir, "matching.json")
-            with open(matching_json_path, 'w', encoding = 'utf-8') as f:
-                json.dump(matching_results, f, ensure_ascii = False, indent = 2)
-            print(f"\n✓ Matching results saved: {matching_json_path}")
-
         print(f"\n✓ Slide Matching Complete: {len(matching_results)} matches")
+        return matching_results
 
-        # Optionally unload matching model to free memory
-        self.matcher.unload_model()
+    def _run_audio(
+        self,
+        matching_results: List[Dict[str, any]],
+        asr_result: Dict[str, any],
+        audio_path: str,
+        audio_hash: str,
+        lecture_output_dir: str,
+        manifest: Optional[StageManifest],
+        results: Dict[str, any],
+        export_audio_formats: Optional[List[str]] = None,
+        segment_audio: bool = False,
+        use_original_audio: bool = False
+    ):
+        """
+        Stage 3: generate slide-aligned audio (TTS or original recording).
 
-        # ====================================================================
-        # Step 3: TTS - Generate audio with slide alignment
-        # ====================================================================
+        Artifacts: timestamps.json, the WAV, every export format and the
+        segment manifest.
+        """
         print("\n" + "="*60)
-        print("STEP 3/3: TTS - Generating Audio with Slide Alignment")
+        if use_original_audio:
+            print("STEP 3/3: Alignment - Syncing Original Audio to Slides")
+        else:
+            print("STEP 3/3: TTS - Generating Audio with Slide Alignment")
         print("="*60)
 
-        output_audio_path = os.path.join(lecture_output_dir, "reconstructed.wav")
-        output_json_path = os.path.join(lecture_output_dir, "timestamps.json") if save_intermediate else None
-
-        tts_result = self.tts.generate_from_matching_results(
-            matching_results = matching_results,
-            output_audio_path = output_audio_path,
-            output_json_path = output_json_path,
-            export_formats = export_audio_formats
+        output_json_path = os.path.join(lecture_output_dir, "timestamps.json") if manifest is not None else None
+        segment_dir = os.path.join(lecture_output_dir, "segments") if segment_audio else None
+        output_audio_path = os.path.join(
+            lecture_output_dir, "original.wav" if use_original_audio else "reconstructed.wav"
         )
 
+        if use_original_audio:
+            params = {
+                'mode': 'original',
+                'sample_rate': self.original_audio.sample_rate,
+                'wav_subtype': self.original_audio.wav_subtype,
+                'segment_format': self.original_audio.segment_format,
+                'max_segment_seconds': self.original_audio.max_segment_seconds
+            }
+            inputs = {'audio': audio_hash, 'words': hash_text(json.dumps(asr_result.get('words')))}
+        else:
+            params = {
+                'mode': 'tts',
+                'voice': self.tts.voice,
+                'speed': self.tts.speed,
+                'lang_code': self.tts.lang_code,
+                'silence_duration': self.tts.silence_duration,
+                'sample_rate': self.tts.sample_rate,
+                'wav_subtype': self.tts.wav_subtype,
+                'segment_format': self.tts.segment_format,
+                'max_segment_seconds': self.tts.max_segment_seconds,
+                'batch_phonemes': self.tts.batch_phonemes,
+                'model_version': self.tts.model_version
+            }
+            if self.tts.quantize and is_cpu(self.device):
+                params['quantize'] = True
+            inputs = {}
+        params.update({'export_formats': export_audio_formats, 'segment_audio': segment_audio})
+        inputs['matching'] = hash_text(json.dumps(matching_results, sort_keys = True))
+        key, up_to_date = self._check_stage(manifest, 'audio', params, inputs, results)
+
+        if up_to_date:
+            with open(output_json_path, 'r', encoding = 'utf-8') as f:
+                tts_result = json.load(f)
+        elif use_original_audio:
+            tts_result = self.original_audio.generate_from_matching_results(
+                matching_results = matching_results,
+                words = asr_result['words'],
+                audio_path = audio_path,
+                output_audio_path = output_audio_path,
+                output_json_path = output_json_path,
+                export_formats = export_audio_formats,
+                segment_dir = segment_dir
+            )
+
+            print(f"\n✓ Alignment Complete: {tts_result['metadata']['total_sentences']} sentences")
+        else:
+            # Loaded lazily: fully cached lectures never start the pipeline
+            with self.models.use('tts', load = False):
+                tts_result = self.tts.generate_from_matching_results(
+                    matching_results = matching_results,
+                    output_audio_path = output_audio_path,
+                    output_json_path = output_json_path,
+                    export_formats = export_audio_formats,
+                    segment_dir = segment_dir
+                )
+
+            print(f"\n✓ TTS Complete: {tts_result['metadata']['total_duration']:.2f}s audio generated")
+
+        if manifest is not None and not up_to_date:
+            artifacts = {'timestamps': output_json_path}
+            root = os.path.splitext(output_audio_path)[0]
+            for path in sorted(glob.glob(glob.escape(root) + '.*')):
+                if '.partial' not in path:
+                    artifacts[os.path.basename(path)] = path
+            if segment_dir and os.path.exists(os.path.join(segment_dir, 'manifest.json')):
+                artifacts['segments'] = os.path.join(segment_dir, 'manifest.json')
+            manifest.record('audio', key, params, inputs, artifacts)
+
         results['tts'] = tts_result
         results['output_audio'] = output_audio_path
 
-        print(f"\n✓ TTS Complete: {tts_result['metadata']['total_duration']:.2f}s audio generated")
 
-        # Optionally unload TTS model
-        self.tts.unload_model()
-
-        # ====================================================================
-        # Save final results
-        # ====================================================================
-        if save_intermediate:
-            final_results_path = os.path.join(lecture_output_dir, "pipeline_results.json")
-            with open(final_results_path, 'w', encoding = 'utf-8') as f:
-                # Make results JSON serializable
-                json_results = {
-                    'lecture_name': results['lecture_name'],
-                    'audio_path': results['audio_path'],
-                    'pdf_path': results['pdf_path'],
-                    'timestamp': results['timestamp'],
-                    'asr': {
-                        'transcript_length': results['asr']['length'],
-                        'transcript': results['asr']['transcript'][:500] + '...' if len(results['asr']['transcript']) > 500 else results['asr']['transcript']
-                    },
-                    'matching': {
-                        'num_matches': results['matching']['num_matches']
-                    },
-                    'tts': results['tts'],
-                    'output_audio': results['output_audio']
-                }
-                json.dump(json_results, f, ensure_ascii = False, indent = 2)
-            print(f"\n✓ Final results saved: {final_results_path}")
-
-        print("\n" + "="*60)
-        print("PIPELINE COMPLETE!")
-        print("="*60)
-        print(f"Output directory: {lecture_output_dir}")
-        print(f"Reconstructed audio: {output_audio_path}")
-
-        return results
+def _splitter_key(sentence_splitter: Optional[callable]) -> Optional[str]:
+    """Identify a sentence splitter: qualified name of a function, repr of a configured object."""
+    if sentence_splitter is None:
+        return None
+    if hasattr(sentence_splitter, '__qualname__'):
+        return f"{sentence_splitter.__module__}.{sentence_splitter.__qualname__}"
+    return f"{type(sentence_splitter).__module__}.{sentence_splitter!r}"
 
 
 def simple_sentence_splitter(text: str) -> List[str]:
     """
     Simple sentence splitter (splits on '. ', '! ', '? ').
-    For production use, consider using NLTK or spaCy.
+    Splits after abbreviations and keeps one-word fragments; the CLI uses
+    sentence_segmenter.SentenceSegmenter instead.
 
     Args:
         text: Input text
@@ -295,37 +866,73 @@ def simple_sentence_splitter(text: str) -> List[str]:
     return sentences
 
 
-if __name__ == "__main__":
-    # Example usage
-    pipeline = LecturePipeline(
-        # ASR settings
-        asr_chunk_seconds = 300,
-        asr_batch_size = 4,
-
-        # Matching settings
-        jump_penalty = 0.1,
-        backward_weight = 2.0,
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description = "Reconstruct a lecture from its recording and slides")
+    parser.add_argument('audio_path', help = "Lecture audio or video file")
+    parser.add_argument('pdf_path', help = "Lecture slides (PDF)")
+    parser.add_argument('--lecture-name', default = None,
+                        help = "Output subdirectory name (reuse it to resume a run)")
+    parser.add_argument('--output-dir', default = './pipeline_output')
+    parser.add_argument('--device', default = 'auto', help = "cuda, cpu or auto (cuda if available)")
+    parser.add_argument('--cpu-threads', type = int, default = None,
+                        help = "Intra-op threads on CPU (default: usable cores)")
+    parser.add_argument('--cpu-quantize', action = 'store_true',
+                        help = "On CPU, quantize the models' linear layers to int8")
+    parser.add_argument('--tts-voice', default = 'af_heart')
+    parser.add_argument('--tts-speed', type = float, default = 1.0)
+    parser.add_argument('--export-format', action = 'append', dest = 'export_formats',
+                        choices = ['opus', 'aac'], help = "Additional audio format (repeatable)")
+    parser.add_argument('--segment-audio', action = 'store_true',
+                        help = "Write slide-aligned segments and an HLS playlist")
+    parser.add_argument('--original-audio', action = 'store_true',
+                        help = "Align the original recording instead of running TTS")
+    parser.add_argument('--force-stage', action = 'append', dest = 'force_stages',
+                        choices = LecturePipeline.STAGES, help = "Rerun a stage even if unchanged (repeatable)")
+    parser.add_argument('--min-sentence-words', type = int, default = 5,
+                        help = "Merge shorter sentences with a neighbour")
+    parser.add_argument('--max-sentence-words', type = int, default = 40,
+                        help = "Split longer sentences at clause boundaries")
+    parser.add_argument('--shard-minutes', type = float, default = None,
+                        help = "Transcribe long recordings in shards of about this length, cut at pauses")
+    parser.add_argument('--shard-prefetch', type = int, default = 1,
+                        help = "Shards decoded ahead of the one being transcribed (0 = none)")
+    parser.add_argument('--model-ram-budget-gb', type = float, default = None,
+                        help = "Host memory for resident models (default: unlimited)")
+    parser.add_argument('--model-vram-budget-gb', type = float, default = None,
+                        help = "GPU memory for resident models (default: 90%% of the device)")
+    args = parser.parse_args()
 
-        # TTS settings
-        tts_voice = 'af_heart',
-        tts_speed = 1.0,
-
-        # General settings
-        device = 'cuda',
-        output_dir = './pipeline_output'
+    pipeline = LecturePipeline(
+        tts_voice = args.tts_voice,
+        tts_speed = args.tts_speed,
+        model_ram_budget_gb = args.model_ram_budget_gb,
+        model_vram_budget_gb = args.model_vram_budget_gb,
+        shard_seconds = args.shard_minutes * 60 if args.shard_minutes else None,
+        shard_prefetch = args.shard_prefetch,
+        cpu_threads = args.cpu_threads,
+        cpu_quantize = args.cpu_quantize,
+        device = args.device,
+        output_dir = args.output_dir
     )
 
-    # Run pipeline
     results = pipeline.run(
-        audio_path = 'lecture_recording.mp3',
-        pdf_path = 'lecture_slides.pdf',
-        lecture_name = 'my_lecture',
-        sentence_splitter = simple_sentence_splitter,
-        export_audio_formats = ['opus'],
-        save_intermediate = True
+        audio_path = args.audio_path,
+        pdf_path = args.pdf_path,
+        lecture_name = args.lecture_name,
+        sentence_splitter = SentenceSegmenter(args.min_sentence_words, args.max_sentence_words),
+        export_audio_formats = args.export_formats,
+        segment_audio = args.segment_audio,
+        use_original_audio = args.original_audio,
+        force_stages = args.force_stages
     )
 
     print(f"\n✓ Pipeline completed successfully!")
+    print(f"  - Stages: {', '.join(f'{stage} {status}' for stage, status in results['stages'].items())}")
     print(f"  - Transcript length: {results['asr']['length']} characters")
     print(f"  - Matched sentences: {results['matching']['num_matches']}")
     print(f"  - Audio duration: {results['tts']['metadata']['total_duration']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Model Residency Module
+Keeps processor models loaded across stages and lectures within a memory budget
+"""
+
+import itertools
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from lazy_imports import lazy_import
+
+torch = lazy_import('torch')
+
+
+def module_footprint(*modules) -> Dict[str, int]:
+    """
+    Memory held by the parameters and buffers of torch modules.
+
+    Args:
+        modules: torch.nn.Module instances (None entries are ignored)
+
+    Returns:
+        Dictionary with 'ram_bytes' and 'vram_bytes'
+    """
+    footprint = {'ram_bytes': 0, 'vram_bytes': 0}
+    seen = set()
+    for module in modules:
+        if module is None:
+            continue
+        for tensor in itertools.chain(module.parameters(), module.buffers()):
+            if id(tensor) in seen:
+                continue
+            seen.add(id(tensor))
+            kind = 'vram_bytes' if tensor.device.type == 'cuda' else 'ram_bytes'
+            footprint[kind] += tensor.numel() * tensor.element_size()
+    return footprint
+
+
+def process_rss(pid: int) -> int:
+    """Resident set size of a process in bytes (0 where /proc is unavailable)."""
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ModelResidencyManager:
+    """
+    Decides which processor models stay loaded.
+
+    Processors are registered by name and used through use(). A model that
+    is already loaded is reused; before loading one, least recently used
+    models that are not in use are unloaded until the expected footprint
+    (measured on its previous load) fits into the RAM and VRAM budgets.
+    Before a model's first load its footprint is unknown, so every idle
+    model is unloaded when a budget is set. Without memory pressure
+    nothing is unloaded, so consecutive lectures reuse warm models.
+
+    Models load outside the manager's lock (one load per model at a time),
+    so report() and the use() of a loaded model do not wait for a load.
+
+    Processors must provide load_model(), unload_model(), is_loaded() and
+    memory_footprint() returning {'ram_bytes', 'vram_bytes'}.
+    """
+
+    def __init__(
+        self,
+        ram_budget_gb: Optional[float] = None,
+        vram_budget_gb: Optional[float] = None
+    ):
+        """
+        Initialize residency manager.
+
+        Args:
+            ram_budget_gb: Host memory for models (None = unlimited)
+            vram_budget_gb: GPU memory for models (None = 90% of the CUDA
+                device, unlimited without CUDA)
+        """
+        self.ram_budget_gb = ram_budget_gb
+        self.vram_budget_gb = vram_budget_gb
+        self._budgets = None
+        self.processors = {}
+        self.footprints = {}
+        self.resident = OrderedDict()
+        self.pins = defaultdict(int)
+        self.stats = defaultdict(lambda: {'loads': 0, 'reuses': 0, 'evictions': 0})
+        self._lock = threading.RLock()
+        self._load_locks = defaultdict(threading.Lock)
+
+    def register(self, name: str, processor):
+        """Register a processor under a name."""
+        self.processors[name] = processor
+        if processor.is_loaded():
+            self.resident[name] = True
+            self.footprints[name] = processor.memory_footprint()
+
+    @property
+    def budgets(self) -> Dict[str, Optional[float]]:
+        """Budgets in bytes (resolved on first use, so torch is not imported early)."""
+        if self._budgets is None:
+            vram_budget_gb = self.vram_budget_gb
+            if vram_budget_gb is None and torch.cuda.is_available():
+                vram_budget_gb = 0.9 * torch.cuda.get_device_properties(0).total_memory / 1024**3
+            self._budgets = {
+                'ram_bytes': self.ram_budget_gb * 1024**3 if self.ram_budget_gb is not None else None,
+                'vram_bytes': vram_budget_gb * 1024**3 if vram_budget_gb is not None else None
+            }
+        return self._budgets
+
+    def _used(self, kind: str) -> int:
+        return sum(self.footprints.get(name, {}).get(kind, 0) for name in self.resident)
+
+    def _fits(self, need: Dict[str, int]) -> bool:
+        for kind, budget in self.budgets.items():
+            if budget is not None and self._used(kind) + need.get(kind, 0) > budget:
+                return False
+        return True
+
+    def _make_room(self, name: str):
+        """Unload idle models so that a model can be loaded within the budgets."""
+        need = self.footprints.get(name)
+        if need is not None:
+            self._evict_until_fits(need, keep = name)
+        elif any(budget is not None for budget in self.budgets.values()):
+            # Unknown size (first load): loading next to idle models could exceed the budget
+            for other in list(self.resident):
+                if other != name and self.pins[other] == 0:
+                    self.evict(other)
+
+    def _evict_until_fits(self, need: Dict[str, int], keep: str):
+        """Unload LRU models not in use until need fits into the budgets."""
+        while not self._fits(need):
+            victim = next(
+                (name for name in self.resident if name != keep and self.pins[name] == 0),
+                None
+            )
+            if victim is None:
+                return
+            self.evict(victim)
+
+    def evict(self, name: str):
+        """Unload one model (no-op if it is not loaded)."""
+        with self._lock:
+            if name not in self.resident:
+                return
+            print(f"Unloading {name} to free memory")
+            self.processors[name].unload_model()
+            self.resident.pop(name, None)
+            self.stats[name]['evictions'] += 1
+
+    @contextmanager
+    def use(self, name: str, load: bool = True):
+        """
+        Make a processor available for the duration of a stage.
+
+        Args:
+            name: Registered processor name
+            load: Load the model now; with False only room is made and the
+                processor may load lazily (e.g. TTS with a warm cache)
+
+        Yields:
+            The processor
+        """
+        processor = self.processors[name]
+        with self._lock:
+            load_lock = self._load_locks[name]
+
+        with load_lock:
+            with self._lock:
+                loaded = processor.is_loaded()
+                if loaded:
+                    self.stats[name]['reuses'] += 1
+                else:
+                    self._make_room(name)
+                # Pinned: the model cannot be evicted while it loads or is in use
+                self.pins[name] += 1
+
+            if not loaded and load:
+                try:
+                    processor.load_model()
+                except BaseException:
+                    with self._lock:
+                        self.pins[name] -= 1
+                    raise
+
+        with self._lock:
+            if not loaded and load:
+                self.stats[name]['loads'] += 1
+            self._refresh(name)
+
+            # The footprint may have been larger than recorded
+            self._evict_until_fits({}, keep = name)
+            if not self._fits({}) and len(self.resident) > 1:
+                print(f"⚠ Model memory budget exceeded: {', '.join(self.resident)} are in use")
+
+        try:
+            yield processor
+        finally:
+            with self._lock:
+                self.pins[name] -= 1
+                if name not in self.resident and processor.is_loaded():
+                    self.stats[name]['loads'] += 1
+                self._refresh(name)
+
+    def _refresh(self, name: str):
+        """Re-measure a model and mark it as most recently used."""
+        processor = self.processors[name]
+        if not processor.is_loaded():
+            self.resident.pop(name, None)
+            return
+
+        self.footprints[name] = processor.memory_footprint()
+        self.resident[name] = True
+        self.resident.move_to_end(name)
+
+    def unload_all(self):
+        """Unload every model that is not in use."""
+        with self._lock:
+            for name in list(self.resident):
+                if self.pins[name] == 0:
+                    self.evict(name)
+
+    def report(self) -> Dict[str, any]:
+        """Footprint and load statistics per model."""
+        with self._lock:
+            return {
+                "budgets_gb": {
+                    kind.replace('_bytes', ''): round(budget / 1024**3, 2) if budget is not None else None
+                    for kind, budget in self.budgets.items()
+                },
+                "models": {
+                    name: {
+                        "resident": name in self.resident,
+                        "ram_gb": round(self.footprints.get(name, {}).get('ram_bytes', 0) / 1024**3, 3),
+                        "vram_gb": round(self.footprints.get(name, {}).get('vram_bytes', 0) / 1024**3, 3),
+                        **self.stats[name]
+                    }
+                    for name in self.processors
+                }
+            }
@@ -0,0 +1,343 @@
+"""
+Original Audio Module
+Slide-synced playback of the original lecture recording using ASR word timestamps
+"""
+
+import os
+import re
+import json
+import difflib
+import subprocess
+import numpy as np
+from typing import List, Dict, Optional, Iterator, Tuple
+from pathlib import Path
+
+from audio_sinks import WavSink, SlideSegmentSink, MultiSink, create_encoder_sinks
+from pipeline_tracing import span
+from lazy_imports import lazy_import
+
+librosa = lazy_import('librosa')
+
+
+def _normalize_word(word: str) -> str:
+    """Lowercase a word and strip punctuation for alignment."""
+    return re.sub(r"[^\w']+", '', word.lower())
+
+
+def align_sentences(
+    sentences: List[str],
+    words: List[Dict[str, any]]
+) -> Tuple[List[Optional[Tuple[float, float]]], int]:
+    """
+    Map sentences to time spans using ASR word timestamps.
+
+    Sentences normally come from splitting the ASR transcript, so their words
+    are the ASR words in order and are assigned one to one. If the texts
+    differ (edited sentences, a splitter that rewrites text), the two word
+    sequences are aligned with difflib and only matching words are used.
+
+    Args:
+        sentences: Sentence texts in transcript order
+        words: ASR words with 'word', 'start' and 'end' keys
+
+    Returns:
+        Tuple of (per-sentence (start, end) in seconds or None if no word
+        matched, number of matched words)
+    """
+    sentence_words = []
+    owners = []
+    for idx, sentence in enumerate(sentences):
+        tokens = [token for token in map(_normalize_word, sentence.split()) if token]
+        sentence_words.extend(tokens)
+        owners.extend([idx] * len(tokens))
+
+    asr_indices = [i for i, word in enumerate(words) if _normalize_word(word['word'])]
+    asr_words = [_normalize_word(words[i]['word']) for i in asr_indices]
+
+    if sentence_words == asr_words:
+        pairs = zip(range(len(sentence_words)), range(len(asr_words)))
+    else:
+        matcher = difflib.SequenceMatcher(None, sentence_words, asr_words, autojunk = False)
+        pairs = (
+            (block.a + k, block.b + k)
+            for block in matcher.get_matching_blocks()
+            for k in range(block.size)
+        )
+
+    spans = [None] * len(sentences)
+    matched = 0
+    for sentence_pos, asr_pos in pairs:
+        idx = owners[sentence_pos]
+        word = words[asr_indices[asr_pos]]
+        if spans[idx] is None:
+            spans[idx] = (word['start'], word['end'])
+        else:
+            spans[idx] = (min(spans[idx][0], word['start']), max(spans[idx][1], word['end']))
+        matched += 1
+
+    return spans, matched
+
+
+def _fill_gaps(spans: List[Optional[Tuple[float, float]]]) -> List[Tuple[float, float]]:
+    """Spread unaligned sentences evenly over the gap between their aligned neighbours."""
+    filled = list(spans)
+    idx = 0
+    while idx < len(filled):
+        if filled[idx] is not None:
+            idx += 1
+            continue
+        run_end = idx
+        while run_end < len(filled) and filled[run_end] is None:
+            run_end += 1
+
+        gap_start = filled[idx - 1][1] if idx > 0 else 0.0
+        gap_end = filled[run_end][0] if run_end < len(filled) else gap_start
+        step = max(0.0, gap_end - gap_start) / (run_end - idx)
+        for k in range(idx, run_end):
+            start = gap_start + (k - idx) * step
+            filled[k] = (start, start + step)
+        idx = run_end
+    return filled
+
+
+class OriginalAudioProcessor:
+    """
+    Builds slide-aligned lecture audio from the original recording.
+
+    Produces the same timestamps.json schema as TTSProcessor, with sentence
+    times taken from ASR word timestamps, and transcodes the recording to
+    the same output formats. No speech synthesis is involved.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 24000,
+        wav_subtype: str = 'PCM_16',
+        segment_format: str = 'aac',
+        max_segment_seconds: Optional[float] = 20.0
+    ):
+        """
+        Initialize original audio processor.
+
+        Args:
+            sample_rate: Output sample rate
+            wav_subtype: WAV sample format ('PCM_16' or 'FLOAT')
+            segment_format: Format of slide-aligned segments ('aac' with an HLS
+                playlist; 'opus' or 'wav' as plain files)
+            max_segment_seconds: Split slides longer than this into several segments
+        """
+        self.sample_rate = sample_rate
+        self.wav_subtype = wav_subtype
+        self.segment_format = segment_format
+        self.max_segment_seconds = max_segment_seconds
+
+    def _decode_audio(self, audio_path: str, block_seconds: float = 10.0) -> Iterator[np.ndarray]:
+        """
+        Decode the recording to mono float32 at the output sample rate.
+
+        Uses an ffmpeg pipe (audio or video containers), falling back to
+        librosa when ffmpeg is not installed.
+
+        Raises:
+            RuntimeError: If ffmpeg exits with an error
+        """
+        try:
+            process = subprocess.Popen(
+                [
+                    'ffmpeg', '-nostdin', '-v', 'error', '-i', audio_path,
+                    '-vn', '-f', 'f32le', '-ac', '1', '-ar', str(self.sample_rate), 'pipe:1'
+                ],
+                stdout = subprocess.PIPE,
+                stderr = subprocess.PIPE
+            )
+        except FileNotFoundError:
+            print("ffmpeg not found, decoding with librosa")
+            audio, _ = librosa.load(audio_path, sr = self.sample_rate, mono = True)
+            yield audio.astype(np.float32)
+            return
+
+        block_bytes = int(block_seconds * self.sample_rate) * 4
+        completed = False
+        try:
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                yield np.frombuffer(data[:len(data) // 4 * 4], dtype = '<f4')
+            completed = True
+        finally:
+            # Only stop ffmpeg early if the caller did not read to the end
+            if not completed and process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            stderr = process.stderr.read().decode(errors = 'replace')
+            process.stderr.close()
+            process.wait()
+
+        if process.returncode != 0:
+            # A partial decode would be written (and checkpointed) as the whole lecture
+            raise RuntimeError(f"ffmpeg could not decode {audio_path}: {stderr.strip()}")
+
+    def generate_from_matching_results(
+        self,
+        matching_results: List[Dict[str, any]],
+        words: List[Dict[str, any]],
+        audio_path: str,
+        output_audio_path: str = "lecture_audio.wav",
+        output_json_path: Optional[str] = None,
+        export_formats: Optional[List[str]] = None,
+        write_wav: bool = True,
+        segment_dir: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Align matched sentences to the recording and write its audio.
+
+        Each sentence's start_time/end_time is the span of its words in the
+        recording. The audio between two sentence starts (pauses included)
+        belongs to the earlier sentence, so slide segments tile the whole
+        recording.
+
+        Args:
+            matching_results: Results from SlideMatchingProcessor
+            words: Word timestamps from ASRProcessor.transcribe(word_timestamps=True)
+            audio_path: Original lecture recording
+            output_audio_path: Output WAV file path
+            output_json_path: Optional JSON metadata output path
+            export_formats: Optional list of additional formats
+            write_wav: Write the WAV file in addition to export_formats
+            segment_dir: Optional directory for slide-aligned segments
+
+        Returns:
+            Dictionary with metadata and timestamps
+
+        Raises:
+            ValueError: If no word timestamps are available
+        """
+        if not words:
+            raise ValueError("Original-audio mode needs ASR word timestamps, but none were returned")
+
+        texts = [result['text'] for result in matching_results]
+        with span('original.align', 'original', sentences = len(texts), words = len(words)):
+            spans, matched = align_sentences(texts, words)
+        unaligned = sum(1 for span in spans if span is None)
+        spans = _fill_gaps(spans)
+        print(f"Aligned {len(texts) - unaligned}/{len(texts)} sentences "
+              f"({matched}/{len(words)} words matched)")
+
+        timestamp_data = []
+        for idx, (result, (start, end)) in enumerate(zip(matching_results, spans)):
+            timestamp_data.append({
+                "sentence_id": idx + 1,
+                "text": result['text'],
+                "slide_number": result['matched_page'],
+                "start_time": round(start, 3),
+                "end_time": round(end, 3),
+                "duration": round(end - start, 3)
+            })
+
+        with span('original.transcode', 'original', sentences = len(timestamp_data)):
+            outputs = self._write_audio(
+                audio_path, timestamp_data, output_audio_path, export_formats, write_wav, segment_dir
+            )
+        for output in outputs:
+            if output and 'error' in output:
+                print(f"  ⚠ Failed to write {output['path']}: {output['error']}")
+            elif output and 'size_mb' in output:
+                print(f"✓ Audio saved: {output['path']} ({output['duration']:.2f}s, {output['size_mb']:.2f} MB)")
+
+        output_data = {
+            "metadata": {
+                "total_sentences": len(timestamp_data),
+                "total_duration": timestamp_data[-1]["end_time"] if timestamp_data else 0.0,
+                "voice": None,
+                "speed": 1.0,
+                "language_code": None,
+                "sample_rate": self.sample_rate,
+                "source": "original",
+                "alignment": {
+                    "total_words": len(words),
+                    "matched_words": matched,
+                    "unaligned_sentences": unaligned
+                }
+            },
+            "timestamps": timestamp_data
+        }
+
+        segment_output = next((output for output in outputs if output and 'segments' in output), None)
+        if segment_output:
+            output_data['metadata']['segments'] = {
+                "format": self.segment_format,
+                "count": segment_output['segments'],
+                "manifest": segment_output['path'],
+                "playlist": segment_output['playlist']
+            }
+
+        if output_json_path:
+            Path(output_json_path).parent.mkdir(parents = True, exist_ok = True)
+            temp_path = f"{output_json_path}.partial"
+            with open(temp_path, 'w', encoding = 'utf-8') as f:
+                json.dump(output_data, f, ensure_ascii = False, indent = 2)
+            os.replace(temp_path, output_json_path)
+            print(f"✓ Timestamp JSON saved: {output_json_path}")
+
+        return output_data
+
+    def _write_audio(
+        self,
+        audio_path: str,
+        timestamp_data: List[Dict[str, any]],
+        output_audio_path: str,
+        export_formats: Optional[List[str]],
+        write_wav: bool,
+        segment_dir: Optional[str]
+    ) -> List[Dict[str, any]]:
+        """
+        Transcode the recording in one decoding pass.
+
+        The decoded audio is cut at sentence start times and handed to the
+        same sinks TTS output uses, with no inserted silence.
+        """
+        sinks = []
+        if write_wav:
+            sinks.append(WavSink(
+                output_audio_path,
+                sample_rate = self.sample_rate,
+                silence_duration = 0.0,
+                subtype = self.wav_subtype
+            ))
+        if export_formats:
+            sinks.extend(create_encoder_sinks(
+                os.path.splitext(output_audio_path)[0],
+                export_formats,
+                sample_rate = self.sample_rate,
+                silence_duration = 0.0
+            ))
+        if segment_dir:
+            sinks.append(SlideSegmentSink(
+                segment_dir,
+                segment_format = self.segment_format,
+                sample_rate = self.sample_rate,
+                silence_duration = 0.0,
+                max_segment_seconds = self.max_segment_seconds
+            ))
+
+        # Sentence i covers [start_i, start_i+1); the first also covers the intro
+        boundaries = [int(round(info['start_time'] * self.sample_rate)) for info in timestamp_data[1:]]
+        blocks = self._decode_audio(audio_path)
+        buffer = np.zeros(0, dtype = np.float32)
+        consumed = 0
+
+        with MultiSink(sinks) as sink:
+            for idx, info in enumerate(timestamp_data):
+                end = boundaries[idx] if idx < len(boundaries) else None
+                while end is None or consumed + len(buffer) < end:
+                    block = next(blocks, None)
+                    if block is None:
+                        break
+                    buffer = np.concatenate([buffer, block])
+
+                take = len(buffer) if end is None else max(0, min(len(buffer), end - consumed))
+                sink.write_sentence(info, buffer[:take])
+                buffer = buffer[take:]
+                consumed += take
+            return sink.close()
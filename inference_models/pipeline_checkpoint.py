@@ -0,0 +1,185 @@
+"""
+Pipeline Checkpoint Module
+Content-hashed stage manifest for resuming LecturePipeline runs
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def hash_file(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def atomic_write_text(path: str, text: str):
+    """Write a text file under a temporary name and rename it into place."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok = True)
+    fd, temp_path = tempfile.mkstemp(suffix = '.partial', dir = directory)
+    try:
+        with os.fdopen(fd, 'w', encoding = 'utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: any):
+    """Write JSON atomically (see atomic_write_text)."""
+    atomic_write_text(path, json.dumps(data, ensure_ascii = False, indent = 2))
+
+
+class StageManifest:
+    """
+    Record of completed pipeline stages in a lecture output directory.
+
+    Each stage is stored with a key derived from its parameters and the
+    hashes of its inputs, plus the hash of every artifact it wrote. A stage
+    can be skipped on a rerun when its key is unchanged and all artifacts
+    are still on disk with the recorded contents. Stages may be recorded
+    from several threads.
+
+    File hashes are cached together with each file's size and modification
+    time, so unchanged inputs and artifacts (often multi-gigabyte
+    recordings) are read only once rather than on every run.
+    """
+
+    def __init__(self, output_dir: str, filename: str = 'manifest.json'):
+        """
+        Load (or start) the manifest of an output directory.
+
+        Args:
+            output_dir: Lecture output directory
+            filename: Manifest file name
+        """
+        self.path = os.path.join(output_dir, filename)
+        self.stages = {}
+        self.files = {}
+        self._lock = threading.RLock()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding = 'utf-8') as f:
+                    data = json.load(f)
+                self.stages = data.get('stages', {})
+                self.files = data.get('files', {})
+            except (OSError, ValueError):
+                print(f"⚠ Ignoring unreadable manifest: {self.path}")
+
+    def file_hash(self, path: str) -> str:
+        """
+        SHA-256 of a file, reusing the cached hash while its size and
+        modification time are unchanged.
+
+        Args:
+            path: File path
+
+        Returns:
+            Hex digest of the file's contents
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.files.get(key)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['sha256']
+
+        digest = hash_file(path)
+        with self._lock:
+            self.files[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+        return digest
+
+    def stage_key(self, stage: str, params: Dict[str, any], inputs: Dict[str, str]) -> str:
+        """Key identifying a stage's parameters and input hashes."""
+        payload = json.dumps(
+            {"stage": stage, "params": params, "inputs": inputs},
+            sort_keys = True,
+            ensure_ascii = False,
+            default = str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def is_complete(self, stage: str, key: str) -> bool:
+        """
+        Whether the stage already ran with this key and its artifacts are intact.
+
+        Args:
+            stage: Stage name
+            key: Key from stage_key for the current run
+
+        Returns:
+            True if the stage can be skipped
+        """
+        entry = self.stages.get(stage)
+        if entry is None or entry.get('key') != key:
+            return False
+
+        for artifact in entry.get('artifacts', {}).values():
+            if not os.path.exists(artifact['path']):
+                return False
+            if self.file_hash(artifact['path']) != artifact['sha256']:
+                return False
+        return True
+
+    def artifact(self, stage: str, name: str) -> Optional[Dict[str, str]]:
+        """Recorded artifact (path and sha256) of a stage."""
+        return self.stages.get(stage, {}).get('artifacts', {}).get(name)
+
+    def record(
+        self,
+        stage: str,
+        key: str,
+        params: Dict[str, any],
+        inputs: Dict[str, str],
+        artifacts: Dict[str, str]
+    ):
+        """
+        Mark a stage as complete and save the manifest.
+
+        Args:
+            stage: Stage name
+            key: Key from stage_key
+            params: Stage parameters (stored for inspection)
+            inputs: Input hashes (stored for inspection)
+            artifacts: Artifact name -> path of every file the stage wrote
+        """
+        entry = {
+            "key": key,
+            "params": params,
+            "inputs": inputs,
+            "artifacts": {
+                name: {"path": path, "sha256": self.file_hash(path)}
+                for name, path in artifacts.items()
+            },
+            "completed_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self.stages[stage] = entry
+            self.save()
+
+    def invalidate(self, stages: List[str]):
+        """Forget stages so that they run again."""
+        with self._lock:
+            for stage in stages:
+                self.stages.pop(stage, None)
+            self.save()
+
+    def save(self):
+        """Write the manifest atomically."""
+        with self._lock:
+            atomic_write_json(self.path, {"stages": self.stages, "files": self.files})
@@ -0,0 +1,718 @@
+"""
+Pipeline Daemon Module
+Long-lived LecturePipeline worker that keeps the models warm and takes jobs over a Unix socket
+"""
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from lecture_pipeline import LecturePipeline
+from sentence_segmenter import SentenceSegmenter
+
+
+DEFAULT_SOCKET = os.path.join(os.environ.get('XDG_RUNTIME_DIR', '/tmp'), 'lecture_pipeline.sock')
+
+# Events after which a job produces no further events ('stopped': the daemon exited first)
+TERMINAL_EVENTS = ('completed', 'failed', 'cancelled', 'stopped')
+
+JOB_OPTIONS = {
+    'lecture_name': str,
+    'min_sentence_words': int,
+    'max_sentence_words': int,
+    'export_formats': list,
+    'segment_audio': bool,
+    'use_original_audio': bool,
+    'force_stages': list
+}
+
+
+class _Job:
+    """Queued or running job with its event log."""
+
+    def __init__(self, job_id: str, request: Dict[str, any]):
+        self.id = job_id
+        self.request = request
+        self.status = 'queued'
+        self.submitted_at = datetime.now().isoformat()
+        self.result = None
+        self.events = []
+        self._cond = threading.Condition()
+
+    def emit(self, event: Dict[str, any]):
+        """Append an event and wake the connections following the job."""
+        event = {'job_id': self.id, 'time': round(time.time(), 3), **event}
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def follow(self) -> Iterator[Dict[str, any]]:
+        """Yield all events of the job, past and future, until it ends."""
+        index = 0
+        while True:
+            with self._cond:
+                while index >= len(self.events):
+                    self._cond.wait()
+                event = self.events[index]
+            index += 1
+            yield event
+            if event['event'] in TERMINAL_EVENTS:
+                return
+
+    def info(self) -> Dict[str, any]:
+        """Summary of the job for status replies."""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'lecture_name': self.request['lecture_name'],
+            'submitted_at': self.submitted_at
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line; replies are JSON lines."""
+
+    def setup(self):
+        super().setup()
+        self._send_lock = threading.Lock()
+        self.server.pipeline_daemon._register(self)
+
+    def finish(self):
+        self.server.pipeline_daemon._unregister(self)
+        super().finish()
+
+    def handle(self):
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._send({'event': 'error', 'error': 'Invalid JSON request'})
+                    continue
+                self.server.pipeline_daemon.handle_request(request, self._send)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away; its job keeps running
+            pass
+
+    def _send(self, message: Dict[str, any]):
+        with self._send_lock:
+            self.wfile.write((json.dumps(message, ensure_ascii = False, default = str) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+    def close(self, message: Dict[str, any]):
+        """Send a last message and end the connection (called from another thread)."""
+        try:
+            self._send(message)
+        except (OSError, ValueError):
+            pass
+        try:
+            # Also wakes handle() if it is waiting for the next request
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class PipelineDaemon:
+    """
+    Serves LecturePipeline jobs from one long-lived process.
+
+    The pipeline and its models are created once and stay loaded between
+    jobs, so a submitted job starts without model load time. Jobs are queued
+    and run one at a time on the warm pipeline; clients receive an event per
+    pipeline task as it starts and finishes. SIGTERM (or a 'drain' request)
+    stops accepting jobs, finishes the queue and exits; SIGHUP (or 'reload')
+    rebuilds the pipeline from its factory after the current job, e.g. to
+    pick up a changed configuration file.
+    """
+
+    def __init__(
+        self,
+        pipeline_factory: Callable[[], LecturePipeline],
+        socket_path: str = DEFAULT_SOCKET,
+        preload: Optional[List[str]] = None,
+        max_queued: int = 16,
+        keep_finished: int = 100
+    ):
+        """
+        Initialize the daemon.
+
+        Args:
+            pipeline_factory: Function returning a configured LecturePipeline
+            socket_path: Path of the Unix socket to listen on
+            preload: Models to load at startup and after a reload
+                ('asr', 'matcher', 'tts'); others load with the first job
+            max_queued: Jobs that may wait before submissions are refused
+            keep_finished: Finished jobs whose events can still be followed
+        """
+        self.pipeline_factory = pipeline_factory
+        self.socket_path = socket_path
+        self.preload = list(preload or [])
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+
+        self.pipeline = None
+        self.started_at = None
+        self.jobs = OrderedDict()
+        self._queue = deque()
+        self._current = None
+        self._draining = False
+        self._reload_requested = False
+        self._reloads = 0
+        self._job_ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._server = None
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+
+    def serve(self):
+        """Listen on the socket and run jobs until drained."""
+        self._bind()
+        self.started_at = datetime.now().isoformat()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda signum, frame: self.drain())
+            signal.signal(signal.SIGINT, lambda signum, frame: self.drain())
+            signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+
+        server_thread = threading.Thread(target = self._server.serve_forever, name = 'daemon-server', daemon = True)
+        worker_thread = threading.Thread(target = self._worker, name = 'daemon-worker')
+        server_thread.start()
+        worker_thread.start()
+        print(f"✓ Pipeline daemon listening on {self.socket_path} (pid {os.getpid()})")
+
+        # Signal handlers run in the main thread: keep it free to receive them
+        while not self._stopped.wait(0.5):
+            pass
+        worker_thread.join()
+
+        self._close_connections()
+        self._server.shutdown()
+        self._server.server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        print("✓ Pipeline daemon stopped")
+
+    def _bind(self):
+        """
+        Create the listening socket, replacing a stale socket file.
+
+        Raises:
+            RuntimeError: If another daemon is listening on the socket
+        """
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self.socket_path)
+            else:
+                raise RuntimeError(f"A daemon is already running on {self.socket_path}")
+            finally:
+                probe.close()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok = True)
+        # Jobs name arbitrary files: only the owner may submit them. The
+        # socket is created with these permissions (a chmod afterwards would
+        # leave a window); no other threads run yet to share the umask.
+        previous_umask = os.umask(0o077)
+        try:
+            self._server = _Server(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+        self._server.pipeline_daemon = self
+
+    def _register(self, connection: _RequestHandler):
+        with self._connections_lock:
+            self._connections.add(connection)
+
+    def _unregister(self, connection: _RequestHandler):
+        with self._connections_lock:
+            self._connections.discard(connection)
+
+    def _close_connections(self):
+        """
+        End unfinished jobs and open connections with a 'stopped' event.
+
+        Jobs are only left unfinished if the worker failed; their followers
+        receive 'stopped' as the job's last event. Every connection still
+        open (followers, idle clients) then gets a final 'stopped' message
+        and is closed, so no client waits on a daemon that has exited.
+        """
+        with self._cond:
+            unfinished = [job for job in self.jobs.values() if job.status not in TERMINAL_EVENTS]
+            for job in unfinished:
+                job.status = 'stopped'
+            self._queue.clear()
+        for job in unfinished:
+            job.emit({'event': 'stopped'})
+
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            connection.close({'event': 'stopped'})
+
+    def submit(self, request: Dict[str, any]) -> _Job:
+        """
+        Validate a job and queue it.
+
+        Args:
+            request: Dictionary with 'audio_path', 'pdf_path' and optional
+                JOB_OPTIONS; lecture_name defaults to the audio file stem so
+                that resubmitting a lecture resumes it
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If the job is invalid
+            RuntimeError: If the daemon is draining or the queue is full
+        """
+        request = self._validate(request)
+        with self._cond:
+            if self._draining:
+                raise RuntimeError("Daemon is draining and accepts no new jobs")
+            if len(self._queue) >= self.max_queued:
+                raise RuntimeError(f"Queue is full ({self.max_queued} jobs)")
+
+            job = _Job(f"job-{next(self._job_ids)}", request)
+            self.jobs[job.id] = job
+            self._queue.append(job)
+            position = len(self._queue) + (self._current is not None)
+            job.emit({'event': 'accepted', 'lecture_name': request['lecture_name'], 'position': position})
+            self._cond.notify_all()
+        return job
+
+    @staticmethod
+    def _validate(request: Dict[str, any]) -> Dict[str, any]:
+        """Check paths and option types of a job; returns a normalized copy."""
+        if not isinstance(request, dict):
+            raise ValueError("Job must be an object")
+        for key in ('audio_path', 'pdf_path'):
+            path = request.get(key)
+            if not isinstance(path, str) or not os.path.isfile(path):
+                raise ValueError(f"{key} is not a file: {path!r}")
+
+        unknown = set(request) - set(JOB_OPTIONS) - {'audio_path', 'pdf_path'}
+        if unknown:
+            raise ValueError(f"Unknown job options: {sorted(unknown)}")
+        for key, expected in JOB_OPTIONS.items():
+            if request.get(key) is not None and not isinstance(request[key], expected):
+                raise ValueError(f"{key} must be of type {expected.__name__}")
+
+        unknown = set(request.get('force_stages') or []) - set(LecturePipeline.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)} (expected {LecturePipeline.STAGES})")
+        unknown = set(request.get('export_formats') or []) - {'opus', 'aac'}
+        if unknown:
+            raise ValueError(f"Unknown export formats: {sorted(unknown)}")
+
+        request = dict(request)
+        lecture_name = request.get('lecture_name') or Path(request['audio_path']).stem
+        if os.sep in lecture_name or lecture_name in ('.', '..'):
+            raise ValueError(f"Invalid lecture name: {lecture_name!r}")
+        request['lecture_name'] = lecture_name
+        return request
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a queued job; running jobs are not interrupted."""
+        with self._cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.status != 'queued':
+                return False
+            self._queue.remove(job)
+            job.status = 'cancelled'
+            self._finish(job)
+        job.emit({'event': 'cancelled'})
+        return True
+
+    def drain(self):
+        """Stop accepting jobs; exit once the queue is empty."""
+        with self._cond:
+            if not self._draining:
+                print(f"\nDraining: {len(self._queue)} queued job(s) left")
+            self._draining = True
+            self._cond.notify_all()
+
+    def reload(self):
+        """Rebuild the pipeline before the next job."""
+        with self._cond:
+            self._reload_requested = True
+            self._cond.notify_all()
+
+    def status(self) -> Dict[str, any]:
+        """Daemon state, queue and recent jobs."""
+        with self._cond:
+            return {
+                'pid': os.getpid(),
+                'started_at': self.started_at,
+                'draining': self._draining,
+                'reloads': self._reloads,
+                'running': self._current.info() if self._current else None,
+                'queued': [job.info() for job in self._queue],
+                'recent': [job.info() for job in self.jobs.values() if job.status in TERMINAL_EVENTS][-10:],
+                'models': self.pipeline.models.report() if self.pipeline is not None else None
+            }
+
+    def handle_request(self, request: Dict[str, any], send: Callable[[Dict[str, any]], None]):
+        """
+        Answer one client request.
+
+        Args:
+            request: Dictionary with 'op' ('submit', 'events', 'cancel',
+                'status', 'drain' or 'reload') and its arguments
+            send: Function writing one reply message to the client
+        """
+        op = request.get('op') if isinstance(request, dict) else None
+        try:
+            if op == 'submit':
+                job = self.submit(request.get('job'))
+                if request.get('follow', True):
+                    for event in job.follow():
+                        send(event)
+                else:
+                    send(job.events[0])
+            elif op == 'events':
+                job = self.jobs.get(request.get('job_id'))
+                if job is None:
+                    raise ValueError(f"Unknown job: {request.get('job_id')!r}")
+                for event in job.follow():
+                    send(event)
+            elif op == 'cancel':
+                send({'event': 'cancel', 'job_id': request.get('job_id'), 'cancelled': self.cancel(request.get('job_id'))})
+            elif op == 'status':
+                send({'event': 'status', **self.status()})
+            elif op == 'drain':
+                self.drain()
+                send({'event': 'draining', 'queued': len(self._queue)})
+            elif op == 'reload':
+                self.reload()
+                send({'event': 'reload_scheduled'})
+            else:
+                raise ValueError(f"Unknown op: {op!r}")
+        except (ValueError, RuntimeError) as e:
+            send({'event': 'error', 'error': str(e)})
+
+    def _worker(self):
+        """Run queued jobs one at a time on the warm pipeline."""
+        try:
+            self._load_pipeline()
+            while True:
+                with self._cond:
+                    while not (self._queue or self._reload_requested or self._draining):
+                        self._cond.wait()
+                    if self._reload_requested:
+                        self._reload_requested = False
+                        job = None
+                    elif self._queue:
+                        job = self._queue.popleft()
+                        job.status = 'running'
+                        self._current = job
+                    else:
+                        break
+
+                if job is None:
+                    self._load_pipeline()
+                    continue
+                self._run_job(job)
+        finally:
+            if self.pipeline is not None:
+                self.pipeline.unload_models()
+            self._stopped.set()
+
+    def _load_pipeline(self):
+        """Create the pipeline (replacing the current one) and preload models."""
+        try:
+            pipeline = self.pipeline_factory()
+        except Exception as e:
+            if self.pipeline is None:
+                raise
+            print(f"⚠ Reload failed, keeping the current pipeline: {e}")
+            return
+
+        if self.pipeline is not None:
+            self.pipeline.unload_models()
+            self._reloads += 1
+            print("✓ Pipeline reloaded")
+        self.pipeline = pipeline
+
+        for name in self.preload:
+            with self.pipeline.models.use(name):
+                pass
+        if self.preload:
+            print(f"✓ Preloaded models: {', '.join(self.preload)}")
+
+    def _run_job(self, job: _Job):
+        """Run one job and record its outcome as events."""
+        request = job.request
+        job.emit({'event': 'started'})
+        start = time.perf_counter()
+        try:
+            results = self.pipeline.run(
+                audio_path = request['audio_path'],
+                pdf_path = request['pdf_path'],
+                lecture_name = request['lecture_name'],
+                sentence_splitter = SentenceSegmenter(
+                    request.get('min_sentence_words') or 5,
+                    request.get('max_sentence_words') or 40
+                ),
+                export_audio_formats = request.get('export_formats'),
+                segment_audio = bool(request.get('segment_audio')),
+                use_original_audio = bool(request.get('use_original_audio')),
+                force_stages = request.get('force_stages'),
+                progress = lambda event: job.emit({'event': 'task', **event})
+            )
+        except Exception as e:
+            traceback.print_exc()
+            job.status = 'failed'
+            outcome = {'event': 'failed', 'error': f"{type(e).__name__}: {e}"}
+        else:
+            job.status = 'completed'
+            job.result = {
+                'lecture_name': results['lecture_name'],
+                'output_dir': os.path.join(self.pipeline.output_dir, results['lecture_name']),
+                'output_audio': results['output_audio'],
+                'stages': results['stages'],
+                'transcript_length': results['asr']['length'],
+                'num_matches': results['matching']['num_matches'],
+                'audio_duration': results['tts']['metadata']['total_duration']
+            }
+            outcome = {'event': 'completed', 'result': job.result}
+        outcome['seconds'] = round(time.perf_counter() - start, 3)
+
+        with self._cond:
+            self._current = None
+            self._finish(job)
+        job.emit(outcome)
+
+    def _finish(self, job: _Job):
+        """Forget the oldest finished jobs beyond keep_finished (lock held)."""
+        finished = [key for key, other in self.jobs.items() if other.status in TERMINAL_EVENTS]
+        for key in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self.jobs[key]
+
+
+class PipelineClient:
+    """Client for a PipelineDaemon socket."""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: Optional[float] = None):
+        """
+        Initialize the client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket
+            timeout: Socket timeout in seconds (None waits indefinitely,
+                as following a job lasts as long as the job)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, request: Dict[str, any], until: tuple) -> Iterator[Dict[str, any]]:
+        """Send a request and yield replies up to the first whose event is in until."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            sock.sendall((json.dumps(request) + '\n').encode('utf-8'))
+            with sock.makefile('r', encoding = 'utf-8') as replies:
+                for line in replies:
+                    event = json.loads(line)
+                    yield event
+                    if event['event'] in until or event['event'] in ('error', 'stopped'):
+                        return
+        raise ConnectionError("Daemon closed the connection")
+
+    def _call(self, request: Dict[str, any]) -> Dict[str, any]:
+        """Send a request with a single reply."""
+        reply = next(self._request(request, until = ('status', 'draining', 'reload_scheduled', 'cancel')))
+        if reply['event'] == 'error':
+            raise RuntimeError(reply['error'])
+        if reply['event'] == 'stopped':
+            raise ConnectionError("Daemon stopped")
+        return reply
+
+    def submit(
+        self,
+        audio_path: str,
+        pdf_path: str,
+        follow: bool = True,
+        **options
+    ) -> Iterator[Dict[str, any]]:
+        """
+        Submit a job.
+
+        Args:
+            audio_path: Path to lecture audio file
+            pdf_path: Path to lecture PDF file
+            follow: Yield the job's events until it ends; otherwise only the
+                'accepted' event
+            **options: Job options (lecture_name, min_sentence_words,
+                max_sentence_words, export_formats, segment_audio,
+                use_original_audio, force_stages)
+
+        Returns:
+            Iterator over job events ('accepted', 'started', 'task', then
+            'completed' or 'failed'); an 'error' event if the job was refused
+        """
+        job = {'audio_path': os.path.abspath(audio_path), 'pdf_path': os.path.abspath(pdf_path), **options}
+        until = TERMINAL_EVENTS if follow else ('accepted',)
+        return self._request({'op': 'submit', 'job': job, 'follow': follow}, until = until)
+
+    def events(self, job_id: str) -> Iterator[Dict[str, any]]:
+        """Iterator over all events of a job, until it ends."""
+        return self._request({'op': 'events', 'job_id': job_id}, until = TERMINAL_EVENTS)
+
+    def cancel(self, job_id: str) -> bool:
+        """Remove a queued job; returns whether it was removed."""
+        return self._call({'op': 'cancel', 'job_id': job_id})['cancelled']
+
+    def status(self) -> Dict[str, any]:
+        """Daemon state, queue and recent jobs."""
+        return self._call({'op': 'status'})
+
+    def drain(self) -> Dict[str, any]:
+        """Ask the daemon to finish its queue and exit."""
+        return self._call({'op': 'drain'})
+
+    def reload(self) -> Dict[str, any]:
+        """Ask the daemon to rebuild its pipeline after the current job."""
+        return self._call({'op': 'reload'})
+
+
+def format_event(event: Dict[str, any]) -> str:
+    """One-line description of a job event."""
+    kind = event['event']
+    if kind == 'accepted':
+        return f"{event['job_id']} accepted ({event['lecture_name']}, position {event['position']})"
+    if kind == 'task':
+        line = f"  [{event['task']}] {event['status']}"
+        if event.get('seconds') is not None:
+            line += f" in {event['seconds']:.2f}s"
+        if event.get('stage_status'):
+            line += f" ({event['stage_status']})"
+        return line
+    if kind == 'completed':
+        result = event['result']
+        return (f"✓ {event['job_id']} completed in {event['seconds']:.2f}s: {result['output_audio']} "
+                f"({result['audio_duration']:.2f}s audio, {result['num_matches']} matched sentences)")
+    if kind == 'failed':
+        return f"✗ {event['job_id']} failed: {event['error']}"
+    if kind == 'error':
+        return f"✗ {event['error']}"
+    if kind == 'stopped':
+        return f"✗ Daemon stopped before {event['job_id']} finished" if 'job_id' in event else "✗ Daemon stopped"
+    return f"{event.get('job_id', '')} {kind}".strip()
+
+
+def load_config(path: Optional[str]) -> Dict[str, any]:
+    """LecturePipeline keyword arguments from a JSON file (empty without a path)."""
+    if not path:
+        return {}
+    with open(path, 'r', encoding = 'utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path} must contain a JSON object of LecturePipeline arguments")
+    return config
+
+
+def main():
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description = "Lecture pipeline daemon and client")
+    parser.add_argument('--socket', default = DEFAULT_SOCKET, help = f"Unix socket path (default: {DEFAULT_SOCKET})")
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    serve = commands.add_parser('serve', help = "Run the daemon")
+    serve.add_argument('--config', help = "JSON object of LecturePipeline arguments, re-read on reload")
+    serve.add_argument('--output-dir', help = "Overrides output_dir of the config")
+    serve.add_argument('--device', help = "Overrides device of the config (cuda, cpu or auto)")
+    serve.add_argument('--preload', nargs = '*', choices = ['asr', 'matcher', 'tts'], default = [],
+                       help = "Models to load at startup instead of with the first job")
+    serve.add_argument('--max-queued', type = int, default = 16)
+
+    submit = commands.add_parser('submit', help = "Submit a lecture and follow its progress")
+    submit.add_argument('audio', help = "Path to lecture audio file")
+    submit.add_argument('pdf', help = "Path to lecture PDF file")
+    submit.add_argument('--lecture-name', help = "Output name (default: audio file name)")
+    submit.add_argument('--export-format', action = 'append', dest = 'export_formats',
+                        choices = ['opus', 'aac'], help = "Additional audio format (repeatable)")
+    submit.add_argument('--segment-audio', action = 'store_true',
+                        help = "Write slide-aligned segments and an HLS playlist")
+    submit.add_argument('--original-audio', action = 'store_true',
+                        help = "Align the original recording instead of running TTS")
+    submit.add_argument('--min-sentence-words', type = int, default = 5)
+    submit.add_argument('--max-sentence-words', type = int, default = 40)
+    submit.add_argument('--force-stage', action = 'append', dest = 'force_stages',
+                        choices = LecturePipeline.STAGES, help = "Rerun a stage even if unchanged (repeatable)")
+    submit.add_argument('--no-follow', action = 'store_true', help = "Return once the job is queued")
+
+    for name, help_text in (('events', "Follow the events of a job"), ('cancel', "Remove a queued job")):
+        command = commands.add_parser(name, help = help_text)
+        command.add_argument('job_id')
+    commands.add_parser('status', help = "Show the daemon's queue and models")
+    commands.add_parser('drain', help = "Finish queued jobs, then exit")
+    commands.add_parser('reload', help = "Re-read the config and rebuild the pipeline after the current job")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        def pipeline_factory():
+            config = load_config(args.config)
+            if args.output_dir:
+                config['output_dir'] = args.output_dir
+            if args.device:
+                config['device'] = args.device
+            return LecturePipeline(**config)
+
+        daemon = PipelineDaemon(
+            pipeline_factory,
+            socket_path = args.socket,
+            preload = args.preload,
+            max_queued = args.max_queued
+        )
+        daemon.serve()
+        return
+
+    client = PipelineClient(args.socket)
+    if args.command in ('submit', 'events'):
+        if args.command == 'submit':
+            events = client.submit(
+                args.audio, args.pdf,
+                follow = not args.no_follow,
+                lecture_name = args.lecture_name,
+                export_formats = args.export_formats,
+                segment_audio = args.segment_audio,
+                use_original_audio = args.original_audio,
+                min_sentence_words = args.min_sentence_words,
+                max_sentence_words = args.max_sentence_words,
+                force_stages = args.force_stages
+            )
+        else:
+            events = client.events(args.job_id)
+        for event in events:
+            print(format_event(event), flush = True)
+            if event['event'] in ('failed', 'error', 'stopped'):
+                raise SystemExit(1)
+    elif args.command == 'cancel':
+        print("✓ Cancelled" if client.cancel(args.job_id) else "✗ Job is not queued")
+    else:
+        reply = getattr(client, args.command)()
+        reply.pop('event')
+        print(json.dumps(reply, indent = 2, ensure_ascii = False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Pipeline Dataflow Module
+Dependency-driven concurrent execution of pipeline tasks with critical-path timing
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+from pipeline_tracing import span
+
+
+class DataflowExecutor:
+    """
+    Runs named tasks as soon as the tasks they depend on have finished.
+
+    Tasks run in threads; each receives the results of its dependencies as
+    positional arguments, in the order they were declared. After run(),
+    report() breaks the end-to-end latency down along the critical path,
+    the chain of tasks that actually determined when the last one finished.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        on_task: Optional[Callable[[str, str, Optional[float]], None]] = None
+    ):
+        """
+        Initialize executor.
+
+        Args:
+            max_workers: Maximum number of tasks running at once
+            on_task: Optional callback (task name, 'started', 'finished' or
+                'failed', seconds or None) called from the task's thread
+        """
+        self.max_workers = max_workers
+        self.on_task = on_task
+        self.tasks = {}
+        self.timings = {}
+        self.wall_time = 0.0
+
+    def add(self, name: str, fn: Callable, deps: Sequence[str] = ()):
+        """
+        Register a task.
+
+        Args:
+            name: Unique task name
+            fn: Callable receiving the results of deps
+            deps: Names of tasks that must finish first (already registered)
+
+        Raises:
+            ValueError: If the name is taken or a dependency is unknown
+        """
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        unknown = [dep for dep in deps if dep not in self.tasks]
+        if unknown:
+            raise ValueError(f"Task {name} depends on unknown tasks: {unknown}")
+        self.tasks[name] = (fn, list(deps))
+
+    def _timed(self, name: str, fn: Callable, args: List[any], origin: float) -> any:
+        start = time.perf_counter() - origin
+        self._notify(name, 'started', None)
+        status = 'failed'
+        try:
+            with span(f"task.{name}", 'dataflow'):
+                result = fn(*args)
+            status = 'finished'
+            return result
+        finally:
+            end = time.perf_counter() - origin
+            self.timings[name] = (start, end)
+            self._notify(name, status, end - start)
+
+    def _notify(self, name: str, status: str, seconds: Optional[float]):
+        if self.on_task is None:
+            return
+        try:
+            self.on_task(name, status, seconds)
+        except Exception as e:
+            # A broken progress listener must not fail the task
+            print(f"⚠ Task callback failed for {name}: {e}")
+
+    def run(self) -> Dict[str, any]:
+        """
+        Run all tasks.
+
+        Returns:
+            Results by task name
+
+        Raises:
+            Exception: The first task failure; tasks that have not started
+                are cancelled, running ones are waited for
+        """
+        results = {}
+        pending = dict(self.tasks)
+        running = {}
+        origin = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers = self.max_workers) as pool:
+            while pending or running:
+                for name in list(pending):
+                    fn, deps = pending[name]
+                    if all(dep in results for dep in deps):
+                        del pending[name]
+                        args = [results[dep] for dep in deps]
+                        running[pool.submit(self._timed, name, fn, args, origin)] = name
+
+                done, _ = wait(running, return_when = FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+
+        self.wall_time = time.perf_counter() - origin
+        return results
+
+    def report(self) -> Dict[str, any]:
+        """
+        Latency breakdown of the last run.
+
+        Returns:
+            Dictionary with wall time, the serial sum of task times, time
+            saved by overlapping, per-task timings and the critical path
+            (each entry with its duration and the time it waited after its
+            last dependency finished)
+        """
+        tasks = {
+            name: {
+                "start": round(start, 3),
+                "end": round(end, 3),
+                "duration": round(end - start, 3),
+                "deps": self.tasks[name][1]
+            }
+            for name, (start, end) in self.timings.items()
+        }
+
+        # Walk back from the last task along the latest-finishing dependency
+        path = []
+        name = max(self.timings, key = lambda task: self.timings[task][1]) if self.timings else None
+        while name is not None:
+            path.append(name)
+            deps = [dep for dep in self.tasks[name][1] if dep in self.timings]
+            name = max(deps, key = lambda task: self.timings[task][1]) if deps else None
+        path.reverse()
+
+        critical_path = []
+        previous_end = 0.0
+        for name in path:
+            start, end = self.timings[name]
+            critical_path.append({
+                "task": name,
+                "duration": round(end - start, 3),
+                "waited": round(max(0.0, start - previous_end), 3)
+            })
+            previous_end = end
+
+        serial_time = sum(end - start for start, end in self.timings.values())
+        return {
+            "wall_time": round(self.wall_time, 3),
+            "serial_time": round(serial_time, 3),
+            "overlap_saved": round(max(0.0, serial_time - self.wall_time), 3),
+            "critical_path": critical_path,
+            "tasks": tasks
+        }
+
+    def print_report(self):
+        """Print the critical-path breakdown."""
+        report = self.report()
+        print(f"\nEnd-to-end: {report['wall_time']:.1f}s "
+              f"(tasks sum to {report['serial_time']:.1f}s, overlap saved {report['overlap_saved']:.1f}s)")
+        print("Critical path:")
+        for entry in report['critical_path']:
+            share = entry['duration'] / report['wall_time'] * 100 if report['wall_time'] else 0.0
+            print(f"  {entry['task']:<16} {entry['duration']:>8.1f}s  ({share:.0f}%)")
+        on_path = {entry['task'] for entry in report['critical_path']}
+        for name, task in report['tasks'].items():
+            if name not in on_path:
+                print(f"  {name:<16} {task['duration']:>8.1f}s  (overlapped)")
@@ -0,0 +1,203 @@
+"""
+Pipeline Tracing Module
+Lightweight spans exported as Chrome trace JSON with a per-span summary table
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+from pipeline_checkpoint import atomic_write_json, atomic_write_text
+
+
+class Tracer:
+    """
+    Collects timed spans from any thread.
+
+    A span has a name ('asr.decode'), a category (the component) and
+    arguments such as item counts, which can be set while it is open:
+
+        with tracer.span('matching.embed_pages', 'matching', pages = len(images)) as args:
+            ...
+            args['batches'] = num_batches
+
+    The spans can be exported as a Chrome trace (chrome://tracing or
+    https://ui.perfetto.dev) and aggregated per name.
+    """
+
+    def __init__(self, name: str = 'pipeline'):
+        """
+        Initialize tracer.
+
+        Args:
+            name: Process name shown in the trace viewer
+        """
+        self.name = name
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.counters = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = 'pipeline', **args) -> Iterator[Dict[str, any]]:
+        """
+        Time a block of code.
+
+        Args:
+            name: Span name
+            category: Component the span belongs to
+            args: Initial span arguments (item counts etc.)
+
+        Yields:
+            The argument dictionary, which may be updated inside the block
+        """
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            with self._lock:
+                self.spans.append({
+                    "name": name,
+                    "category": category,
+                    "start": start - self.origin,
+                    "end": end - self.origin,
+                    "thread_id": thread.ident,
+                    "thread_name": thread.name,
+                    "args": args
+                })
+
+    def counter(self, name: str, timestamp: float, values: Dict[str, float]):
+        """
+        Record counter values (e.g. memory), drawn as a graph in the trace viewer.
+
+        Args:
+            name: Counter name
+            timestamp: Seconds since the tracer's origin
+            values: Series name -> value
+        """
+        with self._lock:
+            self.counters.append({"name": name, "time": timestamp, "values": values})
+
+    def chrome_trace(self) -> Dict[str, any]:
+        """Spans in the Chrome trace event format (complete events, microseconds)."""
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": self.name}}]
+        threads = {}
+        for span in self.spans:
+            threads.setdefault(span['thread_id'], span['thread_name'])
+            events.append({
+                "name": span['name'],
+                "cat": span['category'],
+                "ph": "X",
+                "ts": round(span['start'] * 1e6, 1),
+                "dur": round((span['end'] - span['start']) * 1e6, 1),
+                "pid": pid,
+                "tid": span['thread_id'],
+                "args": span['args']
+            })
+        for counter in self.counters:
+            events.append({
+                "name": counter['name'],
+                "ph": "C",
+                "ts": round(counter['time'] * 1e6, 1),
+                "pid": pid,
+                "args": counter['values']
+            })
+        for thread_id, thread_name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> List[Dict[str, any]]:
+        """
+        Aggregate spans by name, in order of first start.
+
+        Numeric span arguments are summed into 'items', so e.g. the pages of
+        all 'matching.embed_pages' spans add up.
+        """
+        rows = {}
+        for span in sorted(self.spans, key = lambda span: span['start']):
+            duration = span['end'] - span['start']
+            row = rows.setdefault(span['name'], {
+                "name": span['name'],
+                "category": span['category'],
+                "count": 0,
+                "total_seconds": 0.0,
+                "max_seconds": 0.0,
+                "items": {}
+            })
+            row['count'] += 1
+            row['total_seconds'] += duration
+            row['max_seconds'] = max(row['max_seconds'], duration)
+            for key, value in span['args'].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row['items'][key] = row['items'].get(key, 0) + value
+
+        for row in rows.values():
+            row['mean_seconds'] = round(row['total_seconds'] / row['count'], 6)
+            row['total_seconds'] = round(row['total_seconds'], 6)
+            row['max_seconds'] = round(row['max_seconds'], 6)
+        return list(rows.values())
+
+    def format_summary(self) -> str:
+        """Summary as a fixed-width table."""
+        lines = [f"{'span':<32} {'count':>7} {'total s':>10} {'mean s':>10} {'max s':>10}  items"]
+        for row in self.summary():
+            items = ', '.join(
+                f"{key}={value:.4g}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in row['items'].items()
+            )
+            lines.append(
+                f"{row['name']:<32} {row['count']:>7} {row['total_seconds']:>10.3f} "
+                f"{row['mean_seconds']:>10.4f} {row['max_seconds']:>10.3f}  {items}"
+            )
+        return '\n'.join(lines)
+
+    def save(self, output_dir: str, prefix: str = 'trace') -> Dict[str, str]:
+        """
+        Write <prefix>.json (Chrome trace) and <prefix>_summary.txt.
+
+        Returns:
+            Paths of the written files
+        """
+        paths = {
+            "chrome_trace": os.path.join(output_dir, f"{prefix}.json"),
+            "summary": os.path.join(output_dir, f"{prefix}_summary.txt")
+        }
+        atomic_write_json(paths['chrome_trace'], self.chrome_trace())
+        atomic_write_text(paths['summary'], self.format_summary() + '\n')
+        return paths
+
+
+_active_tracer = None
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """Make a tracer receive the spans of all threads while the block runs."""
+    global _active_tracer
+    previous = _active_tracer
+    _active_tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _active_tracer = previous
+
+
+def active_tracer() -> Optional[Tracer]:
+    """The tracer spans currently go to, if any."""
+    return _active_tracer
+
+
+def span(name: str, category: str = 'pipeline', **args):
+    """
+    Time a block with the active tracer (a no-op context without one).
+
+    Yields the span argument dictionary in either case.
+    """
+    if _active_tracer is None:
+        return nullcontext(args)
+    return _active_tracer.span(name, category, **args)
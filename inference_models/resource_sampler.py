@@ -0,0 +1,233 @@
+"""
+Resource Sampler Module
+Background sampling of memory and CPU use, attributed to pipeline stages and spans
+"""
+
+import glob
+import os
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from model_residency import process_rss
+from lazy_imports import lazy_import
+
+torch = lazy_import('torch')
+
+
+_CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Direct child processes (TTS workers, ffmpeg encoders); empty without /proc."""
+    children = []
+    for path in glob.glob(f'/proc/{pid}/task/*/children'):
+        try:
+            with open(path, 'r') as f:
+                children.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return children
+
+
+def _process_cpu_seconds(pid: int) -> float:
+    """User + system CPU time of a running process; 0 without /proc."""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class ResourceSampler:
+    """
+    Samples resource use in a background thread.
+
+    Each sample holds the RSS of this process and of its child processes,
+    CPU utilization since the previous sample (100% = one core), the peak
+    of Python/numpy allocations since the previous sample (tracemalloc,
+    opt-in because it slows allocation-heavy code) and CUDA memory where
+    available. With a Tracer the samples are added to its Chrome trace as
+    counters, and report() attributes them to the tracer's spans.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        track_allocations: bool = False,
+        tracer = None
+    ):
+        """
+        Initialize resource sampler.
+
+        Args:
+            interval: Seconds between samples
+            track_allocations: Record tracemalloc peaks (Python and numpy memory)
+            tracer: Optional pipeline_tracing.Tracer whose clock and spans are used
+        """
+        self.interval = interval
+        self.track_allocations = track_allocations
+        self.tracer = tracer
+        self.origin = tracer.origin if tracer is not None else time.perf_counter()
+        self.samples = []
+        self.pid = os.getpid()
+        self.cuda = torch.cuda.is_available()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_tracemalloc = False
+        self._last = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """Start sampling."""
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._last = (time.perf_counter(), time.process_time(), {})
+        self._stop.clear()
+        self._thread = threading.Thread(target = self._run, name = 'resource-sampler', daemon = True)
+        self._thread.start()
+
+    def stop(self):
+        """Take a final sample and stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._sample()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        now = time.perf_counter()
+        cpu = time.process_time()
+        children = {child: _process_cpu_seconds(child) for child in _child_pids(self.pid)}
+        last_time, last_cpu, last_children = self._last
+        elapsed = max(now - last_time, 1e-9)
+        # Children that exited since the last sample are not counted
+        children_cpu = sum(
+            max(0.0, seconds - last_children.get(child, 0.0)) for child, seconds in children.items()
+        )
+        self._last = (now, cpu, children)
+
+        sample = {
+            "time": now - self.origin,
+            "rss_mb": process_rss(self.pid) / 1024**2,
+            "children_rss_mb": sum(process_rss(child) for child in children) / 1024**2,
+            "cpu_percent": 100 * (cpu - last_cpu) / elapsed,
+            "children_cpu_percent": 100 * children_cpu / elapsed
+        }
+        if self.track_allocations and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            sample["python_mb"] = current / 1024**2
+            sample["python_peak_mb"] = peak / 1024**2
+        if self.cuda:
+            sample["gpu_allocated_mb"] = torch.cuda.memory_allocated() / 1024**2
+            sample["gpu_reserved_mb"] = torch.cuda.memory_reserved() / 1024**2
+
+        self.samples.append(sample)
+        if self.tracer is not None:
+            self.tracer.counter('memory_mb', sample['time'], {
+                key: round(value, 1) for key, value in sample.items()
+                if key.endswith('_mb') and not key.endswith('peak_mb')
+            })
+            self.tracer.counter('cpu_percent', sample['time'], {
+                "process": round(sample['cpu_percent'], 1),
+                "children": round(sample['children_cpu_percent'], 1)
+            })
+
+    @staticmethod
+    def _aggregate(samples: List[Dict[str, float]]) -> Dict[str, float]:
+        """Peaks of memory values and mean CPU utilization over samples."""
+        if not samples:
+            return {}
+        stats = {
+            "rss_peak_mb": max(s['rss_mb'] for s in samples),
+            "children_rss_peak_mb": max(s['children_rss_mb'] for s in samples),
+            "cpu_percent": sum(s['cpu_percent'] for s in samples) / len(samples),
+            "children_cpu_percent": sum(s['children_cpu_percent'] for s in samples) / len(samples)
+        }
+        if 'python_peak_mb' in samples[0]:
+            stats["python_peak_mb"] = max(s['python_peak_mb'] for s in samples)
+        if 'gpu_allocated_mb' in samples[0]:
+            stats["gpu_allocated_peak_mb"] = max(s['gpu_allocated_mb'] for s in samples)
+            stats["gpu_reserved_peak_mb"] = max(s['gpu_reserved_mb'] for s in samples)
+        return {key: round(value, 1) for key, value in stats.items()}
+
+    def _covering(self, start: float, end: float) -> List[Dict[str, float]]:
+        """Samples whose interval (previous sample, sample] overlaps [start, end]."""
+        covering = []
+        previous = float('-inf')
+        for sample in self.samples:
+            if sample['time'] >= start and previous <= end:
+                covering.append(sample)
+            previous = sample['time']
+            if previous > end:
+                break
+        return covering
+
+    def report(self, spans: Optional[List[Dict[str, any]]] = None) -> Dict[str, any]:
+        """
+        Resource statistics overall and per span name.
+
+        Args:
+            spans: Spans to attribute samples to (defaults to the tracer's)
+
+        Returns:
+            Dictionary with 'overall' and 'spans' (name -> peaks and mean
+            CPU utilization over all spans with that name)
+        """
+        if spans is None and self.tracer is not None:
+            spans = self.tracer.spans
+
+        per_name = {}
+        for span in spans or []:
+            per_name.setdefault(span['name'], []).extend(self._covering(span['start'], span['end']))
+
+        return {
+            "interval": self.interval,
+            "samples": len(self.samples),
+            "overall": self._aggregate(self.samples),
+            "spans": {name: self._aggregate(samples) for name, samples in per_name.items()}
+        }
+
+    def format_report(self, report: Optional[Dict[str, any]] = None, prefix: str = '') -> str:
+        """
+        Per-span table of peak memory and CPU utilization.
+
+        Args:
+            report: Output of report() (computed if omitted)
+            prefix: Only include spans whose name starts with this
+        """
+        report = report or self.report()
+        lines = [f"{'span':<32} {'rss MB':>9} {'child MB':>9} {'py MB':>8} {'gpu MB':>8} {'cpu %':>7} {'child %':>8}"]
+        rows = [('overall', report['overall'])] + [
+            (name, stats) for name, stats in report['spans'].items() if name.startswith(prefix)
+        ]
+        for name, stats in rows:
+            if not stats:
+                continue
+            optional = [
+                f"{stats[key]:.0f}" if key in stats else '-'
+                for key in ('python_peak_mb', 'gpu_allocated_peak_mb')
+            ]
+            lines.append(
+                f"{name:<32} {stats['rss_peak_mb']:>9.0f} {stats['children_rss_peak_mb']:>9.0f} "
+                f"{optional[0]:>8} {optional[1]:>8} "
+                f"{stats['cpu_percent']:>7.0f} {stats['children_cpu_percent']:>8.0f}"
+            )
+        return '\n'.join(lines)
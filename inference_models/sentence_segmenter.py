@@ -0,0 +1,389 @@
+"""
+Sentence Segmenter Module
+Abbreviation-aware sentence splitting of ASR transcripts with length normalization
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+import statistics
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Never end a sentence ("Dr. Smith", "e.g. a matrix")
+ABBREVIATIONS = {
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'st', 'sr', 'jr', 'vs', 'cf', 'approx', 'resp',
+    'incl', 'dept', 'univ', 'e.g', 'i.e', 'a.k.a', 'w.r.t', 'viz'
+}
+# Abbreviations only when a number follows ("Fig. 3", "Eq. 2", "No. 5")
+NUMBERED_ABBREVIATIONS = {
+    'no', 'nos', 'fig', 'figs', 'eq', 'eqs', 'sec', 'ch', 'vol', 'p', 'pp', 'ref', 'thm', 'def', 'ex'
+}
+# May end a sentence; only a boundary when a capitalized word follows
+TERMINAL_ABBREVIATIONS = {'etc', 'al', 'inc', 'ltd', 'co', 'corp'}
+
+CONJUNCTIONS = {'and', 'but', 'so', 'or', 'because', 'which', 'where', 'while', 'then', 'although', 'whereas'}
+
+# Terminal punctuation, closing quotes/brackets, then whitespace (or the end of the text)
+_CANDIDATE = re.compile(r'([.!?…]+)(["\'”’)\]]*)(\s+|$)')
+_LAST_TOKEN = re.compile(r'(\S+)$')
+_INITIAL = re.compile(r'^(?:[A-Z]|(?:[A-Za-z]\.)+[A-Za-z])$')
+# Leading characters skipped when looking at the word after a boundary
+_OPENERS = '"\'“‘(['
+_SPACE = re.compile(r'\s')
+# Casing is detected on this many leading characters
+_CASE_SAMPLE = 1000
+
+
+class SentenceSegmenter:
+    """
+    Splits transcripts into sentences of a bounded number of words.
+
+    Boundaries are terminal punctuation followed by whitespace, except after
+    abbreviations, initials ("J. Smith", "U.S.") and hesitation ellipses
+    ("so... we"); decimals never contain whitespace and are kept whole.
+    For transcripts with casing, a period followed by a lowercase word is
+    not a boundary either; all-lowercase ASR output is detected and split
+    on punctuation alone.
+
+    Sentences longer than max_words are split at the best clause boundary
+    (semicolon, colon, comma, conjunction) into pieces of similar length;
+    fragments shorter than min_words are merged with a neighbour. Text is
+    processed in one pass, so stream() handles arbitrarily long transcripts
+    in linear time and bounded memory.
+
+    Instances are callable and can be passed as a pipeline sentence_splitter.
+    """
+
+    def __init__(
+        self,
+        min_words: int = 5,
+        max_words: int = 40,
+        abbreviations: Optional[Iterable[str]] = None
+    ):
+        """
+        Initialize sentence segmenter.
+
+        Args:
+            min_words: Sentences shorter than this are merged with a neighbour
+            max_words: Sentences longer than this are split
+            abbreviations: Additional abbreviations (without the final period)
+        """
+        if min_words < 1 or max_words < 2 * min_words:
+            raise ValueError(f"Need 1 <= min_words and 2 * min_words <= max_words, got {min_words}, {max_words}")
+        self.min_words = min_words
+        self.max_words = max_words
+        self.extra_abbreviations = sorted({a.lower().rstrip('.') for a in abbreviations or []})
+        self.abbreviations = ABBREVIATIONS | set(self.extra_abbreviations)
+
+    def __repr__(self) -> str:
+        # Used as the matching stage's splitter key: equal repr, equal output
+        extra = f", abbreviations={self.extra_abbreviations}" if self.extra_abbreviations else ''
+        return f"SentenceSegmenter(min_words={self.min_words}, max_words={self.max_words}{extra})"
+
+    def __call__(self, text: str) -> List[str]:
+        return self.segment(text)
+
+    def segment(self, text: str) -> List[str]:
+        """
+        Split a transcript into sentences.
+
+        Args:
+            text: Transcript text
+
+        Returns:
+            List of sentences
+        """
+        return list(self.stream([text]))
+
+    def stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Split text arriving in chunks, yielding sentences as they are complete.
+
+        Args:
+            chunks: Consecutive pieces of the transcript (split anywhere)
+
+        Yields:
+            Sentences
+        """
+        return self._normalize(self._raw_sentences(chunks))
+
+    def _raw_sentences(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Sentences at punctuation boundaries, before length normalization.
+
+        Every decision depends on the text alone, never on where the chunks
+        were split, so stream() and segment() return the same sentences.
+        """
+        buffer = ''
+        start = 0       # Start of the current sentence in buffer
+        scan_from = 0   # Candidates before this were already decided
+        cased = None
+
+        # None marks the end of the text
+        for chunk in itertools.chain(chunks, [None]):
+            final = chunk is None
+            if not final:
+                if not chunk:
+                    continue
+                buffer += chunk
+            if cased is None:
+                # Decided on the opening text (the buffer is not trimmed before this)
+                if len(buffer) < _CASE_SAMPLE and not final:
+                    continue
+                cased = any(c.isupper() for c in buffer[:_CASE_SAMPLE])
+
+            decided = len(buffer) if final else max(scan_from, len(buffer) - 8)
+            for match in _CANDIDATE.finditer(buffer, scan_from):
+                after = match.end()
+                while after < len(buffer) and buffer[after] in _OPENERS:
+                    after += 1
+                if after == len(buffer) and not final:
+                    # The next word decides; wait for more text
+                    decided = match.start()
+                    break
+                scan_from = match.end()
+                if self._is_boundary(buffer, match, cased):
+                    end = match.start(2) + len(match.group(2))
+                    pieces, start = self._run_on_pieces(buffer, start, end)
+                    yield from pieces
+                    sentence = buffer[start:end].strip()
+                    if sentence:
+                        yield sentence
+                    start = match.end()
+
+            pieces, start = self._run_on_pieces(buffer, start, max(start, decided))
+            yield from pieces
+            if final:
+                tail = buffer[start:].strip()
+                if tail:
+                    yield tail
+            elif start > 0:
+                buffer, scan_from, start = buffer[start:], max(0, scan_from - start), 0
+
+    def _run_on_pieces(self, text: str, start: int, end: int) -> Tuple[List[str], int]:
+        """
+        Cut unterminated text into run-on pieces of about 16 * max_words characters.
+
+        Cuts are made at the last whitespace within the limit (or the first
+        one after it, for a longer token), so memory stays bounded when a
+        transcript has no punctuation. text[start:end] must contain no
+        sentence boundary.
+
+        Returns:
+            The pieces and the new start
+        """
+        max_chars = 16 * self.max_words
+        pieces = []
+        while end - start > max_chars:
+            cut = next((i for i in range(start + max_chars, start, -1) if text[i].isspace()), None)
+            if cut is None:
+                space = _SPACE.search(text, start + max_chars, end)
+                if space is None:
+                    break
+                cut = space.start()
+            piece = text[start:cut].strip()
+            if piece:
+                pieces.append(piece)
+            start = cut
+        return pieces, start
+
+    def _is_boundary(self, text: str, match: re.Match, cased: Optional[bool]) -> bool:
+        """Whether a punctuation candidate ends a sentence."""
+        punctuation = match.group(1)
+        if '?' in punctuation or '!' in punctuation:
+            return True
+
+        after = match.end()
+        while after < len(text) and text[after] in _OPENERS:
+            after += 1
+        next_char = text[after] if after < len(text) else ''
+        if not next_char:
+            return True
+        next_upper = next_char.isupper()
+
+        if punctuation in ('...', '…') or len(punctuation) > 1:
+            # Ellipsis: a pause unless a new (capitalized) sentence follows
+            return next_upper or not cased
+
+        token_match = _LAST_TOKEN.search(text, max(0, match.start() - 32), match.start())
+        if token_match is None:
+            return True
+        token = token_match.group(1).lstrip(_OPENERS)
+        word = token.lower()
+
+        if word in self.abbreviations:
+            return False
+        if word in NUMBERED_ABBREVIATIONS and next_char.isdigit():
+            return False
+        if word in TERMINAL_ABBREVIATIONS:
+            return next_upper
+        if _INITIAL.match(token):
+            return False
+        if cased and next_char.isalpha() and not next_upper:
+            # "approx. ten" in a cased transcript: an unknown abbreviation
+            return False
+        return True
+
+    def _normalize(self, sentences: Iterable[str]) -> Iterator[str]:
+        """Split long sentences and merge short ones with a neighbour."""
+        held, held_words = None, 0
+        for sentence in sentences:
+            for piece in self._split_long(sentence.split()):
+                words = piece.count(' ') + 1
+                if held is None:
+                    held, held_words = piece, words
+                elif (held_words < self.min_words or words < self.min_words) \
+                        and held_words + words <= self.max_words:
+                    held, held_words = f"{held} {piece}", held_words + words
+                else:
+                    yield held
+                    held, held_words = piece, words
+        if held is not None:
+            yield held
+
+    def _split_long(self, words: List[str]) -> List[str]:
+        """
+        Split a word sequence into pieces of at most max_words words.
+
+        Each cut is placed at the best clause boundary near the length that
+        divides the remaining words evenly; only a bounded window is
+        examined per cut, so this is linear in the number of words.
+        """
+        pieces = []
+        start = 0
+        while len(words) - start > self.max_words:
+            remaining = len(words) - start
+            target = start + math.ceil(remaining / math.ceil(remaining / self.max_words))
+            # A clause boundary may move the cut by up to a quarter of max_words
+            slack = self.max_words // 4
+            lowest = max(start + self.min_words, target - slack)
+            highest = min(start + self.max_words, len(words) - self.min_words, target + slack)
+            if lowest > highest:
+                lowest = start + self.min_words
+                highest = min(start + self.max_words, len(words) - self.min_words)
+
+            best, best_score = target, None
+            for end in range(lowest, highest + 1):
+                score = (self._break_priority(words, end), -abs(end - target))
+                if best_score is None or score > best_score:
+                    best, best_score = end, score
+            pieces.append(' '.join(words[start:best]))
+            start = best
+
+        if start < len(words):
+            pieces.append(' '.join(words[start:]))
+        return pieces
+
+    @staticmethod
+    def _break_priority(words: List[str], end: int) -> int:
+        """How natural a cut before words[end] is."""
+        last = words[end - 1]
+        if last.endswith((';', ':')):
+            return 3
+        if last.endswith(','):
+            return 2
+        if end < len(words) and words[end].lower() in CONJUNCTIONS:
+            return 1
+        return 0
+
+
+def length_stats(sentences: Sequence[str]) -> Dict[str, float]:
+    """Distribution of sentence lengths in words."""
+    lengths = sorted(len(s.split()) for s in sentences)
+    if not lengths:
+        return {"count": 0}
+
+    def percentile(q):
+        return lengths[min(len(lengths) - 1, int(q * len(lengths)))]
+
+    return {
+        "count": len(lengths),
+        "min": lengths[0],
+        "p10": percentile(0.1),
+        "median": statistics.median(lengths),
+        "p90": percentile(0.9),
+        "max": lengths[-1]
+    }
+
+
+def read_transcript(path: str) -> Dict[str, any]:
+    """
+    Read a transcript for benchmarking.
+
+    Args:
+        path: transcript.txt, a timestamps JSON (pipeline timestamps.json or
+            a frontend transcript.json) or a lecture output directory
+
+    Returns:
+        Dictionary with the text and, for timestamps JSON, the sentences it lists
+    """
+    if os.path.isdir(path):
+        for name in ('transcript.txt', 'timestamps.json', 'transcript.json'):
+            if os.path.exists(os.path.join(path, name)):
+                path = os.path.join(path, name)
+                break
+    with open(path, 'r', encoding = 'utf-8') as f:
+        if not path.endswith('.json'):
+            return {"text": f.read(), "sentences": None}
+        sentences = [entry['text'].strip() for entry in json.load(f)['timestamps']]
+    return {"text": ' '.join(sentences), "sentences": sentences}
+
+
+def main():
+    """Benchmark segmenters on transcripts (text files, timestamps JSON or lecture directories)."""
+    from lecture_pipeline import simple_sentence_splitter
+
+    parser = argparse.ArgumentParser(description = "Benchmark sentence segmentation of transcripts")
+    parser.add_argument('paths', nargs = '+',
+                        help = "transcript.txt, timestamps JSON (e.g. frontend/assets/lectures/*/transcript.json) "
+                               "or lecture output directories")
+    parser.add_argument('--min-words', type = int, default = 5)
+    parser.add_argument('--max-words', type = int, default = 40)
+    parser.add_argument('--repeat', type = int, default = 5, help = "Timing repetitions (best is reported)")
+    parser.add_argument('--show', type = int, default = 0, help = "Print the first N sentences of each splitter")
+    args = parser.parse_args()
+
+    transcripts = [read_transcript(path) for path in args.paths]
+    texts = [t['text'] for t in transcripts]
+    text = '\n'.join(texts)
+    megabytes = len(text.encode('utf-8')) / 1024**2
+
+    splitters = {
+        'simple_sentence_splitter': simple_sentence_splitter,
+        'SentenceSegmenter': SentenceSegmenter(args.min_words, args.max_words)
+    }
+    print(f"{len(texts)} transcripts, {len(text.split())} words, {megabytes:.2f} MB")
+    print(f"{'splitter':<26} {'MB/s':>8} {'count':>7} {'min':>5} {'p10':>5} {'median':>7} {'p90':>5} {'max':>5} "
+          f"{'<min':>6} {'>max':>6}")
+
+    def report(name, sentences, seconds = None):
+        stats = length_stats(sentences)
+        lengths = [len(s.split()) for s in sentences]
+        short = sum(1 for n in lengths if n < args.min_words)
+        long = sum(1 for n in lengths if n > args.max_words)
+        speed = f"{megabytes / seconds:>8.1f}" if seconds else f"{'-':>8}"
+        if stats['count']:
+            print(f"{name:<26} {speed} {stats['count']:>7} {stats['min']:>5} {stats['p10']:>5} "
+                  f"{stats['median']:>7} {stats['p90']:>5} {stats['max']:>5} {short:>6} {long:>6}")
+        for sentence in sentences[:args.show]:
+            print(f"    {sentence}")
+
+    if all(t['sentences'] is not None for t in transcripts):
+        # The sentences the timestamps were generated from
+        report('timestamps JSON', [s for t in transcripts for s in t['sentences']])
+    for name, splitter in splitters.items():
+        best = float('inf')
+        for _ in range(max(1, args.repeat)):
+            start = time.perf_counter()
+            sentences = [s for t in texts for s in splitter(t)]
+            best = min(best, time.perf_counter() - start)
+        report(name, sentences, best)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,21 @@ Slide Matching Processor Module
 Matches lecture transcripts to PDF slide pages using multimodal embeddings
 """
 
-import torch
 import numpy as np
-from PIL import Image
-import fitz  # PyMuPDF
 import io
 from tqdm import tqdm
 from typing import List, Dict, Optional
 from pathlib import Path
 import gc
 
-from transformers import AutoModel
+from lazy_imports import lazy_import
+from execution_profile import is_cpu, quantize_linear_layers, resolve_device
+from model_residency import module_footprint
+from pipeline_tracing import span
+
+torch = lazy_import('torch')
+transformers = lazy_import('transformers')
+fitz = lazy_import('fitz')  # PyMuPDF
 
 
 class SlideMatchingProcessor:
@@ -24,7 +28,7 @@ class SlideMatchingProcessor:
     def __init__(
         self,
         model_name: str = 'nvidia/llama-nemoretriever-colembed-3b-v1',
-        device: str = 'cuda',
+        device: str = 'auto',
         batch_size: int = 4,
         jump_penalty: float = 0.1,
         backward_weight: float = 2.0,
@@ -32,14 +36,17 @@ class SlideMatchingProcessor:
         exponential_scale: float = 3.0,
         use_confidence_boost: bool = False,
         confidence_threshold: float = 0.95,
-        confidence_weight: float = 1.5
+        confidence_weight: float = 1.5,
+        torch_dtype: Optional[str] = None,
+        attn_implementation: Optional[str] = None,
+        quantize: bool = False
     ):
         """
         Initialize slide matching processor.
 
         Args:
             model_name: Pretrained multimodal model name
-            device: Device to run on (cuda/cpu)
+            device: Device to run on (cuda/cpu, auto = cuda if available)
             batch_size: Batch size for embedding computation
             jump_penalty: Penalty for slide jumps
             backward_weight: Multiplier for backward jump penalty
@@ -48,6 +55,10 @@ class SlideMatchingProcessor:
             use_confidence_boost: Boost scores when top2 is low
             confidence_threshold: Threshold for confidence boosting
             confidence_weight: Weight multiplier for confidence boost
+            torch_dtype: Model dtype (None = bfloat16 on GPU, float32 on CPU)
+            attn_implementation: Attention kernel (None = flash_attention_2 on
+                GPU; sdpa on CPU, falling back to eager)
+            quantize: On CPU, quantize the model's linear layers to int8
         """
         self.model_name = model_name
         self.device = device
@@ -59,6 +70,9 @@ class SlideMatchingProcessor:
         self.use_confidence_boost = use_confidence_boost
         self.confidence_threshold = confidence_threshold
         self.confidence_weight = confidence_weight
+        self.torch_dtype = torch_dtype
+        self.attn_implementation = attn_implementation
+        self.quantize = quantize
         self.model = None
 
         print(f"Initializing Slide Matching Processor")
@@ -77,16 +91,38 @@ class SlideMatchingProcessor:
         if torch.cuda.is_available():
             torch.cuda.reset_peak_memory_stats()
 
-        self.model = AutoModel.from_pretrained(
+        device = resolve_device(self.device)
+        cpu = is_cpu(device)
+        # bfloat16 matmuls are emulated on most CPUs; flash attention is CUDA-only
+        dtype = self.torch_dtype or ('float32' if cpu else 'bfloat16')
+        attention = self.attn_implementation or ('sdpa' if cpu else 'flash_attention_2')
+        print(f"Device: {device}, dtype: {dtype}, attention: {attention}")
+
+        with span('matching.load_model', 'matching', model = self.model_name):
+            try:
+                self.model = self._from_pretrained(device, dtype, attention)
+            except ValueError as e:
+                if self.attn_implementation is not None or attention != 'sdpa':
+                    raise
+                print(f"sdpa attention not supported ({e}), using eager attention")
+                self.model = self._from_pretrained(device, dtype, 'eager')
+
+            if self.quantize and cpu:
+                print("Quantizing linear layers to int8")
+                quantize_linear_layers(self.model)
+
+        print("Model loaded successfully!")
+
+    def _from_pretrained(self, device: str, dtype: str, attention: str):
+        """Load the model with the given device, dtype and attention implementation."""
+        return transformers.AutoModel.from_pretrained(
             self.model_name,
-            device_map = self.device,
-            torch_dtype = torch.bfloat16,
+            device_map = device,
+            torch_dtype = getattr(torch, dtype),
             trust_remote_code = True,
-            attn_implementation = "flash_attention_2",
+            attn_implementation = attention,
         ).eval()
 
-        print("Model loaded successfully!")
-
     def unload_model(self):
         """Unload model to free memory."""
         if self.model is not None:
@@ -98,11 +134,19 @@ class SlideMatchingProcessor:
             gc.collect()
             print("Slide matching model unloaded")
 
+    def is_loaded(self) -> bool:
+        """Whether the model is in memory."""
+        return self.model is not None
+
+    def memory_footprint(self) -> Dict[str, int]:
+        """Bytes held by the loaded model, split into 'ram_bytes' and 'vram_bytes'."""
+        return module_footprint(self.model)
+
     def extract_pdf_pages(
         self,
         pdf_path: str,
         target_dpi: int = 150
-    ) -> List[Image.Image]:
+    ) -> List['Image.Image']:
         """
         Extract all pages from PDF as images.
 
@@ -113,30 +157,34 @@ class SlideMatchingProcessor:
         Returns:
             List of PIL Images
         """
+        from PIL import Image
+
         print(f'Extracting pages from PDF: {pdf_path}')
 
-        doc = fitz.open(pdf_path)
-        page_images = []
+        with span('matching.render_pages', 'matching') as args:
+            doc = fitz.open(pdf_path)
+            page_images = []
 
-        for page_num in tqdm(range(doc.page_count), desc = 'Extracting PDF pages'):
-            page = doc[page_num]
+            for page_num in tqdm(range(doc.page_count), desc = 'Extracting PDF pages'):
+                page = doc[page_num]
 
-            scale = target_dpi / 72
-            mat = fitz.Matrix(scale, scale)
-            pix = page.get_pixmap(matrix = mat)
-            img_data = pix.tobytes("png")
+                scale = target_dpi / 72
+                mat = fitz.Matrix(scale, scale)
+                pix = page.get_pixmap(matrix = mat)
+                img_data = pix.tobytes("png")
 
-            image = Image.open(io.BytesIO(img_data)).convert('RGB')
-            page_images.append(image)
+                image = Image.open(io.BytesIO(img_data)).convert('RGB')
+                page_images.append(image)
 
-        doc.close()
+            doc.close()
+            args['pages'] = len(page_images)
         print(f'Extracted {len(page_images)} pages')
         return page_images
 
     def compute_embeddings(
         self,
         queries: List[str],
-        images: List[Image.Image]
+        images: List['Image.Image']
     ) -> tuple:
         """
         Compute embeddings for queries and images.
@@ -148,36 +196,67 @@ class SlideMatchingProcessor:
         Returns:
             Tuple of (query_embeddings, image_embeddings)
         """
+        print('Computing embeddings...')
+        query_embeddings = self.embed_queries(queries)
+        image_embeddings = self.embed_pages(images)
+        return query_embeddings, image_embeddings
+
+    def embed_queries(self, queries: List[str]) -> 'torch.Tensor':
+        """
+        Compute embeddings for text queries.
+
+        Args:
+            queries: List of text queries
+
+        Returns:
+            Query embeddings tensor
+        """
         if self.model is None:
             self.load_model()
 
-        print('Computing embeddings...')
-
         print('Processing text queries...')
-        with torch.no_grad():
+        with span('matching.embed_queries', 'matching', queries = len(queries)), torch.no_grad():
             query_embeddings = self.model.forward_queries(
                 queries,
                 batch_size = self.batch_size
             )
 
+        print(f'Query embeddings shape: {query_embeddings.shape}')
+        return query_embeddings
+
+    def embed_pages(self, images: List['Image.Image']) -> 'torch.Tensor':
+        """
+        Compute embeddings for page images.
+
+        Pages do not depend on the transcript, so this can run before (or
+        while) the audio is transcribed.
+
+        Args:
+            images: List of page images
+
+        Returns:
+            Image embeddings tensor
+        """
+        if self.model is None:
+            self.load_model()
+
         print('Processing page images...')
         # Process images one by one to avoid shared memory errors
         image_embeddings = []
-        for image in tqdm(images, desc = 'Processing images'):
-            with torch.no_grad():
-                emb = self.model.forward_passages([image], batch_size = 1)
-                image_embeddings.append(emb)
-        image_embeddings = torch.cat(image_embeddings, dim = 0)
+        with span('matching.embed_pages', 'matching', pages = len(images)):
+            for image in tqdm(images, desc = 'Processing images'):
+                with torch.no_grad():
+                    emb = self.model.forward_passages([image], batch_size = 1)
+                    image_embeddings.append(emb)
+            image_embeddings = torch.cat(image_embeddings, dim = 0)
 
-        print(f'Query embeddings shape: {query_embeddings.shape}')
         print(f'Image embeddings shape: {image_embeddings.shape}')
-
-        return query_embeddings, image_embeddings
+        return image_embeddings
 
     def match_with_dp(
         self,
-        query_embeddings: torch.Tensor,
-        image_embeddings: torch.Tensor,
+        query_embeddings: 'torch.Tensor',
+        image_embeddings: 'torch.Tensor',
         queries: List[str]
     ) -> List[Dict]:
         """
@@ -193,7 +272,7 @@ class SlideMatchingProcessor:
         """
         print('Finding best matches with DP and jump penalty')
 
-        with torch.no_grad():
+        with span('matching.score', 'matching', queries = len(queries)), torch.no_grad():
             scores = self.model.get_scores(query_embeddings, image_embeddings)
 
         # Normalize scores
@@ -224,39 +303,40 @@ class SlideMatchingProcessor:
         scores_np = normalized_scores.cpu().numpy()
         num_queries, num_pages = scores_np.shape
 
-        # Dynamic Programming with jump penalty
-        dp = np.full((num_queries, num_pages), -np.inf)
-        backtrack = np.zeros((num_queries, num_pages), dtype = int)
+        with span('matching.dp', 'matching', sentences = num_queries, pages = num_pages):
+            # Dynamic Programming with jump penalty
+            dp = np.full((num_queries, num_pages), -np.inf)
+            backtrack = np.zeros((num_queries, num_pages), dtype = int)
 
-        # Initialize first query
-        dp[0, :] = scores_np[0, :]
+            # Initialize first query
+            dp[0, :] = scores_np[0, :]
 
-        # Fill DP table
-        for i in range(1, num_queries):
-            for j in range(num_pages):
-                current_score = scores_np[i, j]
+            # Fill DP table
+            for i in range(1, num_queries):
+                for j in range(num_pages):
+                    current_score = scores_np[i, j]
 
-                # Try all possible previous page assignments
-                for k in range(num_pages):
-                    # Jump penalty
-                    penalty = 0
-                    if k < j:  # forward jump
-                        penalty = (j - k - 1) * self.jump_penalty
-                    elif j < k:  # backward jump
-                        penalty = (k - j) * self.jump_penalty * self.backward_weight
+                    # Try all possible previous page assignments
+                    for k in range(num_pages):
+                        # Jump penalty
+                        penalty = 0
+                        if k < j:  # forward jump
+                            penalty = (j - k - 1) * self.jump_penalty
+                        elif j < k:  # backward jump
+                            penalty = (k - j) * self.jump_penalty * self.backward_weight
 
-                    score_with_penalty = dp[i - 1, k] + current_score - penalty
+                        score_with_penalty = dp[i - 1, k] + current_score - penalty
 
-                    if score_with_penalty > dp[i, j]:
-                        dp[i, j] = score_with_penalty
-                        backtrack[i, j] = k
+                        if score_with_penalty > dp[i, j]:
+                            dp[i, j] = score_with_penalty
+                            backtrack[i, j] = k
 
-        # Backtrack to find optimal path
-        best_matches = np.zeros(num_queries, dtype = int)
-        best_matches[-1] = np.argmax(dp[-1, :])
+            # Backtrack to find optimal path
+            best_matches = np.zeros(num_queries, dtype = int)
+            best_matches[-1] = np.argmax(dp[-1, :])
 
-        for i in range(num_queries - 2, -1, -1):
-            best_matches[i] = backtrack[i + 1, best_matches[i + 1]]
+            for i in range(num_queries - 2, -1, -1):
+                best_matches[i] = backtrack[i + 1, best_matches[i + 1]]
 
         # Get confidence scores
         confidence_scores = np.array([
@@ -279,7 +359,9 @@ class SlideMatchingProcessor:
         self,
         transcript: str,
         pdf_path: str,
-        sentences: Optional[List[str]] = None
+        sentences: Optional[List[str]] = None,
+        page_images: Optional[List['Image.Image']] = None,
+        image_embeddings: Optional['torch.Tensor'] = None
     ) -> List[Dict]:
         """
         Match transcript to PDF slides.
@@ -288,6 +370,8 @@ class SlideMatchingProcessor:
             transcript: Full transcript text (used if sentences not provided)
             pdf_path: Path to PDF file
             sentences: Optional pre-split sentences (if None, uses full transcript as one query)
+            page_images: Optional pages already extracted from pdf_path
+            image_embeddings: Optional page embeddings already computed for these pages
 
         Returns:
             List of matching results with page numbers
@@ -300,7 +384,9 @@ class SlideMatchingProcessor:
         print("="*60)
 
         # Extract PDF pages
-        page_images = self.extract_pdf_pages(pdf_path)
+        if page_images is None and image_embeddings is None:
+            page_images = self.extract_pdf_pages(pdf_path)
+        num_pages = len(image_embeddings) if image_embeddings is not None else len(page_images)
 
         # Prepare queries
         if sentences is None:
@@ -309,10 +395,13 @@ class SlideMatchingProcessor:
         else:
             queries = sentences
 
-        print(f"Matching {len(queries)} queries to {len(page_images)} slides")
+        print(f"Matching {len(queries)} queries to {num_pages} slides")
 
         # Compute embeddings
-        query_embeddings, image_embeddings = self.compute_embeddings(queries, page_images)
+        if image_embeddings is None:
+            query_embeddings, image_embeddings = self.compute_embeddings(queries, page_images)
+        else:
+            query_embeddings = self.embed_queries(queries)
 
         # Match with DP
         results = self.match_with_dp(query_embeddings, image_embeddings, queries)
@@ -0,0 +1,9 @@
+"""
+Test configuration: the inference modules import each other as top-level
+modules, so the package directory is put on the import path.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,90 @@
+"""Tests for incremental ASR sessions with overlapping chunks (stub model)."""
+
+import random
+import types
+from contextlib import nullcontext
+
+import numpy as np
+import pytest
+
+import asr_processor
+from asr_processor import ASRProcessor
+
+SAMPLE_RATE = 16000
+WORD_SECONDS = 0.25
+
+
+def timeline_words(duration):
+    """A word every 0.37s, each 0.25s long."""
+    words, start, index = [], 0.05, 0
+    while start + WORD_SECONDS <= duration:
+        words.append({"word": f"w{index}", "start": start, "end": start + WORD_SECONDS})
+        start += 0.37
+        index += 1
+    return words
+
+
+class TimelineModel:
+    """
+    Stub ASR model. Sample n of the session audio holds the value n, so a
+    chunk reveals where it lies; only words entirely inside it are heard.
+    """
+
+    def __init__(self, words):
+        self.words = words
+
+    def transcribe(self, audios, timestamps = False):
+        outputs = []
+        for audio in audios:
+            offset = audio[0] / SAMPLE_RATE
+            # Trailing zeros are padding
+            length = int(np.max(np.nonzero(audio)[0], initial = 0)) + 1 if offset else len(audio)
+            end = offset + length / SAMPLE_RATE
+            heard = [
+                {"word": word["word"], "start": word["start"] - offset, "end": word["end"] - offset}
+                for word in self.words
+                if word["start"] >= offset and word["end"] <= end
+            ]
+            outputs.append(types.SimpleNamespace(
+                text = ' '.join(word["word"] for word in heard),
+                timestamp = {"word": heard}
+            ))
+        return outputs
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    # The stub model needs no autograd context
+    monkeypatch.setattr(asr_processor, 'torch', types.SimpleNamespace(no_grad = nullcontext))
+    return ASRProcessor(device = 'cpu')
+
+
+@pytest.mark.parametrize('duration, chunk_seconds, overlap_seconds', [
+    (8.5, 3.0, 0.3),    # Remainder after the last full chunk is shorter than 0.5s
+    (10.0, 3.0, 1.0),
+    (20.3, 7.3, 2.0),
+    (5.0, 10.0, 2.0)    # Shorter than one chunk
+])
+def test_every_word_is_emitted_once(processor, duration, chunk_seconds, overlap_seconds):
+    words = timeline_words(duration)
+    processor.model = TimelineModel(words)
+    audio = np.arange(int(duration * SAMPLE_RATE), dtype = np.float32)
+
+    session = processor.create_session(chunk_seconds = chunk_seconds, overlap_seconds = overlap_seconds)
+    rng = random.Random(0)
+    position = 0
+    while position < len(audio):
+        size = rng.randint(1, SAMPLE_RATE)
+        session.feed(audio[position:position + size])
+        position += size
+    session.finish()
+
+    assert session.transcript.split() == [word["word"] for word in words]
+    starts = [segment["start"] for segment in session.segments]
+    assert starts == sorted(starts)
+
+
+def test_finish_without_new_audio_emits_nothing(processor):
+    processor.model = TimelineModel([])
+    session = processor.create_session(chunk_seconds = 3.0)
+    assert session.finish() == []
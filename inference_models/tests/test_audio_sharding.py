@@ -0,0 +1,91 @@
+"""Tests for planning shards at pauses and stitching per-shard ASR results."""
+
+import numpy as np
+import pytest
+
+from audio_sharding import find_quiet_point, plan_shards, stitch_asr_results
+
+SAMPLE_RATE = 16000
+
+
+def noise_with_pause(duration, pause_start, pause_seconds = 1.0, seed = 0):
+    """Loud noise with one silent stretch."""
+    audio = np.random.default_rng(seed).normal(0, 0.3, int(duration * SAMPLE_RATE)).astype(np.float32)
+    audio[int(pause_start * SAMPLE_RATE):int((pause_start + pause_seconds) * SAMPLE_RATE)] = 0
+    return audio
+
+
+def test_find_quiet_point_lands_in_the_pause():
+    audio = noise_with_pause(10.0, 6.0)
+    assert 6.0 <= find_quiet_point(audio, SAMPLE_RATE) <= 7.0
+
+
+def test_plan_shards_without_audio_cuts_evenly():
+    shards = plan_shards(3600.0, 1000.0)
+    assert [shard['index'] for shard in shards] == [0, 1, 2, 3]
+    assert [shard['start'] for shard in shards] == [0.0, 900.0, 1800.0, 2700.0]
+    assert shards[-1]['end'] == 3600.0
+
+
+def test_plan_shards_covers_the_recording_without_gaps():
+    shards = plan_shards(1234.5, 300.0)
+    assert shards[0]['start'] == 0.0
+    assert shards[-1]['end'] == 1234.5
+    for previous, shard in zip(shards, shards[1:]):
+        assert shard['start'] == previous['end']
+
+
+def test_plan_shards_moves_cuts_to_pauses_within_the_search_window():
+    # Target cut at 300s, pause at 310-311s
+    reads = []
+
+    def read_window(start, seconds):
+        reads.append((start, seconds))
+        return noise_with_pause(seconds, 310.0 - start)
+
+    shards = plan_shards(600.0, 300.0, read_window, SAMPLE_RATE, search_seconds = 30.0)
+    assert reads == [(270.0, 60.0)]
+    assert 310.0 <= shards[1]['start'] <= 311.0
+    assert shards[0]['end'] == shards[1]['start']
+
+
+def test_plan_shards_short_recording_is_one_shard():
+    assert plan_shards(42.0, 300.0) == [{"index": 0, "start": 0.0, "end": 42.0}]
+
+
+def cascade_report(total, escalated, chunks):
+    return {
+        "small_model": "small", "large_model": "large", "threshold": 0.9, "chunk_seconds": 30,
+        "total_chunks": len(chunks), "escalated_chunks": sum(chunk["escalated"] for chunk in chunks),
+        "total_seconds": total, "escalated_seconds": escalated, "chunks": chunks
+    }
+
+
+def test_stitch_concatenates_transcripts_words_and_cascade_reports():
+    shards = [{"index": 0, "start": 0.0, "end": 10.0}, {"index": 1, "start": 10.0, "end": 20.0}]
+    results = [
+        {"transcript": "hello there", "audio_path": "a.wav",
+         "words": [{"word": "hello", "start": 1.0, "end": 1.5}],
+         "cascade": cascade_report(10.0, 2.5, [{"start": 0.0, "escalated": True}])},
+        {"transcript": "general kenobi", "audio_path": "a.wav",
+         "words": [{"word": "general", "start": 11.0, "end": 11.6}],
+         "cascade": cascade_report(10.0, 0.0, [{"start": 10.0, "escalated": False}])}
+    ]
+    stitched = stitch_asr_results(results, shards)
+
+    assert stitched['transcript'] == "hello there general kenobi"
+    assert stitched['length'] == len(stitched['transcript'])
+    assert [word['start'] for word in stitched['words']] == [1.0, 11.0]
+    assert [shard['length'] for shard in stitched['shards']] == [11, 14]
+    assert stitched['cascade']['total_chunks'] == 2
+    assert stitched['cascade']['escalated_chunks'] == 1
+    assert stitched['cascade']['escalated_fraction'] == pytest.approx(0.125)
+    assert [chunk['start'] for chunk in stitched['cascade']['chunks']] == [0.0, 10.0]
+
+
+def test_stitch_skips_empty_shards():
+    shards = [{"index": 0, "start": 0.0, "end": 5.0}, {"index": 1, "start": 5.0, "end": 9.0}]
+    results = [{"transcript": "", "audio_path": "a.wav"}, {"transcript": "only", "audio_path": "a.wav"}]
+    stitched = stitch_asr_results(results, shards)
+    assert stitched['transcript'] == "only"
+    assert 'words' not in stitched and 'cascade' not in stitched
@@ -0,0 +1,116 @@
+"""Tests for the incremental audio writers."""
+
+import io
+import json
+import shutil
+import struct
+import wave
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from audio_sinks import ProgressiveWavSink, SlideSegmentSink, _adts_frames, _id3_timestamp_tag
+
+
+def read_sizes(path):
+    """RIFF size, data chunk size and file size of a WAV file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    offset = data.index(b'data')
+    riff_size = struct.unpack('<I', data[4:8])[0]
+    data_size = struct.unpack('<I', data[offset + 4:offset + 8])[0]
+    return riff_size, data_size, len(data), offset
+
+
+@pytest.mark.parametrize('subtype, sample_bytes', [('PCM_16', 2), ('FLOAT', 4)])
+def test_progressive_wav_header_is_valid_mid_write(tmp_path, subtype, sample_bytes):
+    path = str(tmp_path / 'lecture.wav')
+    sink = ProgressiveWavSink(path, sample_rate = 24000, silence_duration = 0.2, subtype = subtype)
+
+    for index in range(3):
+        sink.write_sentence({'sentence_id': index + 1}, np.full(1001, 0.1, dtype = np.float32))
+
+        riff_size, data_size, file_size, offset = read_sizes(path)
+        assert riff_size == file_size - 8
+        assert data_size == file_size - offset - 8
+        assert data_size == sink.samples_written * sample_bytes
+        if subtype == 'PCM_16':
+            with wave.open(path) as reader:
+                assert reader.getnframes() == sink.samples_written
+
+    sink.close()
+    assert sf.info(path).frames == sink.samples_written
+
+
+def test_progressive_wav_appends_timestamps_per_sentence(tmp_path):
+    path = str(tmp_path / 'lecture.wav')
+    sink = ProgressiveWavSink(path)
+    sink.write_sentence({'sentence_id': 1}, np.zeros(100, dtype = np.float32))
+
+    with open(tmp_path / 'lecture.jsonl', 'r', encoding = 'utf-8') as f:
+        assert f.read().strip() == '{"sentence_id": 1}'
+    sink.close()
+
+
+def write_lecture(sink, slides, sample_rate = 24000):
+    """Write one second of audio per sentence for the given slide numbers."""
+    for index, slide_number in enumerate(slides):
+        audio = np.sin(np.arange(sample_rate) * 0.05).astype(np.float32) * 0.3
+        sink.write_sentence({'sentence_id': index + 1, 'slide_number': slide_number}, audio)
+    return sink.close()
+
+
+def test_plain_segments_have_no_playlist(tmp_path):
+    output = write_lecture(SlideSegmentSink(str(tmp_path), segment_format = 'wav'), [1, 1, 2, 3, 3])
+
+    assert output['playlist'] is None
+    assert not (tmp_path / 'playlist.m3u8').exists()
+    with open(tmp_path / 'manifest.json', 'r', encoding = 'utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['hls'] is False
+    assert [segment['slide_number'] for segment in manifest['segments']] == [1, 2, 3]
+    assert [segment['first_sentence_id'] for segment in manifest['segments']] == [1, 3, 4]
+    for segment in manifest['segments']:
+        assert sf.info(str(tmp_path / segment['file'])).duration == pytest.approx(segment['duration'], abs = 1e-3)
+
+
+def test_id3_timestamp_tag():
+    tag = _id3_timestamp_tag(4.5)
+    assert tag[:3] == b'ID3'
+    assert b'com.apple.streaming.transportStreamTimestamp\x00' in tag
+    assert struct.unpack('>Q', tag[-8:])[0] == 405000
+
+
+def test_adts_frames_are_split_on_header_lengths():
+    def frame(length):
+        header = bytes([
+            0xFF, 0xF1, 0x60, 0x40 | (length >> 11),
+            (length >> 3) & 0xFF, ((length & 0x07) << 5) | 0x1F, 0xFC
+        ])
+        return header + bytes(length - 7)
+
+    stream = io.BytesIO(frame(100) + frame(9) + frame(300))
+    frames = list(_adts_frames(stream))
+    assert [len(data) for data, _ in frames] == [100, 9, 300]
+    assert all(samples == 1024 for _, samples in frames)
+
+
+@pytest.mark.skipif(shutil.which('ffmpeg') is None, reason = "ffmpeg not installed")
+def test_aac_segments_are_one_gapless_stream(tmp_path):
+    output = write_lecture(SlideSegmentSink(str(tmp_path), segment_format = 'aac'), [1, 1, 2, 3, 3, 3])
+
+    with open(tmp_path / 'manifest.json', 'r', encoding = 'utf-8') as f:
+        segments = json.load(f)['segments']
+    assert output['playlist'] == str(tmp_path / 'playlist.m3u8')
+    assert not (tmp_path / 'stream.aac').exists()
+
+    sentence_start = {1: 0.0, 3: 2.4, 4: 3.6}
+    for segment in segments:
+        with open(tmp_path / segment['file'], 'rb') as f:
+            assert f.read(3) == b'ID3'
+        # Cuts land within half an AAC frame of the sentence start (plus priming)
+        expected = sentence_start[segment['first_sentence_id']] + (1024 / 24000 if segment['index'] else 0)
+        assert segment['start_time'] == pytest.approx(expected, abs = 512 / 24000 + 1e-3)
+    for previous, current in zip(segments, segments[1:]):
+        assert previous['end_time'] == current['start_time']
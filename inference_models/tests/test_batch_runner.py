@@ -0,0 +1,122 @@
+"""Tests for stage-major batch processing (a stub pipeline replaces the models)."""
+
+import json
+import os
+import threading
+import types
+
+import pytest
+
+from batch_runner import BatchRunner
+from pipeline_checkpoint import StageManifest
+
+
+class StubPipeline:
+    """Records stage calls in order; lectures named in fail_in fail in that stage."""
+
+    def __init__(self, output_dir, fail_in = None):
+        self.output_dir = output_dir
+        self.fail_in = fail_in or {}
+        self.calls = []
+        self.evicted = []
+        self.saved = []
+        self._lock = threading.Lock()
+        self.models = types.SimpleNamespace(
+            evict = self.evicted.append,
+            report = lambda: {'models': {}}
+        )
+        self.matcher = types.SimpleNamespace(extract_pdf_pages = lambda pdf_path: [pdf_path])
+
+    def _stage(self, stage, lecture, results, value):
+        with self._lock:
+            self.calls.append((stage, lecture))
+        if self.fail_in.get(lecture) == stage:
+            raise RuntimeError(f"{stage} broke")
+        results['stages'][stage] = 'completed'
+        return value
+
+    def _prepare_run(self, audio_path, pdf_path, lecture_name, save_intermediate, force_stages):
+        lecture_dir = os.path.join(self.output_dir, lecture_name)
+        os.makedirs(lecture_dir, exist_ok = True)
+        return lecture_dir, {'lecture_name': lecture_name, 'stages': {}}, StageManifest(lecture_dir), 'hash'
+
+    def _resource_sampler(self, tracer):
+        return None
+
+    def _matching_params(self, sentence_splitter):
+        return {}
+
+    def _run_asr(self, audio_path, audio_hash, lecture_dir, manifest, results, word_timestamps = False):
+        lecture = os.path.basename(lecture_dir)
+        return self._stage('asr', lecture, results, {'transcript': f"{lecture} transcript"})
+
+    def _run_matching(self, transcript, pdf_path, sentence_splitter, lecture_dir, manifest, results,
+                      page_images = None):
+        assert page_images == [pdf_path]
+        return self._stage('matching', os.path.basename(lecture_dir), results, [])
+
+    def _run_audio(self, matching, asr, audio_path, audio_hash, lecture_dir, manifest, results, **kwargs):
+        return self._stage('audio', os.path.basename(lecture_dir), results, {})
+
+    def _save_results(self, lecture_dir, results):
+        self.saved.append(os.path.basename(lecture_dir))
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    jobs = []
+    for name in ('a', 'b', 'c'):
+        pdf_path = tmp_path / f"{name}.pdf"
+        pdf_path.write_bytes(name.encode())
+        jobs.append((str(tmp_path / f"{name}.wav"), str(pdf_path), name))
+    return jobs
+
+
+def test_stages_run_stage_major(tmp_path, jobs):
+    pipeline = StubPipeline(str(tmp_path / 'out'))
+    result = BatchRunner(pipeline).run(jobs)
+
+    stages = [stage for stage, _ in pipeline.calls]
+    assert stages == ['asr'] * 3 + ['matching'] * 3 + ['audio'] * 3
+    assert [lecture for stage, lecture in pipeline.calls if stage == 'asr'] == ['a', 'b', 'c']
+    assert pipeline.evicted == ['asr', 'matcher']
+    assert sorted(pipeline.saved) == ['a', 'b', 'c']
+    assert all('error' not in job for job in result['jobs'])
+    assert set(result['timing']) == {'asr', 'matching', 'audio'}
+
+
+def test_failed_lecture_is_isolated(tmp_path, jobs):
+    pipeline = StubPipeline(str(tmp_path / 'out'), fail_in = {'b': 'matching'})
+    result = BatchRunner(pipeline).run(jobs)
+
+    assert ('audio', 'b') not in pipeline.calls
+    assert [lecture for stage, lecture in pipeline.calls if stage == 'audio'] == ['a', 'c']
+    assert sorted(pipeline.saved) == ['a', 'c']
+    assert result['jobs'][1] == {'lecture_name': 'b', 'error': 'matching: RuntimeError: matching broke'}
+
+    with open(tmp_path / 'out' / 'batch_state.json', 'r', encoding = 'utf-8') as f:
+        state = json.load(f)
+    assert state['jobs']['b']['stages'] == {'asr': 'completed', 'matching': 'failed'}
+    assert state['jobs']['b']['error'] == 'matching: RuntimeError: matching broke'
+    assert state['jobs']['a']['stages'] == {'asr': 'completed', 'matching': 'completed', 'audio': 'completed'}
+
+
+def test_failed_preparation_skips_the_lecture(tmp_path, jobs):
+    pipeline = StubPipeline(str(tmp_path / 'out'))
+
+    def extract_pdf_pages(pdf_path):
+        if pdf_path.endswith('a.pdf'):
+            raise OSError('unreadable PDF')
+        return [pdf_path]
+
+    pipeline.matcher.extract_pdf_pages = extract_pdf_pages
+    result = BatchRunner(pipeline).run(jobs)
+
+    assert ('matching', 'a') not in pipeline.calls
+    assert result['jobs'][0]['error'] == 'matching: OSError: unreadable PDF'
+    assert [lecture for stage, lecture in pipeline.calls if stage == 'audio'] == ['b', 'c']
+
+
+def test_duplicate_lecture_names_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        BatchRunner(StubPipeline(str(tmp_path))).run([('x.wav', 'x.pdf', 'x'), ('y.wav', 'y.pdf', 'x')])
@@ -0,0 +1,40 @@
+"""Tests for deferred imports of the model libraries."""
+
+import sys
+
+import pytest
+
+import import_benchmark
+from lazy_imports import lazy_import
+
+
+def test_missing_module_fails_on_first_use():
+    module = lazy_import('not_an_installed_library')
+    assert 'not_an_installed_library' not in sys.modules
+    with pytest.raises(ModuleNotFoundError):
+        module.anything
+
+
+def test_submodules_are_rejected():
+    with pytest.raises(ValueError):
+        lazy_import('nemo.collections.asr')
+
+
+def test_lazy_module_runs_on_first_attribute(tmp_path, monkeypatch):
+    package = tmp_path / 'heavy_stub'
+    package.mkdir()
+    (package / '__init__.py').write_text("EXECUTED = True\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'heavy_stub', raising = False)
+
+    module = lazy_import('heavy_stub')
+    assert type(module).__name__ == '_LazyModule'
+    assert module.EXECUTED
+    assert lazy_import('heavy_stub') is module
+
+
+@pytest.mark.parametrize('module', ['asr_processor', 'slide_matching_processor', 'tts_processor'])
+def test_processors_do_not_execute_stubbed_libraries(tmp_path, module):
+    stub_path = import_benchmark.write_stub_packages(str(tmp_path))
+    result = import_benchmark.measure_import(module, runs = 1, stub_path = stub_path)
+    assert result['heavy_loaded'] == []
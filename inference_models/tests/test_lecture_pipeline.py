@@ -0,0 +1,104 @@
+"""Tests for pipeline stage checkpointing (no models: ASR calls are replaced)."""
+
+import types
+from contextlib import nullcontext
+
+import numpy as np
+import pytest
+
+import asr_processor
+import lecture_pipeline
+from lecture_pipeline import LecturePipeline
+from pipeline_checkpoint import StageManifest
+
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    pipeline = LecturePipeline(device = 'cpu', output_dir = str(tmp_path), model_vram_budget_gb = 100)
+    monkeypatch.setattr(pipeline.asr, 'load_model', lambda: None)
+    return pipeline
+
+
+def run_asr(pipeline, tmp_path, transcribe):
+    pipeline.asr.transcribe = transcribe
+    manifest = StageManifest(str(tmp_path))
+    results = {'stages': {}}
+    try:
+        pipeline._run_asr('lecture.wav', 'audio-hash', str(tmp_path), manifest, results)
+    finally:
+        reloaded = StageManifest(str(tmp_path))
+    key = reloaded.stage_key('asr', pipeline._asr_params(False), {'audio': 'audio-hash'})
+    return reloaded.is_complete('asr', key)
+
+
+def test_transcript_is_checkpointed(pipeline, tmp_path):
+    result = {'transcript': 'Hello there.', 'audio_path': 'lecture.wav', 'length': 12}
+    assert run_asr(pipeline, tmp_path, lambda **kwargs: result)
+
+
+def test_failed_transcription_is_not_checkpointed(pipeline, tmp_path):
+    def transcribe(**kwargs):
+        raise RuntimeError('CUDA out of memory')
+
+    with pytest.raises(RuntimeError):
+        run_asr(pipeline, tmp_path, transcribe)
+    assert 'asr' not in StageManifest(str(tmp_path)).stages
+
+
+def test_empty_transcript_is_not_checkpointed(pipeline, tmp_path):
+    result = {'transcript': '', 'audio_path': 'lecture.wav', 'length': 0}
+    assert not run_asr(pipeline, tmp_path, lambda **kwargs: result)
+
+
+def test_chunked_transcribe_raises_model_errors(monkeypatch):
+    fake_torch = types.SimpleNamespace(
+        no_grad = nullcontext,
+        cuda = types.SimpleNamespace(is_available = lambda: False)
+    )
+    monkeypatch.setattr(asr_processor, 'torch', fake_torch)
+    processor = asr_processor.ASRProcessor(device = 'cpu')
+    chunk = {'audio': np.zeros(16000, dtype = np.float32), 'start': 0.0, 'end': 1.0}
+    monkeypatch.setattr(processor, '_iter_chunk_batches', lambda *args: iter([[chunk]]))
+
+    class FailingModel:
+        def transcribe(self, audios, batch_size = 1, timestamps = False):
+            raise MemoryError('out of memory')
+
+    processor.model = FailingModel()
+    with pytest.raises(MemoryError):
+        processor._chunked_transcribe('lecture.wav')
+
+
+def test_interrupted_shards_resume(monkeypatch, tmp_path):
+    shards = [{'index': i, 'start': 10.0 * i, 'end': 10.0 * (i + 1)} for i in range(3)]
+    monkeypatch.setattr(lecture_pipeline, 'probe_duration', lambda path: 30.0)
+    monkeypatch.setattr(lecture_pipeline, 'plan_shards', lambda *args, **kwargs: shards)
+    transcribed = []
+    failing = {20.0}
+
+    def transcribe(start, duration, **kwargs):
+        transcribed.append(start)
+        if start in failing:
+            raise RuntimeError('interrupted')
+        return {'transcript': f"shard at {start:.0f}", 'audio_path': 'lecture.wav', 'length': 11}
+
+    def run(prefetch):
+        pipeline = LecturePipeline(device = 'cpu', output_dir = str(tmp_path), shard_seconds = 10.0,
+                                   shard_prefetch = prefetch, model_vram_budget_gb = 100)
+        pipeline.asr.transcribe = transcribe
+        return pipeline._transcribe_shards(
+            'lecture.wav', 'audio-hash', str(tmp_path), StageManifest(str(tmp_path)),
+            pipeline._asr_params(False), False
+        )
+
+    with pytest.raises(RuntimeError):
+        run(prefetch = 2)
+    assert sorted(transcribed) == [0.0, 10.0, 20.0]
+
+    # Only the shard that failed is transcribed again
+    transcribed.clear()
+    failing.clear()
+    result = run(prefetch = 0)
+    assert transcribed == [20.0]
+    assert result['transcript'] == "shard at 0 shard at 10 shard at 20"
+    assert [shard['start'] for shard in result['shards']] == [0.0, 10.0, 20.0]
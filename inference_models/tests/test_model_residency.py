@@ -0,0 +1,140 @@
+"""Tests for keeping models loaded within a memory budget."""
+
+import threading
+
+import pytest
+
+from model_residency import ModelResidencyManager
+
+GB = 1024**3
+
+
+class FakeProcessor:
+    """Processor whose model occupies a fixed amount of host memory."""
+
+    def __init__(self, name, ram_gb, log):
+        self.name = name
+        self.ram_bytes = int(ram_gb * GB)
+        self.log = log
+        self.loaded = False
+
+    def load_model(self):
+        self.loaded = True
+        self.log.append(('load', self.name))
+
+    def unload_model(self):
+        self.loaded = False
+        self.log.append(('unload', self.name))
+
+    def is_loaded(self):
+        return self.loaded
+
+    def memory_footprint(self):
+        return {'ram_bytes': self.ram_bytes if self.loaded else 0, 'vram_bytes': 0}
+
+
+def manager_with(ram_budget_gb, sizes, warm = True):
+    """Manager with fake processors; warm: every footprint was measured once."""
+    log = []
+    manager = ModelResidencyManager(ram_budget_gb = ram_budget_gb, vram_budget_gb = 100)
+    for name, ram_gb in sizes.items():
+        manager.register(name, FakeProcessor(name, ram_gb, log))
+    if warm:
+        use(manager, *sizes)
+        log.clear()
+    return manager, log
+
+
+def use(manager, *names):
+    for name in names:
+        with manager.use(name):
+            pass
+
+
+def test_models_stay_loaded_without_memory_pressure():
+    manager, log = manager_with(10, {'asr': 2, 'matcher': 2, 'tts': 2})
+    use(manager, 'asr', 'matcher', 'tts', 'asr', 'matcher', 'tts')
+
+    assert [event for event in log if event[0] == 'unload'] == []
+    assert list(manager.resident) == ['asr', 'matcher', 'tts']
+    # Warming up left only tts loaded; asr is loaded once more, then reused
+    assert manager.report()['models']['asr']['reuses'] == 1
+
+
+def test_least_recently_used_model_is_evicted_first():
+    manager, log = manager_with(5, {'asr': 2, 'matcher': 2, 'tts': 2})
+    use(manager, 'asr', 'matcher', 'asr', 'tts')
+
+    # tts was the least recently used when matcher loaded, then matcher when tts did
+    assert [event for event in log if event[0] == 'unload'] == [('unload', 'tts'), ('unload', 'matcher')]
+    assert list(manager.resident) == ['asr', 'tts']
+
+
+def test_known_footprint_makes_room_before_loading():
+    manager, log = manager_with(5, {'asr': 3, 'tts': 3})
+    use(manager, 'asr')
+
+    # asr's footprint is known from its first load: tts is unloaded first
+    assert log == [('unload', 'tts'), ('load', 'asr')]
+
+
+def test_first_load_unloads_idle_models_before_loading():
+    # Without a recorded footprint the new model might not fit next to the others
+    manager, log = manager_with(8, {'asr': 2, 'matcher': 5}, warm = False)
+    use(manager, 'asr', 'matcher')
+    assert log == [('load', 'asr'), ('unload', 'asr'), ('load', 'matcher')]
+
+
+def test_first_load_without_budgets_keeps_models():
+    log = []
+    manager = ModelResidencyManager(ram_budget_gb = None, vram_budget_gb = None)
+    manager._budgets = {'ram_bytes': None, 'vram_bytes': None}
+    for name in ('asr', 'matcher'):
+        manager.register(name, FakeProcessor(name, 2, log))
+    use(manager, 'asr', 'matcher')
+    assert ('unload', 'asr') not in log
+
+
+def test_models_in_use_are_not_evicted():
+    manager, log = manager_with(3, {'asr': 2, 'tts': 2})
+    with manager.use('asr'):
+        with manager.use('tts'):
+            assert manager.processors['asr'].is_loaded()
+            assert manager.processors['tts'].is_loaded()
+    assert ('unload', 'asr') not in log
+
+
+def test_load_runs_outside_the_manager_lock():
+    manager, log = manager_with(10, {'asr': 1, 'tts': 1}, warm = False)
+    reports = []
+
+    def load_model():
+        # Another thread can read the report while the model loads
+        thread = threading.Thread(target = lambda: reports.append(manager.report()))
+        thread.start()
+        thread.join(5)
+        manager.processors['tts'].loaded = True
+
+    manager.processors['tts'].load_model = load_model
+    use(manager, 'tts')
+    assert len(reports) == 1
+
+
+def test_failed_load_unpins_the_model():
+    manager, log = manager_with(10, {'asr': 1}, warm = False)
+
+    def load_model():
+        raise MemoryError('out of memory')
+
+    manager.processors['asr'].load_model = load_model
+    with pytest.raises(MemoryError):
+        use(manager, 'asr')
+    assert manager.pins['asr'] == 0
+
+
+def test_unload_all_skips_pinned_models():
+    manager, log = manager_with(10, {'asr': 1, 'tts': 1})
+    with manager.use('asr'):
+        manager.unload_all()
+        assert list(manager.resident) == ['asr']
+    assert manager.stats['tts']['evictions'] == 1
@@ -0,0 +1,92 @@
+"""Tests for aligning sentences to ASR word timestamps and decoding the recording."""
+
+import shutil
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from original_audio import OriginalAudioProcessor, _fill_gaps, align_sentences
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason = "ffmpeg not installed")
+
+
+def asr_words(text, start = 0.0, step = 0.5):
+    return [
+        {"word": word, "start": start + i * step, "end": start + i * step + 0.4}
+        for i, word in enumerate(text.split())
+    ]
+
+
+def test_sentences_split_from_the_transcript_align_one_to_one():
+    words = asr_words("Hello everybody. Today we talk about graphs.")
+    spans, matched = align_sentences(["Hello everybody.", "Today we talk about graphs."], words)
+    assert matched == 7
+    assert spans == [(0.0, 0.9), (1.0, 3.4)]
+
+
+def test_edited_sentences_use_matching_words_only():
+    words = asr_words("so um today we talk about graphs and trees")
+    spans, matched = align_sentences(["So today we talk", "about graphs and trees."], words)
+    assert matched == 8
+    assert spans[0] == (0.0, 2.4)
+    assert spans[1] == (2.5, 4.4)
+
+
+def test_sentences_without_matching_words_are_unaligned():
+    words = asr_words("first part here second part here")
+    spans, _ = align_sentences(["first part here", "completely unrelated words", "second part here"], words)
+    assert spans[0] == (0.0, 1.4)
+    assert spans[1] is None
+    assert spans[2] == (1.5, 2.9)
+
+
+def test_fill_gaps_spreads_unaligned_sentences_between_neighbours():
+    filled = _fill_gaps([(0.0, 1.0), None, None, (3.0, 4.0)])
+    assert filled == [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0), (3.0, 4.0)]
+
+
+def test_fill_gaps_at_the_edges():
+    # Leading sentences share the time before the first aligned one
+    assert _fill_gaps([None, None, (2.0, 3.0)]) == [(0.0, 1.0), (1.0, 2.0), (2.0, 3.0)]
+    # Trailing sentences get zero length at the last aligned end
+    assert _fill_gaps([(0.0, 1.0), None]) == [(0.0, 1.0), (1.0, 1.0)]
+    assert _fill_gaps([None]) == [(0.0, 0.0)]
+
+
+def test_fill_gaps_never_goes_backwards():
+    # Overlapping neighbours leave no room
+    assert _fill_gaps([(0.0, 2.0), None, (1.5, 3.0)]) == [(0.0, 2.0), (2.0, 2.0), (1.5, 3.0)]
+
+
+@requires_ffmpeg
+def test_decode_reads_the_whole_recording(tmp_path):
+    path = str(tmp_path / 'recording.wav')
+    sf.write(path, np.zeros(24000 * 3, dtype = np.float32), 24000)
+    blocks = list(OriginalAudioProcessor()._decode_audio(path, block_seconds = 1.0))
+    assert sum(len(block) for block in blocks) == 24000 * 3
+
+
+@requires_ffmpeg
+def test_decode_failure_raises(tmp_path):
+    path = tmp_path / 'broken.mp3'
+    path.write_bytes(b'not audio at all')
+    with pytest.raises(RuntimeError, match = 'ffmpeg could not decode'):
+        list(OriginalAudioProcessor()._decode_audio(str(path)))
+
+
+@requires_ffmpeg
+def test_failed_decode_writes_no_output(tmp_path):
+    path = tmp_path / 'broken.mp3'
+    path.write_bytes(b'not audio at all')
+    output = tmp_path / 'out' / 'lecture.wav'
+    with pytest.raises(RuntimeError):
+        OriginalAudioProcessor().generate_from_matching_results(
+            [{"text": "Hello there.", "matched_page": 1}],
+            asr_words("Hello there."),
+            str(path),
+            output_audio_path = str(output),
+            output_json_path = str(tmp_path / 'out' / 'timestamps.json')
+        )
+    assert not output.exists()
+    assert not (tmp_path / 'out' / 'timestamps.json').exists()
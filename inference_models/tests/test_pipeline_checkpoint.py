@@ -0,0 +1,67 @@
+"""Tests for the stage manifest used to resume pipeline runs."""
+
+import os
+
+import pipeline_checkpoint
+from pipeline_checkpoint import StageManifest, hash_text
+
+
+def test_stage_key_depends_on_stage_params_and_inputs(tmp_path):
+    manifest = StageManifest(str(tmp_path))
+    key = manifest.stage_key('asr', {'model': 'a', 'batch_size': 4}, {'audio': 'h1'})
+
+    assert key == manifest.stage_key('asr', {'batch_size': 4, 'model': 'a'}, {'audio': 'h1'})
+    assert key != manifest.stage_key('matching', {'model': 'a', 'batch_size': 4}, {'audio': 'h1'})
+    assert key != manifest.stage_key('asr', {'model': 'b', 'batch_size': 4}, {'audio': 'h1'})
+    assert key != manifest.stage_key('asr', {'model': 'a', 'batch_size': 4}, {'audio': 'h2'})
+
+
+def test_recorded_stage_is_complete_until_an_artifact_changes(tmp_path):
+    artifact = tmp_path / 'transcript.txt'
+    artifact.write_text('hello', encoding = 'utf-8')
+    manifest = StageManifest(str(tmp_path))
+    key = manifest.stage_key('asr', {}, {'audio': hash_text('audio')})
+    manifest.record('asr', key, {}, {}, {'transcript': str(artifact)})
+
+    reloaded = StageManifest(str(tmp_path))
+    assert reloaded.is_complete('asr', key)
+    assert not reloaded.is_complete('asr', 'other key')
+
+    artifact.write_text('edited', encoding = 'utf-8')
+    assert not reloaded.is_complete('asr', key)
+    artifact.unlink()
+    assert not reloaded.is_complete('asr', key)
+
+
+def test_invalidate_forgets_stages(tmp_path):
+    artifact = tmp_path / 'matching.json'
+    artifact.write_text('[]', encoding = 'utf-8')
+    manifest = StageManifest(str(tmp_path))
+    manifest.record('matching', 'k', {}, {}, {'matching': str(artifact)})
+    manifest.invalidate(['matching'])
+
+    assert not StageManifest(str(tmp_path)).is_complete('matching', 'k')
+
+
+def test_file_hash_is_cached_by_size_and_mtime(tmp_path, monkeypatch):
+    recording = tmp_path / 'lecture.wav'
+    recording.write_bytes(b'audio' * 1000)
+    calls = []
+    original = pipeline_checkpoint.hash_file
+    monkeypatch.setattr(pipeline_checkpoint, 'hash_file', lambda path: calls.append(path) or original(path))
+
+    manifest = StageManifest(str(tmp_path))
+    digest = manifest.file_hash(str(recording))
+    assert manifest.file_hash(str(recording)) == digest
+    assert len(calls) == 1
+
+    # The cache survives a reload once the manifest is saved
+    manifest.save()
+    assert StageManifest(str(tmp_path)).file_hash(str(recording)) == digest
+    assert len(calls) == 1
+
+    recording.write_bytes(b'other' * 1000)
+    stat = os.stat(recording)
+    os.utime(recording, ns = (stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert manifest.file_hash(str(recording)) != digest
+    assert len(calls) == 2
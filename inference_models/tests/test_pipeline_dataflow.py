@@ -0,0 +1,88 @@
+"""Tests for the dependency-driven task executor and its critical-path report."""
+
+import threading
+
+import pytest
+
+from pipeline_dataflow import DataflowExecutor
+
+
+def executor_with_timings(timings, deps, wall_time):
+    """Executor whose last run had the given (start, end) task timings."""
+    executor = DataflowExecutor()
+    for name in timings:
+        executor.add(name, lambda *args: None, deps.get(name, ()))
+    executor.timings = dict(timings)
+    executor.wall_time = wall_time
+    return executor
+
+
+def test_critical_path_follows_the_latest_finishing_dependency():
+    # pdf_render overlaps asr; matching waits for both, asr finishes last
+    executor = executor_with_timings(
+        {'asr': (0.0, 10.0), 'pdf_render': (0.0, 4.0), 'matching': (10.5, 12.0), 'audio': (12.0, 20.0)},
+        {'matching': ['asr', 'pdf_render'], 'audio': ['matching']},
+        wall_time = 20.0
+    )
+    report = executor.report()
+
+    assert [entry['task'] for entry in report['critical_path']] == ['asr', 'matching', 'audio']
+    assert [entry['waited'] for entry in report['critical_path']] == [0.0, 0.5, 0.0]
+    assert report['serial_time'] == 23.5
+    assert report['overlap_saved'] == 3.5
+    assert report['tasks']['matching']['deps'] == ['asr', 'pdf_render']
+
+
+def test_critical_path_switches_when_the_side_branch_is_slower():
+    executor = executor_with_timings(
+        {'asr': (0.0, 3.0), 'pdf_render': (0.0, 8.0), 'matching': (8.0, 9.0)},
+        {'matching': ['asr', 'pdf_render']},
+        wall_time = 9.0
+    )
+    assert [entry['task'] for entry in executor.report()['critical_path']] == ['pdf_render', 'matching']
+
+
+def test_empty_report():
+    report = DataflowExecutor().report()
+    assert report['critical_path'] == []
+    assert report['serial_time'] == 0.0
+
+
+def test_run_passes_dependency_results_in_declared_order():
+    executor = DataflowExecutor(max_workers = 2)
+    executor.add('a', lambda: 'A')
+    executor.add('b', lambda: 'B')
+    executor.add('c', lambda b, a: b + a, deps = ['b', 'a'])
+    results = executor.run()
+
+    assert results == {'a': 'A', 'b': 'B', 'c': 'BA'}
+    assert set(executor.timings) == {'a', 'b', 'c'}
+    assert executor.report()['critical_path'][-1]['task'] == 'c'
+
+
+def test_independent_tasks_overlap():
+    barrier = threading.Barrier(2, timeout = 5)
+    executor = DataflowExecutor(max_workers = 2)
+    # Each task only returns once the other one is running too
+    executor.add('left', barrier.wait)
+    executor.add('right', barrier.wait)
+    executor.run()
+
+
+def test_failure_propagates_and_cancels_dependents():
+    ran = []
+    executor = DataflowExecutor()
+    executor.add('broken', lambda: 1 / 0)
+    executor.add('after', lambda value: ran.append(value), deps = ['broken'])
+    with pytest.raises(ZeroDivisionError):
+        executor.run()
+    assert ran == []
+
+
+def test_add_rejects_duplicates_and_unknown_dependencies():
+    executor = DataflowExecutor()
+    executor.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        executor.add('a', lambda: None)
+    with pytest.raises(ValueError):
+        executor.add('b', lambda x: None, deps = ['missing'])
@@ -0,0 +1,137 @@
+"""Tests for pipeline spans and their Chrome trace export."""
+
+import json
+import threading
+
+import pytest
+
+import pipeline_tracing
+from pipeline_tracing import Tracer, active_tracer, span, tracing
+
+
+def events_of(trace, phase):
+    return [event for event in trace['traceEvents'] if event['ph'] == phase]
+
+
+def test_chrome_trace_shape():
+    tracer = Tracer('lecture')
+    with tracer.span('asr', 'asr', chunks = 2) as args:
+        args['words'] = 10
+    tracer.counter('memory_mb', 0.5, {'rss_mb': 100.0})
+
+    trace = json.loads(json.dumps(tracer.chrome_trace()))
+    assert trace['displayTimeUnit'] == 'ms'
+
+    process, thread = events_of(trace, 'M')
+    assert process['name'] == 'process_name' and process['args'] == {'name': 'lecture'}
+    assert thread['name'] == 'thread_name'
+    assert thread['args'] == {'name': threading.current_thread().name}
+
+    complete, = events_of(trace, 'X')
+    assert complete['name'] == 'asr' and complete['cat'] == 'asr'
+    assert complete['args'] == {'chunks': 2, 'words': 10}
+    assert complete['tid'] == thread['tid'] == threading.get_ident()
+    assert complete['pid'] == process['pid']
+    assert complete['ts'] >= 0 and complete['dur'] >= 0
+
+    counter, = events_of(trace, 'C')
+    assert counter == {'name': 'memory_mb', 'ph': 'C', 'ts': 500000.0, 'pid': process['pid'],
+                       'args': {'rss_mb': 100.0}}
+
+
+def test_nested_spans_lie_within_their_parent():
+    tracer = Tracer()
+    with tracer.span('outer'):
+        with tracer.span('inner'):
+            pass
+        with tracer.span('inner'):
+            pass
+
+    # Spans are recorded when they close, so children come first
+    assert [s['name'] for s in tracer.spans] == ['inner', 'inner', 'outer']
+    events = {}
+    for event in events_of(tracer.chrome_trace(), 'X'):
+        events.setdefault(event['name'], []).append(event)
+    outer, = events['outer']
+    first, second = events['inner']
+    for inner in (first, second):
+        assert outer['ts'] <= inner['ts']
+        assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur'] + 0.1
+    assert first['ts'] + first['dur'] <= second['ts'] + 0.1
+
+
+def test_spans_from_threads_get_their_own_track():
+    tracer = Tracer()
+
+    def work():
+        with tracer.span('work'):
+            pass
+
+    worker = threading.Thread(target = work, name = 'worker-1')
+    worker.start()
+    worker.join()
+    with tracer.span('main'):
+        pass
+
+    trace = tracer.chrome_trace()
+    names = {event['tid']: event['args']['name'] for event in events_of(trace, 'M') if 'tid' in event}
+    tracks = {event['name']: names[event['tid']] for event in events_of(trace, 'X')}
+    assert tracks == {'work': 'worker-1', 'main': threading.current_thread().name}
+
+
+def test_summary_sums_numeric_arguments():
+    tracer = Tracer()
+    for pages in (3, 4):
+        with tracer.span('matching.embed_pages', 'matching', pages = pages, cached = False, model = 'x'):
+            pass
+    with tracer.span('audio'):
+        pass
+
+    embed, audio = tracer.summary()
+    assert embed['name'] == 'matching.embed_pages' and embed['category'] == 'matching'
+    assert embed['count'] == 2
+    assert embed['items'] == {'pages': 7}
+    assert embed['max_seconds'] <= embed['total_seconds']
+    assert audio['count'] == 1 and audio['items'] == {}
+    assert 'matching.embed_pages' in tracer.format_summary()
+
+
+def test_save_writes_trace_and_summary(tmp_path):
+    tracer = Tracer()
+    with tracer.span('asr'):
+        pass
+
+    paths = tracer.save(str(tmp_path), prefix = 'run_trace')
+    assert paths == {
+        'chrome_trace': str(tmp_path / 'run_trace.json'),
+        'summary': str(tmp_path / 'run_trace_summary.txt')
+    }
+    with open(paths['chrome_trace'], 'r', encoding = 'utf-8') as f:
+        assert json.load(f) == tracer.chrome_trace()
+    with open(paths['summary'], 'r', encoding = 'utf-8') as f:
+        assert f.read().splitlines()[1].startswith('asr')
+
+
+def test_module_span_is_a_no_op_without_a_tracer():
+    assert active_tracer() is None
+    with span('asr', chunks = 1) as args:
+        args['words'] = 3
+    assert args == {'chunks': 1, 'words': 3}
+
+
+def test_tracing_restores_the_previous_tracer():
+    outer, inner = Tracer('outer'), Tracer('inner')
+    with tracing(outer):
+        with pytest.raises(RuntimeError):
+            with tracing(inner):
+                with span('failing'):
+                    raise RuntimeError('stage failed')
+        assert active_tracer() is outer
+        with span('after'):
+            pass
+    assert active_tracer() is None
+    assert pipeline_tracing._active_tracer is None
+
+    # The failing span is still closed and recorded
+    assert [s['name'] for s in inner.spans] == ['failing']
+    assert [s['name'] for s in outer.spans] == ['after']
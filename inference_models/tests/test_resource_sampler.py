@@ -0,0 +1,118 @@
+"""Tests for background resource sampling (fixed /proc text, no GPU)."""
+
+import io
+import types
+
+import pytest
+
+import resource_sampler
+from pipeline_tracing import Tracer
+from resource_sampler import ResourceSampler
+
+
+# /proc/<pid>/stat of a process whose name contains ') ' and spaces
+STAT = "4242 (tts worker) 1) S 1 4242 4242 0 -1 4194304 500 0 0 0 250 50 3 1 20 0 4 0 100 0 0"
+
+
+@pytest.fixture(autouse = True)
+def no_cuda(monkeypatch):
+    fake_torch = types.SimpleNamespace(cuda = types.SimpleNamespace(is_available = lambda: False))
+    monkeypatch.setattr(resource_sampler, 'torch', fake_torch)
+
+
+@pytest.fixture
+def proc(monkeypatch):
+    """Serve /proc files from a dictionary instead of the real filesystem."""
+    files = {}
+
+    def fake_open(path, mode = 'r'):
+        if path not in files:
+            raise FileNotFoundError(path)
+        return io.StringIO(files[path])
+
+    monkeypatch.setattr(resource_sampler, 'open', fake_open, raising = False)
+    monkeypatch.setattr(resource_sampler.glob, 'glob', lambda pattern: sorted(
+        path for path in files if path.startswith(pattern.split('*')[0]) and path.endswith('/children')
+    ))
+    return files
+
+
+def test_process_cpu_seconds_parses_stat(proc, monkeypatch):
+    monkeypatch.setattr(resource_sampler, '_CLOCK_TICKS', 100)
+    proc['/proc/4242/stat'] = STAT
+    assert resource_sampler._process_cpu_seconds(4242) == pytest.approx(3.0)
+
+
+def test_process_cpu_seconds_without_proc(proc):
+    assert resource_sampler._process_cpu_seconds(4242) == 0.0
+    proc['/proc/4242/stat'] = "4242 (truncated"
+    assert resource_sampler._process_cpu_seconds(4242) == 0.0
+
+
+def test_child_pids_from_all_threads(proc):
+    proc['/proc/10/task/10/children'] = "11 12 "
+    proc['/proc/10/task/13/children'] = "14\n"
+    proc['/proc/10/task/15/children'] = ""
+    assert resource_sampler._child_pids(10) == [11, 12, 14]
+    assert resource_sampler._child_pids(99) == []
+
+
+def test_sample_counts_children(monkeypatch):
+    cpu_seconds = {7: 1.0, 8: 2.0}
+    monkeypatch.setattr(resource_sampler, '_child_pids', lambda pid: list(cpu_seconds))
+    monkeypatch.setattr(resource_sampler, '_process_cpu_seconds', lambda pid: cpu_seconds[pid])
+    monkeypatch.setattr(resource_sampler, 'process_rss', lambda pid: 64 * 1024**2)
+
+    tracer = Tracer()
+    sampler = ResourceSampler(tracer = tracer)
+    sampler._last = (resource_sampler.time.perf_counter() - 1.0, resource_sampler.time.process_time(), {7: 0.5})
+    sampler._sample()
+
+    sample, = sampler.samples
+    assert sample['rss_mb'] == 64
+    assert sample['children_rss_mb'] == 128
+    # Child 7 used 0.5 s and the new child 8 2 s in about one second
+    assert sample['children_cpu_percent'] == pytest.approx(250, rel = 0.05)
+    assert [counter['name'] for counter in tracer.counters] == ['memory_mb', 'cpu_percent']
+    assert tracer.counters[0]['values'] == {'rss_mb': 64.0, 'children_rss_mb': 128.0}
+
+
+def test_start_stop_samples_in_background():
+    tracer = Tracer()
+    with ResourceSampler(interval = 0.01, track_allocations = True, tracer = tracer) as sampler:
+        assert sampler._thread.is_alive()
+        with tracer.span('work'):
+            data = [bytearray(1 << 20) for _ in range(4)]
+            resource_sampler.time.sleep(0.05)
+        del data
+    assert sampler._thread is None
+    assert not resource_sampler.tracemalloc.is_tracing()
+    assert len(sampler.samples) >= 2
+    assert all('python_peak_mb' in sample for sample in sampler.samples)
+    assert len(tracer.counters) == 2 * len(sampler.samples)
+
+    report = sampler.report()
+    assert report['samples'] == len(sampler.samples)
+    assert report['spans']['work']['python_peak_mb'] >= 4
+    assert 'work' in sampler.format_report(report)
+
+
+def test_report_attributes_samples_to_spans():
+    sampler = ResourceSampler()
+    sampler.samples = [
+        {'time': t, 'rss_mb': rss, 'children_rss_mb': 0.0, 'cpu_percent': cpu, 'children_cpu_percent': 0.0}
+        for t, rss, cpu in [(1.0, 100, 50), (2.0, 300, 100), (3.0, 200, 0), (4.0, 150, 0)]
+    ]
+    spans = [
+        {'name': 'asr', 'start': 1.2, 'end': 2.5},
+        {'name': 'audio', 'start': 3.5, 'end': 3.9}
+    ]
+
+    report = sampler.report(spans)
+    assert report['overall']['rss_peak_mb'] == 300
+    # asr overlaps the intervals ending at 2.0 and 3.0; audio only the one ending at 4.0
+    assert report['spans']['asr'] == {
+        'rss_peak_mb': 300, 'children_rss_peak_mb': 0.0, 'cpu_percent': 50.0, 'children_cpu_percent': 0.0
+    }
+    assert report['spans']['audio']['rss_peak_mb'] == 150
+    assert ResourceSampler().report() == {'interval': 0.5, 'samples': 0, 'overall': {}, 'spans': {}}
@@ -0,0 +1,85 @@
+"""Tests for the abbreviation-aware sentence segmenter."""
+
+import json
+import os
+import random
+
+import pytest
+
+from sentence_segmenter import SentenceSegmenter
+
+DEMO_TRANSCRIPT = os.path.join(
+    os.path.dirname(__file__), '..', '..', 'frontend', 'assets', 'lectures', 'lec_demo_001', 'transcript.json'
+)
+
+TEXT = (
+    'Welcome back. Today Dr. Smith shows Fig. 3 again, e.g. the matrix from last week... '
+    'and then we move on! Is that clear? J. R. Smith et al. wrote "The U.S. report." '
+    '(See Sec. 2.) The value is 0.25 and approx. ten percent of it, etc. Finally we stop. '
+    + ' '.join(['word'] * 300) + ' and the end.'
+)
+
+
+def chunked(text, sizes):
+    pieces, i = [], 0
+    while i < len(text):
+        size = sizes()
+        pieces.append(text[i:i + size])
+        i += size
+    return pieces
+
+
+def test_abbreviations_initials_and_decimals_do_not_split():
+    sentences = SentenceSegmenter(min_words = 1, max_words = 40).segment(
+        'Dr. Smith shows Fig. 3 now. J. Smith measured 0.25 volts, e.g. at night. Is it done? Yes!'
+    )
+    assert sentences == [
+        'Dr. Smith shows Fig. 3 now.',
+        'J. Smith measured 0.25 volts, e.g. at night.',
+        'Is it done?',
+        'Yes!'
+    ]
+
+
+def test_sentences_stay_within_word_limits():
+    segmenter = SentenceSegmenter(min_words = 5, max_words = 40)
+    lengths = [len(s.split()) for s in segmenter.segment(TEXT)]
+    assert max(lengths) <= 40
+    assert min(lengths) >= 5
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_stream_matches_segment_for_any_chunking(seed):
+    segmenter = SentenceSegmenter()
+    rng = random.Random(seed)
+    chunks = chunked(TEXT, lambda: rng.randint(1, 40))
+    assert list(segmenter.stream(chunks)) == segmenter.segment(TEXT)
+
+
+def test_run_on_text_keeps_words_split_across_chunks():
+    segmenter = SentenceSegmenter()
+    text = ' '.join(['alpha'] * 700)
+    sentences = list(segmenter.stream(chunked(text, lambda: 7)))
+
+    assert sentences == segmenter.segment(text)
+    assert ' '.join(sentences).split() == text.split()
+    assert max(len(s.split()) for s in sentences) <= segmenter.max_words
+
+
+def test_lowercase_transcript_splits_on_punctuation():
+    text = 'so this is the first part. and this is the second part. ' * 5
+    sentences = SentenceSegmenter(min_words = 1, max_words = 40).segment(text)
+    assert sentences[:2] == ['so this is the first part.', 'and this is the second part.']
+    assert list(SentenceSegmenter(min_words = 1, max_words = 40).stream(chunked(text, lambda: 3))) == sentences
+
+
+@pytest.mark.skipif(not os.path.exists(DEMO_TRANSCRIPT), reason = "demo transcript not present")
+def test_demo_transcript_stream_matches_segment():
+    with open(DEMO_TRANSCRIPT, 'r', encoding = 'utf-8') as f:
+        text = ' '.join(entry['text'].strip() for entry in json.load(f)['timestamps'])
+    segmenter = SentenceSegmenter()
+    rng = random.Random(0)
+    sentences = segmenter.segment(text)
+
+    assert list(segmenter.stream(chunked(text, lambda: rng.randint(1, 200)))) == sentences
+    assert ' '.join(sentences).split() == text.split()
@@ -0,0 +1,84 @@
+"""Tests for TTSProcessor logic that runs without Kokoro."""
+
+import importlib.metadata
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+import tts_processor
+from tts_processor import TTSProcessor
+
+
+def test_model_version_is_resolved_once(monkeypatch, tmp_path):
+    calls = []
+
+    def version(name):
+        calls.append(name)
+        return '9.9'
+
+    monkeypatch.setattr(tts_processor.importlib.metadata, 'version', version)
+    tts = TTSProcessor(device = 'cpu', cache_dir = str(tmp_path))
+    calls.clear()
+
+    keys = {tts._cache_key(f"Sentence {i}.") for i in range(5)}
+    assert len(keys) == 5
+    assert tts.model_version == 'kokoro-9.9'
+    assert calls == ['kokoro']
+
+
+def test_model_version_without_kokoro(monkeypatch):
+    def version(name):
+        raise importlib.metadata.PackageNotFoundError(name)
+
+    monkeypatch.setattr(tts_processor.importlib.metadata, 'version', version)
+    assert TTSProcessor(device = 'cpu').model_version == 'kokoro-unknown'
+
+
+def render_source(tmp_path, silence_duration):
+    """A two-slide lecture rendered from synthetic sentence audio (no model)."""
+    tts = TTSProcessor(device = 'cpu', silence_duration = silence_duration)
+    rng = np.random.default_rng(0)
+    lengths = [12000, 30000, 7000]
+    sentences = [{'text': f"Sentence {i}.", 'slide_number': 1 + i // 2} for i in range(len(lengths))]
+    stream = ((i, rng.normal(0, 0.1, n).astype(np.float32), 0.0, 'synthesized') for i, n in enumerate(lengths))
+    audio_path, json_path = str(tmp_path / 'lecture.wav'), str(tmp_path / 'lecture.json')
+    tts._render(sentences, stream, output_audio_path = audio_path, output_json_path = json_path)
+    return audio_path, json_path
+
+
+def test_speed_variant_keeps_the_source_silence(tmp_path):
+    audio_path, json_path = render_source(tmp_path, silence_duration = 0.5)
+    with open(json_path, 'r', encoding = 'utf-8') as f:
+        assert json.load(f)['metadata']['silence_duration'] == 0.5
+
+    # Configured differently from the processor that rendered the source
+    variant = TTSProcessor(device = 'cpu', silence_duration = 0.2).generate_speed_variants(
+        audio_path, json_path, speeds = [2.0]
+    )[2.0]
+    entries = variant['timestamps']
+    gap = entries[1]['start_sample'] - entries[0]['start_sample'] - entries[0]['num_samples']
+    assert gap == 6000
+    assert entries[1]['start_time'] == pytest.approx(entries[0]['end_time'] + 0.25, abs = 0.002)
+    assert sf.info(str(tmp_path / 'lecture_2x.wav')).frames == entries[-1]['start_sample'] + entries[-1]['num_samples']
+
+
+def test_source_silence_from_older_timestamps():
+    tts = TTSProcessor(device = 'cpu', silence_duration = 0.2)
+    source = {
+        'metadata': {},
+        'timestamps': [
+            {'start_time': 0.0, 'end_time': 1.2, 'duration': 1.2},
+            {'start_time': 1.5, 'end_time': 2.0, 'duration': 0.5}
+        ]
+    }
+    assert tts._source_silence(source) == pytest.approx(0.3)
+    assert tts._source_silence({'metadata': {}, 'timestamps': source['timestamps'][:1]}) == 0.2
+
+
+def test_benchmark_speed_variants_when_nothing_synthesizes(monkeypatch):
+    monkeypatch.setattr(tts_processor, '_synthesize_text', lambda *args: None)
+    tts = TTSProcessor(device = 'cpu')
+    tts.pipeline = object()
+    assert tts.benchmark_speed_variants([{'text': 'Hello.'}], speeds = [1.5]) == {'1.5x': None}
@@ -0,0 +1,186 @@
+"""
+TTS Cache Module
+Persistent sentence-level audio and phoneme caches for TTS synthesis
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import unicodedata
+import numpy as np
+import soundfile as sf
+from typing import Any, Optional
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize sentence text for cache lookups.
+
+    Unicode is NFC-normalized and whitespace runs are collapsed, so
+    formatting-only edits in the transcript still hit the cache.
+    """
+    text = unicodedata.normalize('NFC', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class AudioCache:
+    """
+    Sentence audio cache stored as FLAC files on disk.
+
+    Entries are keyed by (normalized text, voice, speed, lang_code, model
+    version) and sharded into subdirectories by key prefix. Writes go to a
+    temporary file that is atomically renamed, so concurrent runs sharing
+    the same cache directory never see partial entries.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        sample_rate: int = 24000,
+        subtype: str = 'PCM_16'
+    ):
+        """
+        Initialize audio cache.
+
+        Args:
+            cache_dir: Cache directory (created if missing)
+            sample_rate: Audio sample rate
+            subtype: FLAC sample format ('PCM_16' or 'PCM_24')
+        """
+        self.cache_dir = cache_dir
+        self.sample_rate = sample_rate
+        self.subtype = subtype
+        os.makedirs(cache_dir, exist_ok = True)
+
+    def key(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        lang_code: str,
+        model_version: str
+    ) -> str:
+        """Cache key for one sentence."""
+        payload = json.dumps(
+            [normalize_text(text), voice, float(speed), lang_code, model_version],
+            ensure_ascii = False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.flac")
+
+    def contains(self, key: str) -> bool:
+        """Whether an entry exists for the key."""
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Load cached audio.
+
+        Returns:
+            float32 audio samples, or None if missing or unreadable
+        """
+        try:
+            audio, _ = sf.read(self._path(key), dtype = 'float32')
+        except (OSError, RuntimeError):
+            return None
+        return audio
+
+    def put(self, key: str, audio: np.ndarray):
+        """Store audio for the key."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok = True)
+
+        fd, temp_path = tempfile.mkstemp(suffix = '.flac', dir = os.path.dirname(path))
+        os.close(fd)
+        try:
+            sf.write(temp_path, audio, self.sample_rate, format = 'FLAC', subtype = self.subtype)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class PhonemeCache:
+    """
+    Phrase- and word-level grapheme-to-phoneme cache stored in SQLite.
+
+    Phrase entries map a normalized sentence to its Kokoro phoneme chunks,
+    word entries map an out-of-vocabulary word to its espeak phonemes.
+    Entries are namespaced by language and G2P version. The database uses
+    WAL mode, so several processes (TTS workers, concurrent runs) can read
+    and write it at once; lookups are also memoized in memory.
+    """
+
+    def __init__(self, path: str, namespace: str):
+        """
+        Initialize phoneme cache.
+
+        Args:
+            path: SQLite database path (created if missing)
+            namespace: Language code and G2P version the entries belong to
+        """
+        self.path = path
+        self.namespace = namespace
+        self._memory = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+        self._connection = sqlite3.connect(path, timeout = 30, check_same_thread = False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS phonemes ('
+            'kind TEXT, namespace TEXT, text TEXT, value TEXT, '
+            'PRIMARY KEY (kind, namespace, text))'
+        )
+        self._connection.commit()
+
+    def get(self, kind: str, text: str) -> Optional[Any]:
+        """
+        Look up an entry.
+
+        Args:
+            kind: 'phrase' or 'word'
+            text: Sentence or word
+
+        Returns:
+            Stored value, or None if missing
+        """
+        text = normalize_text(text)
+        with self._lock:
+            if (kind, text) in self._memory:
+                return self._memory[(kind, text)]
+            row = self._connection.execute(
+                'SELECT value FROM phonemes WHERE kind = ? AND namespace = ? AND text = ?',
+                (kind, self.namespace, text)
+            ).fetchone()
+            if row is None:
+                return None
+            value = json.loads(row[0])
+            self._memory[(kind, text)] = value
+            return value
+
+    def put(self, kind: str, text: str, value: Any):
+        """Store a JSON-serializable value for the entry."""
+        text = normalize_text(text)
+        with self._lock:
+            self._memory[(kind, text)] = value
+            self._connection.execute(
+                'INSERT OR REPLACE INTO phonemes (kind, namespace, text, value) VALUES (?, ?, ?, ?)',
+                (kind, self.namespace, text, json.dumps(value, ensure_ascii = False))
+            )
+            self._connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -4,14 +4,362 @@ Text-to-Speech generation using Kokoro TTS with slide alignment
 """
 
 import json
+import asyncio
+import difflib
+import functools
 import numpy as np
-from kokoro import KPipeline
+from numpy.lib.stride_tricks import sliding_window_view
 import soundfile as sf
-import subprocess
+import importlib.metadata
+import multiprocessing
 import os
-from typing import List, Dict, Optional
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Optional, Iterator, AsyncIterator, Tuple
 from pathlib import Path
 
+from audio_sinks import (
+    WavSink,
+    ProgressiveWavSink,
+    SlideSegmentSink,
+    MultiSink,
+    create_encoder_sinks
+)
+from tts_cache import AudioCache, PhonemeCache, normalize_text
+from execution_profile import is_cpu, quantize_linear_layers, resolve_device
+from model_residency import module_footprint, process_rss
+from pipeline_tracing import span
+from time_stretch import wsola_stretch
+from lazy_imports import lazy_import
+
+if TYPE_CHECKING:
+    from kokoro import KPipeline
+
+torch = lazy_import('torch')
+kokoro = lazy_import('kokoro')
+
+
+# Per-process pipeline and phoneme cache used by synthesis workers
+_worker_pipeline = None
+_worker_phonemes = None
+
+# Kokoro's phoneme limit per model call
+_MAX_PHONEMES = 510
+
+# G2P counters of the current process, collected after each batch
+_g2p_counters = Counter()
+
+
+def _init_tts_worker(
+    lang_code: str,
+    num_threads: int,
+    phoneme_cache_path: Optional[str],
+    device: str = 'cpu',
+    quantize: bool = False
+):
+    """Load a private KPipeline (and phoneme cache connection) in a synthesis worker process."""
+    global _worker_pipeline, _worker_phonemes
+    torch.set_num_threads(num_threads)
+    _worker_pipeline = _load_pipeline(lang_code, device, quantize)
+    if phoneme_cache_path is not None:
+        _worker_phonemes = PhonemeCache(phoneme_cache_path, _g2p_namespace(lang_code))
+        _cache_word_fallback(_worker_pipeline, _worker_phonemes)
+
+
+def _load_pipeline(lang_code: str, device: str, quantize: bool) -> 'KPipeline':
+    """KPipeline on a device, with int8 linear layers when quantizing on CPU."""
+    pipeline = kokoro.KPipeline(lang_code = lang_code, device = device)
+    if quantize and is_cpu(device) and pipeline.model is not None:
+        quantize_linear_layers(pipeline.model)
+    return pipeline
+
+
+def _synthesize_in_worker(
+    texts: List[str],
+    voice: str,
+    speed: float,
+    phoneme_budget: int
+) -> Tuple[List[Optional[np.ndarray]], float, Counter]:
+    """Synthesize a batch of sentences in a worker process."""
+    start = time.perf_counter()
+    audios = _synthesize_batch(_worker_pipeline, texts, voice, speed, phoneme_budget, _worker_phonemes)
+    return audios, time.perf_counter() - start, _take_g2p_counters()
+
+
+def _take_g2p_counters() -> Counter:
+    """Return and reset the G2P counters of this process."""
+    counters = _g2p_counters.copy()
+    _g2p_counters.clear()
+    return counters
+
+
+def _package_version(name: str) -> str:
+    """Installed version of a package, or 'unknown' if it is not installed."""
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+def _g2p_namespace(lang_code: str) -> str:
+    """Phoneme cache namespace: entries are only valid for one language and G2P version."""
+    return f"{lang_code}/misaki-{_package_version('misaki')}"
+
+
+class _CachedFallback:
+    """
+    Memoizing wrapper around misaki's espeak fallback.
+
+    The lexicon lookup is cheap, but out-of-vocabulary words (technical
+    terms, names) go through espeak every time they appear.
+    """
+
+    def __init__(self, fallback, phoneme_cache: PhonemeCache):
+        self.fallback = fallback
+        self.phoneme_cache = phoneme_cache
+
+    def __call__(self, token):
+        cached = self.phoneme_cache.get('word', token.text)
+        if cached is not None:
+            _g2p_counters['word_hits'] += 1
+            return tuple(cached)
+
+        start = time.perf_counter()
+        phonemes, rating = self.fallback(token)
+        _g2p_counters['fallback_seconds'] += time.perf_counter() - start
+        _g2p_counters['word_misses'] += 1
+        if phonemes is not None:
+            self.phoneme_cache.put('word', token.text, [phonemes, rating])
+        return phonemes, rating
+
+
+def _cache_word_fallback(pipeline: 'KPipeline', phoneme_cache: PhonemeCache):
+    """Route the pipeline's out-of-vocabulary G2P through the phoneme cache."""
+    g2p = getattr(pipeline, 'g2p', None)
+    fallback = getattr(g2p, 'fallback', None)
+    if fallback is not None and not isinstance(fallback, _CachedFallback):
+        g2p.fallback = _CachedFallback(fallback, phoneme_cache)
+
+
+def _phonemize(
+    pipeline: 'KPipeline',
+    text: str,
+    phoneme_cache: Optional[PhonemeCache] = None
+) -> Optional[List[str]]:
+    """
+    Convert a sentence to the phoneme chunks Kokoro synthesizes.
+
+    Chunks match what KPipeline itself produces for the sentence, so
+    synthesizing them gives the same audio. Results are memoized per
+    sentence in the phoneme cache.
+
+    Returns:
+        Phoneme strings (one per model call), or None for non-English
+        pipelines, which keep their own front end
+    """
+    if pipeline.lang_code not in 'ab':
+        return None
+
+    if phoneme_cache is not None:
+        chunks = phoneme_cache.get('phrase', text)
+        if chunks is not None:
+            _g2p_counters['phrase_hits'] += 1
+            return chunks
+
+    start = time.perf_counter()
+    _, tokens = pipeline.g2p(normalize_text(text))
+    chunks = [ps[:_MAX_PHONEMES] for _, ps, _ in pipeline.en_tokenize(tokens) if ps]
+    _g2p_counters['g2p_seconds'] += time.perf_counter() - start
+    _g2p_counters['phrase_misses'] += 1
+
+    if phoneme_cache is not None:
+        phoneme_cache.put('phrase', text, chunks)
+    return chunks
+
+
+def _synthesize_text(
+    pipeline: 'KPipeline',
+    text: str,
+    voice: str,
+    speed: float,
+    phoneme_cache: Optional[PhonemeCache] = None
+) -> Optional[np.ndarray]:
+    """
+    Synthesize one sentence with a Kokoro pipeline.
+
+    Returns:
+        float32 audio samples, or None if nothing was generated
+    """
+    chunks = _phonemize(pipeline, text, phoneme_cache)
+    if chunks is not None:
+        return _synthesize_chunks(pipeline, chunks, voice, speed)
+
+    generator = pipeline(text, voice = voice, speed = speed)
+
+    # Collect audio segments
+    sentence_audio_parts = []
+    for graphemes, phonemes, audio in generator:
+        sentence_audio_parts.append(np.asarray(audio, dtype = np.float32))
+
+    # Merge segments
+    if not sentence_audio_parts:
+        return None
+    return np.concatenate(sentence_audio_parts)
+
+
+def _synthesize_chunks(
+    pipeline: 'KPipeline',
+    chunks: List[str],
+    voice: str,
+    speed: float
+) -> Optional[np.ndarray]:
+    """Synthesize the phoneme chunks of one sentence and join them."""
+    sentence_audio_parts = [_synthesize_phonemes(pipeline, phonemes, voice, speed)[0] for phonemes in chunks]
+    if not sentence_audio_parts:
+        return None
+    return np.concatenate(sentence_audio_parts)
+
+
+def _synthesize_phonemes(
+    pipeline: 'KPipeline',
+    phonemes: str,
+    voice: str,
+    speed: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run one Kokoro model call on a phoneme string.
+
+    Returns:
+        Tuple of (float32 audio, predicted frames per input token)
+    """
+    result = next(iter(pipeline.generate_from_tokens(phonemes, voice = voice, speed = speed)))
+    audio = np.asarray(result.audio, dtype = np.float32)
+    return audio, np.asarray(result.pred_dur, dtype = np.int64)
+
+
+def _synthesize_packed(
+    pipeline: 'KPipeline',
+    phonemes: List[str],
+    voice: str,
+    speed: float
+) -> List[np.ndarray]:
+    """
+    Synthesize several sentences in one model call and split the result.
+
+    The phoneme strings are joined with spaces. The model predicts a frame
+    count for every input token (plus the start and end tokens), and each
+    frame is a fixed number of samples, so the cumulative durations give the
+    exact sample position of every token. The audio is cut in the middle of
+    each separating space.
+
+    Args:
+        pipeline: Kokoro pipeline
+        phonemes: Phoneme strings of consecutive sentences
+        voice: Voice style
+        speed: Playback speed multiplier
+
+    Returns:
+        float32 audio for each sentence
+    """
+    audio, durations = _synthesize_phonemes(pipeline, ' '.join(phonemes), voice, speed)
+
+    # Characters outside the vocabulary are dropped by the model
+    vocab = pipeline.model.vocab
+    lengths = [sum(1 for c in ps if c in vocab) for ps in phonemes]
+    expected_tokens = sum(lengths) + len(phonemes) - 1 + 2
+    if len(durations) != expected_tokens:
+        raise ValueError(f"Expected {expected_tokens} token durations, got {len(durations)}")
+
+    # Kokoro emits a fixed 600 samples per frame, so this scale is exact
+    frame_ends = np.cumsum(durations)
+    scale = len(audio) / max(1, frame_ends[-1])
+
+    cuts = [0]
+    separator = 1 + lengths[0]  # Token index after the start token and first sentence
+    for length in lengths[1:]:
+        middle = (frame_ends[separator - 1] + frame_ends[separator]) / 2
+        cuts.append(int(round(middle * scale)))
+        separator += 1 + length
+    cuts.append(len(audio))
+
+    return [audio[start:end] for start, end in zip(cuts, cuts[1:])]
+
+
+def _synthesize_batch(
+    pipeline: 'KPipeline',
+    texts: List[str],
+    voice: str,
+    speed: float,
+    phoneme_budget: int,
+    phoneme_cache: Optional[PhonemeCache] = None
+) -> List[Optional[np.ndarray]]:
+    """
+    Synthesize consecutive sentences, packing short ones into shared calls.
+
+    Sentences are phonemized and greedily packed in order while the joined
+    phoneme string stays within phoneme_budget. Sentences that cannot be
+    packed, and packs whose durations do not line up, fall back to one call
+    per sentence.
+
+    Args:
+        pipeline: Kokoro pipeline
+        texts: Sentence texts
+        voice: Voice style
+        speed: Playback speed multiplier
+        phoneme_budget: Maximum phonemes per packed call (0 = no packing)
+        phoneme_cache: Optional phoneme cache
+
+    Returns:
+        float32 audio (or None on failure) for each sentence
+    """
+    def synthesize_single(text, chunks = None):
+        try:
+            if chunks is not None:
+                return _synthesize_chunks(pipeline, chunks, voice, speed)
+            return _synthesize_text(pipeline, text, voice, speed, phoneme_cache)
+        except Exception as e:
+            print(f"Error processing sentence '{text[:40]}': {e}")
+            return None
+
+    if phoneme_budget <= 0 or len(texts) == 1:
+        return [synthesize_single(text) for text in texts]
+
+    budget = min(phoneme_budget, _MAX_PHONEMES)
+    audios = [None] * len(texts)
+    pack = []
+    pack_length = 0
+
+    def flush():
+        if len(pack) > 1:
+            try:
+                parts = _synthesize_packed(pipeline, [ps for _, ps in pack], voice, speed)
+                for (i, _), part in zip(pack, parts):
+                    audios[i] = part
+                return
+            except Exception as e:
+                print(f"Packed synthesis failed, synthesizing separately: {e}")
+        for i, phonemes in pack:
+            audios[i] = synthesize_single(texts[i], [phonemes])
+
+    for i, text in enumerate(texts):
+        try:
+            chunks = _phonemize(pipeline, text, phoneme_cache)
+        except Exception:
+            chunks = None
+        if chunks is None or len(chunks) != 1:
+            audios[i] = synthesize_single(text, chunks)
+            continue
+        phonemes = chunks[0]
+        if pack and pack_length + 1 + len(phonemes) > budget:
+            flush()
+            pack, pack_length = [], 0
+        pack_length += len(phonemes) + (1 if pack else 0)
+        pack.append((i, phonemes))
+    flush()
+
+    return audios
+
 
 class TTSProcessor:
     """
@@ -24,7 +372,16 @@ class TTSProcessor:
         speed: float = 1.0,
         lang_code: str = 'a',
         silence_duration: float = 0.2,
-        sample_rate: int = 24000
+        sample_rate: int = 24000,
+        num_workers: int = 1,
+        wav_subtype: str = 'PCM_16',
+        cache_dir: Optional[str] = None,
+        segment_format: str = 'aac',
+        max_segment_seconds: Optional[float] = 20.0,
+        batch_phonemes: int = 0,
+        phoneme_cache_path: Optional[str] = None,
+        device: str = 'auto',
+        quantize: bool = False
     ):
         """
         Initialize TTS processor.
@@ -35,40 +392,276 @@ class TTSProcessor:
             lang_code: Language code ('a' = American English)
             silence_duration: Silence between sentences (seconds)
             sample_rate: Audio sample rate (fixed at 24000 for Kokoro)
+            num_workers: Number of synthesis worker processes (1 = serial in-process)
+            wav_subtype: WAV sample format ('PCM_16' or 'FLOAT')
+            cache_dir: Optional directory for the persistent sentence audio cache
+            segment_format: Format of slide-aligned segments ('aac' with an HLS
+                playlist; 'opus' or 'wav' as plain files)
+            max_segment_seconds: Split slides longer than this into several segments
+            batch_phonemes: Pack consecutive short sentences into one model call
+                up to this many phonemes (0 = one call per sentence, max 510)
+            phoneme_cache_path: SQLite file for the persistent phoneme cache
+                (defaults to phonemes.sqlite in cache_dir when that is set)
+            device: Device to run on (cuda/cpu, auto = cuda if available)
+            quantize: On CPU, quantize the model's linear layers to int8
         """
         self.voice = voice
         self.speed = speed
         self.lang_code = lang_code
         self.silence_duration = silence_duration
         self.sample_rate = sample_rate
+        self.num_workers = max(1, num_workers)
+        self.wav_subtype = wav_subtype
+        self.segment_format = segment_format
+        self.max_segment_seconds = max_segment_seconds
+        self.batch_phonemes = max(0, batch_phonemes)
+        self.device = device
+        self.quantize = quantize
+        self.cache = None
+        if cache_dir is not None:
+            self.cache = AudioCache(
+                cache_dir,
+                sample_rate = sample_rate,
+                subtype = 'PCM_16' if wav_subtype == 'PCM_16' else 'PCM_24'
+            )
+        if phoneme_cache_path is None and cache_dir is not None:
+            phoneme_cache_path = os.path.join(cache_dir, 'phonemes.sqlite')
+        self.phoneme_cache_path = phoneme_cache_path
+        self.phonemes = None
+        if phoneme_cache_path is not None:
+            self.phonemes = PhonemeCache(phoneme_cache_path, _g2p_namespace(lang_code))
+        self.g2p_counters = Counter()
         self.pipeline = None
+        self.pool = None
 
         print(f"Initializing TTS Processor")
-        print(f"Voice: {voice}, Speed: {speed}, Lang: {lang_code}")
+        print(f"Voice: {voice}, Speed: {speed}, Lang: {lang_code}, Workers: {self.num_workers}")
+
+    @functools.cached_property
+    def model_version(self) -> str:
+        """Kokoro version, part of cache keys (resolved once, on first use: kokoro may be absent)."""
+        return f"kokoro-{_package_version('kokoro')}"
+
+    def is_loaded(self) -> bool:
+        """Whether the pipeline (or worker pool) is ready."""
+        return self.pipeline is not None or self.pool is not None
 
     def load_model(self):
-        """Load TTS pipeline."""
-        if self.pipeline is not None:
+        """
+        Load TTS pipeline.
+
+        With num_workers > 1 a process pool is started instead, and each
+        worker loads its own KPipeline.
+        """
+        if self.is_loaded():
             print("Pipeline already loaded")
             return
 
+        if self.num_workers > 1:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // self.num_workers)
+            print(f"Starting {self.num_workers} TTS workers ({threads_per_worker} threads each)...")
+            self.pool = ProcessPoolExecutor(
+                max_workers = self.num_workers,
+                mp_context = multiprocessing.get_context('spawn'),
+                initializer = _init_tts_worker,
+                initargs = (
+                    self.lang_code, threads_per_worker, self.phoneme_cache_path,
+                    resolve_device(self.device), self.quantize
+                )
+            )
+            print("TTS workers started")
+            return
+
         print(f"Loading Kokoro TTS pipeline (lang_code: {self.lang_code})...")
-        self.pipeline = KPipeline(lang_code = self.lang_code)
+        with span('tts.load_model', 'tts', lang_code = self.lang_code):
+            self.pipeline = _load_pipeline(self.lang_code, resolve_device(self.device), self.quantize)
+            if self.phonemes is not None:
+                _cache_word_fallback(self.pipeline, self.phonemes)
         print("TTS pipeline loaded successfully")
 
     def unload_model(self):
         """Unload pipeline to free memory."""
+        if self.pool is not None:
+            self.pool.shutdown(wait = True, cancel_futures = True)
+            self.pool = None
+            print("TTS workers stopped")
         if self.pipeline is not None:
             del self.pipeline
             self.pipeline = None
             print("TTS pipeline unloaded")
 
+    def memory_footprint(self) -> Dict[str, int]:
+        """
+        Bytes held by the pipeline, split into 'ram_bytes' and 'vram_bytes'.
+
+        With a worker pool this is the resident memory of the worker
+        processes (workers start on first use, so 0 before any synthesis).
+        """
+        if self.pool is not None:
+            workers = getattr(self.pool, '_processes', None) or {}
+            return {'ram_bytes': sum(process_rss(pid) for pid in workers), 'vram_bytes': 0}
+        if self.pipeline is not None:
+            return module_footprint(getattr(self.pipeline, 'model', None))
+        return {'ram_bytes': 0, 'vram_bytes': 0}
+
+    def _synthesize_ordered(
+        self,
+        texts: List[str]
+    ) -> Iterator[Tuple[int, Optional[np.ndarray], float, str]]:
+        """
+        Synthesize sentences, yielding results in input order.
+
+        Sentences found in the audio cache are not synthesized, and the model
+        is only loaded once the first cache miss is encountered. With
+        batch_phonemes > 0, consecutive uncached sentences are synthesized in
+        batches. In parallel mode at most 2 * num_workers batches are in
+        flight, so finished audio waiting for an earlier batch stays bounded.
+
+        Args:
+            texts: Sentence texts
+
+        Yields:
+            Tuples of (index, audio or None on failure, synthesis seconds,
+            source) where source is 'synthesized' or 'cache'
+        """
+        pending = deque()
+        jobs = self._plan_jobs(texts)
+        job = next(jobs, None)
+        while job is not None or pending:
+            while job is not None and len(pending) < 2 * self.num_workers:
+                indices, cached = job
+                batch = [texts[i] for i in indices]
+                pending.append((indices, self._submit(batch, cached = cached)))
+                job = next(jobs, None)
+
+            indices, task = pending.popleft()
+            try:
+                results = self._resolve([texts[i] for i in indices], task)
+            except Exception as e:
+                print(f"Error processing sentences {indices[0]+1}-{indices[-1]+1}: {e}")
+                results = [(None, 0.0, 'synthesized')] * len(indices)
+            for idx, (audio, elapsed, source) in zip(indices, results):
+                yield idx, audio, elapsed, source
+
+    def _plan_jobs(self, texts: List[str]) -> Iterator[Tuple[List[int], bool]]:
+        """
+        Group sentence indices into cache lookups and synthesis batches.
+
+        Consecutive uncached sentences are batched while their combined text
+        length stays within batch_phonemes, a cheap estimate of the phoneme
+        count; exact packing happens at synthesis time.
+
+        Yields:
+            Tuples of (sentence indices, whether the sentence is cached)
+        """
+        batch = []
+        length = 0
+        for idx, text in enumerate(texts):
+            key = self._cache_key(text)
+            if key is not None and self.cache.contains(key):
+                if batch:
+                    yield batch, False
+                    batch, length = [], 0
+                yield [idx], True
+                continue
+
+            if batch and (self.batch_phonemes <= 0 or length + len(text) > self.batch_phonemes):
+                yield batch, False
+                batch, length = [], 0
+            batch.append(idx)
+            length += len(text)
+
+        if batch:
+            yield batch, False
+
+    def _cache_key(self, text: str) -> Optional[str]:
+        """Cache key of a sentence, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return self.cache.key(text, self.voice, self.speed, self.lang_code, self.model_version)
+
+    def _submit(self, batch: List[str], cached: bool = False) -> Tuple[str, any, List[Optional[str]]]:
+        """
+        Schedule synthesis of a batch of sentences.
+
+        Args:
+            batch: Sentence texts
+            cached: Read the (single) sentence from the cache instead
+
+        Returns:
+            Job tuple of (kind, payload, cache keys) for _resolve
+        """
+        keys = [self._cache_key(text) for text in batch]
+        if cached:
+            return 'cached', None, keys
+
+        if not self.is_loaded():
+            self.load_model()
+        if self.pool is not None:
+            future = self.pool.submit(
+                _synthesize_in_worker, batch, self.voice, self.speed, self.batch_phonemes
+            )
+            return 'future', future, keys
+        return 'serial', None, keys
+
+    def _resolve(
+        self,
+        batch: List[str],
+        job: Tuple[str, any, List[Optional[str]]]
+    ) -> List[Tuple[Optional[np.ndarray], float, str]]:
+        """
+        Wait for a scheduled batch and store new audio in the cache.
+
+        Synthesis time of a batch is attributed to its sentences in
+        proportion to their audio length.
+
+        Returns:
+            List of (audio or None, synthesis seconds, source) per sentence
+        """
+        kind, future, keys = job
+        if kind == 'cached':
+            with span('tts.cache_read', 'tts', sentences = 1):
+                audio = self.cache.get(keys[0])
+            if audio is not None:
+                return [(audio, 0.0, 'cache')]
+            # Unreadable entry: synthesize again
+            kind, future, keys = self._submit(batch)
+
+        # In parallel mode this is the wait for the worker; 'worker_seconds' is its synthesis time
+        with span('tts.synthesize', 'tts', sentences = len(batch), characters = sum(map(len, batch))) as args:
+            if kind == 'future':
+                audios, elapsed, counters = future.result()
+            else:
+                start = time.perf_counter()
+                audios = _synthesize_batch(
+                    self.pipeline, batch, self.voice, self.speed, self.batch_phonemes, self.phonemes
+                )
+                elapsed = time.perf_counter() - start
+                counters = _take_g2p_counters()
+            args['worker_seconds'] = elapsed
+        self.g2p_counters.update(counters)
+
+        total_samples = sum(len(audio) for audio in audios if audio is not None)
+        results = []
+        for key, audio in zip(keys, audios):
+            if audio is None:
+                results.append((None, 0.0, 'synthesized'))
+                continue
+            if key is not None:
+                self.cache.put(key, audio)
+            share = len(audio) / total_samples if total_samples else 1.0 / len(batch)
+            results.append((audio, elapsed * share, 'synthesized'))
+        return results
+
     def generate_audio(
         self,
         sentences: List[Dict[str, any]],
         output_audio_path: str = "lecture_audio.wav",
         output_json_path: Optional[str] = None,
-        export_formats: Optional[List[str]] = None
+        export_formats: Optional[List[str]] = None,
+        progressive: bool = False,
+        write_wav: bool = True,
+        segment_dir: Optional[str] = None
     ) -> Dict[str, any]:
         """
         Generate audio from sentences with slide alignment.
@@ -78,174 +671,738 @@ class TTSProcessor:
             output_audio_path: Output WAV file path
             output_json_path: Optional JSON metadata output path
             export_formats: Optional list of additional formats ['opus', 'aac']
+            progressive: Write the WAV in place and keep it playable while
+                generating, with timestamps appended to a .jsonl file alongside
+            write_wav: Write the WAV file; set False to only produce export_formats
+                (named after output_audio_path)
+            segment_dir: Optional directory for slide-aligned segments with an
+                HLS playlist and JSON manifest
 
         Returns:
             Dictionary with metadata and timestamps
         """
-        if self.pipeline is None:
-            self.load_model()
-
         print(f"Generating audio for {len(sentences)} sentences...")
 
-        # Result storage
-        all_audio = []
-        timestamp_data = []
-        current_time = 0.0
+        texts = [sentence_info.get('text', '') for sentence_info in sentences]
 
-        for idx, sentence_info in enumerate(sentences):
-            text = sentence_info.get('text', '')
-            slide_number = sentence_info.get('slide_number', 1)
+        return self._render(
+            sentences,
+            self._synthesize_ordered(texts),
+            output_audio_path = output_audio_path,
+            output_json_path = output_json_path,
+            export_formats = export_formats,
+            progressive = progressive,
+            write_wav = write_wav,
+            segment_dir = segment_dir
+        )
 
-            print(f"Processing: [{idx+1}/{len(sentences)}] [Slide {slide_number}] {text[:50]}...")
+    def generate_incremental(
+        self,
+        sentences: List[Dict[str, any]],
+        previous_json_path: str,
+        previous_audio_path: str,
+        output_audio_path: Optional[str] = None,
+        output_json_path: Optional[str] = None,
+        export_formats: Optional[List[str]] = None,
+        write_wav: bool = True,
+        segment_dir: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Re-generate an edited lecture, synthesizing only changed sentences.
 
-            try:
-                # TTS generation
-                generator = self.pipeline(text, voice = self.voice, speed = self.speed)
-
-                # Collect audio segments
-                sentence_audio_parts = []
-                for graphemes, phonemes, audio in generator:
-                    sentence_audio_parts.append(audio)
-
-                # Merge segments
-                if sentence_audio_parts:
-                    sentence_audio = np.concatenate(sentence_audio_parts)
-
-                    # Calculate duration
-                    duration = len(sentence_audio) / self.sample_rate
-
-                    # Save timestamp info
-                    timestamp_info = {
-                        "sentence_id": idx + 1,
-                        "text": text,
-                        "slide_number": slide_number,
-                        "start_time": round(current_time, 3),
-                        "end_time": round(current_time + duration, 3),
-                        "duration": round(duration, 3)
-                    }
-                    timestamp_data.append(timestamp_info)
-
-                    # Accumulate audio
-                    all_audio.append(sentence_audio)
-
-                    # Update time
-                    current_time += duration + self.silence_duration
+        The new sentence list is diffed against the previous timestamps.json.
+        Audio of unchanged sentences is copied from the previous WAV using
+        the sample positions stored in the timestamps, and later timestamps
+        are shifted accordingly. Falls back to full generation if the
+        previous output is missing, no longer matches its timestamps, or was
+        produced with a different voice, speed, language or sample rate.
 
-            except Exception as e:
-                print(f"Error processing sentence {idx+1}: {e}")
+        Args:
+            sentences: List of dicts with 'text' and 'slide_number' keys
+            previous_json_path: timestamps.json of the previous generation
+            previous_audio_path: WAV file of the previous generation
+            output_audio_path: Output WAV path (defaults to previous_audio_path)
+            output_json_path: Output JSON path (defaults to previous_json_path)
+            export_formats: Optional list of additional formats ['opus', 'aac']
+            write_wav: Write the WAV file; set False to only produce export_formats
+            segment_dir: Optional directory for slide-aligned segments
+
+        Returns:
+            Dictionary with metadata and timestamps
+        """
+        output_audio_path = output_audio_path or previous_audio_path
+        output_json_path = output_json_path or previous_json_path
+
+        previous = None
+        if os.path.exists(previous_json_path) and os.path.exists(previous_audio_path):
+            with open(previous_json_path, 'r', encoding = 'utf-8') as f:
+                previous = json.load(f)
+
+        if previous is None or not self._is_compatible(previous, previous_audio_path):
+            print("No compatible previous output, generating full lecture")
+            return self.generate_audio(
+                sentences = sentences,
+                output_audio_path = output_audio_path,
+                output_json_path = output_json_path,
+                export_formats = export_formats,
+                write_wav = write_wav,
+                segment_dir = segment_dir
+            )
+
+        # Map unchanged new sentences to their previous timestamp entry
+        texts = [sentence_info.get('text', '') for sentence_info in sentences]
+        previous_entries = previous['timestamps']
+        matcher = difflib.SequenceMatcher(
+            None,
+            [normalize_text(entry['text']) for entry in previous_entries],
+            [normalize_text(text) for text in texts],
+            autojunk = False
+        )
+        reuse = [None] * len(sentences)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                for offset in range(i2 - i1):
+                    reuse[j1 + offset] = previous_entries[i1 + offset]
+
+        changed = [idx for idx, entry in enumerate(reuse) if entry is None]
+        print(f"Incremental update: {len(sentences) - len(changed)} sentences reused, "
+              f"{len(changed)} to synthesize")
+
+        with sf.SoundFile(previous_audio_path) as previous_audio:
+            output_data = self._render(
+                sentences,
+                self._splice_ordered(texts, reuse, previous_audio),
+                output_audio_path = output_audio_path,
+                output_json_path = None,
+                export_formats = export_formats,
+                write_wav = write_wav,
+                segment_dir = segment_dir
+            )
+
+        output_data['metadata']['incremental'] = {
+            "previous": previous_json_path,
+            "reused_sentences": len(sentences) - len(changed),
+            "synthesized_sentences": len(changed)
+        }
+        self._save_json(output_data, output_json_path)
+        return output_data
+
+    def _is_compatible(self, previous: Dict[str, any], previous_audio_path: str) -> bool:
+        """
+        Whether previous output can be spliced with this processor's settings.
+
+        The timestamps must carry sample positions (older outputs only have
+        millisecond times and are regenerated once), and the WAV must still
+        be the one they describe: a run with write_wav=False updates
+        timestamps.json but leaves the older WAV in place.
+        """
+        metadata = previous['metadata']
+        if not (
+            metadata.get('voice') == self.voice
+            and metadata.get('speed') == self.speed
+            and metadata.get('language_code') == self.lang_code
+            and metadata.get('sample_rate') == self.sample_rate
+        ):
+            return False
+
+        entries = previous['timestamps']
+        if not entries:
+            return True
+        if any('start_sample' not in entry for entry in entries):
+            return False
+        return sf.info(previous_audio_path).frames == entries[-1]['start_sample'] + entries[-1]['num_samples']
+
+    def _splice_ordered(
+        self,
+        texts: List[str],
+        reuse: List[Optional[Dict[str, any]]],
+        previous_audio: sf.SoundFile
+    ) -> Iterator[Tuple[int, Optional[np.ndarray], float, str]]:
+        """
+        Yield sentence audio in order, reading unchanged sentences from the
+        previous recording and synthesizing the rest.
+
+        Args:
+            texts: New sentence texts
+            reuse: Previous timestamp entry per sentence, or None if changed
+            previous_audio: Open previous WAV file
+
+        Yields:
+            Tuples of (index, audio or None, synthesis seconds, source)
+        """
+        changed = [idx for idx, entry in enumerate(reuse) if entry is None]
+        synthesized = self._synthesize_ordered([texts[idx] for idx in changed])
+
+        for idx, entry in enumerate(reuse):
+            if entry is None:
+                _, audio, elapsed, source = next(synthesized)
+                yield idx, audio, elapsed, source
+                continue
+
+            previous_audio.seek(entry['start_sample'])
+            yield idx, previous_audio.read(entry['num_samples'], dtype = 'float32'), 0.0, 'spliced'
+
+    def stream_audio(
+        self,
+        sentences: List[Dict[str, any]]
+    ) -> Iterator[Tuple[Dict[str, any], np.ndarray]]:
+        """
+        Synthesize sentences and yield each one as soon as it is ready.
+
+        Timestamps assume the configured silence between sentences, exactly
+        as in generate_audio, so a consumer can start playback (or write a
+        ProgressiveWavSink) after the first sentence.
+
+        Args:
+            sentences: List of dicts with 'text' and 'slide_number' keys
+
+        Yields:
+            Tuples of (timestamp entry, float32 sentence audio)
+        """
+        texts = [sentence_info.get('text', '') for sentence_info in sentences]
+        yield from self._timeline(sentences, self._synthesize_ordered(texts), stats = {})
+
+    async def astream_audio(
+        self,
+        sentences: List[Dict[str, any]]
+    ) -> AsyncIterator[Tuple[Dict[str, any], np.ndarray]]:
+        """
+        Async version of stream_audio.
+
+        Synthesis runs in a worker thread, so the event loop stays free
+        while each sentence is generated.
+
+        Args:
+            sentences: List of dicts with 'text' and 'slide_number' keys
+
+        Yields:
+            Tuples of (timestamp entry, float32 sentence audio)
+        """
+        iterator = self.stream_audio(sentences)
+        done = object()
+        while True:
+            item = await asyncio.to_thread(next, iterator, done)
+            if item is done:
+                break
+            yield item
+
+    def _timeline(
+        self,
+        sentences: List[Dict[str, any]],
+        audio_stream: Iterator[Tuple[int, Optional[np.ndarray], float, str]],
+        stats: Dict[str, any],
+        silence_duration: Optional[float] = None
+    ) -> Iterator[Tuple[Dict[str, any], np.ndarray]]:
+        """
+        Assign cumulative timestamps to ordered sentence audio.
+
+        Args:
+            sentences: List of dicts with 'text' and 'slide_number' keys
+                (and optionally 'sentence_id' to keep existing ids)
+            audio_stream: Ordered (index, audio, synthesis seconds, source) tuples
+            stats: Dictionary updated with synthesis time, speech samples,
+                per-source counts and total duration
+            silence_duration: Silence between sentences (defaults to the processor's)
+
+        Yields:
+            Tuples of (timestamp entry, sentence audio)
+        """
+        if silence_duration is None:
+            silence_duration = self.silence_duration
+
+        stats.update({
+            'synthesis_seconds': 0.0,
+            'speech_samples': 0,
+            'sources': {'synthesized': 0, 'cache': 0, 'spliced': 0, 'stretched': 0},
+            'total_duration': 0.0
+        })
+        current_time = 0.0
+        # Sample positions mirror the sinks: int(silence * rate) samples between sentences
+        current_sample = 0
+        silence_samples = int(silence_duration * self.sample_rate)
+
+        for idx, sentence_audio, elapsed, source in audio_stream:
+            text = sentences[idx].get('text', '')
+            slide_number = sentences[idx].get('slide_number', 1)
+            stats['synthesis_seconds'] += elapsed
+            stats['sources'][source] += 1
+
+            if source in ('synthesized', 'cache'):
+                print(f"Processing: [{idx+1}/{len(sentences)}] [Slide {slide_number}] {text[:50]}...")
+
+            if sentence_audio is None:
                 continue
 
-        # Merge all audio
-        if all_audio:
-            # Add silence between sentences
-            silence = np.zeros(int(self.silence_duration * self.sample_rate))
-            merged_audio = []
+            # Calculate duration
+            duration = len(sentence_audio) / self.sample_rate
 
-            for audio_segment in all_audio:
-                merged_audio.append(audio_segment)
-                merged_audio.append(silence)
+            # Save timestamp info
+            timestamp_info = {
+                "sentence_id": sentences[idx].get('sentence_id', idx + 1),
+                "text": text,
+                "slide_number": slide_number,
+                "start_time": round(current_time, 3),
+                "end_time": round(current_time + duration, 3),
+                "duration": round(duration, 3),
+                "start_sample": current_sample,
+                "num_samples": len(sentence_audio)
+            }
+            stats['speech_samples'] += len(sentence_audio)
+            stats['total_duration'] = current_time + duration
 
-            # Remove last silence
-            if merged_audio:
-                merged_audio.pop()
+            yield timestamp_info, sentence_audio
 
-            final_audio = np.concatenate(merged_audio)
+            # Update time
+            current_time += duration + silence_duration
+            current_sample += len(sentence_audio) + silence_samples
 
-            # Save WAV file
-            Path(output_audio_path).parent.mkdir(parents = True, exist_ok = True)
-            sf.write(output_audio_path, final_audio, self.sample_rate)
-            print(f"\n✓ Audio file saved: {output_audio_path}")
-            print(f"  - Total duration: {len(final_audio) / self.sample_rate:.2f}s")
+    def _render(
+        self,
+        sentences: List[Dict[str, any]],
+        audio_stream: Iterator[Tuple[int, Optional[np.ndarray], float, str]],
+        output_audio_path: str,
+        output_json_path: Optional[str] = None,
+        export_formats: Optional[List[str]] = None,
+        progressive: bool = False,
+        silence_duration: Optional[float] = None,
+        write_wav: bool = True,
+        segment_dir: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Write ordered sentence audio and build timestamp metadata.
+
+        The WAV and every requested export format are written in a single
+        pass over the synthesized audio.
 
-            # File size
-            wav_size = os.path.getsize(output_audio_path) / (1024 * 1024)  # MB
-            print(f"  - WAV file size: {wav_size:.2f} MB")
+        Args:
+            sentences: List of dicts with 'text' and 'slide_number' keys
+            audio_stream: Ordered (index, audio, synthesis seconds, source) tuples
+            output_audio_path: Output WAV file path
+            output_json_path: Optional JSON metadata output path
+            export_formats: Optional list of additional formats
+            progressive: Write a playable WAV while generating
+            silence_duration: Silence between sentences (defaults to the processor's)
+            write_wav: Write the WAV file (encoded formats are still written)
+            segment_dir: Also write slide-aligned segments and a playlist here
 
-            # Additional format conversion
-            if export_formats:
-                self._convert_formats(output_audio_path, export_formats, wav_size)
+        Returns:
+            Dictionary with metadata and timestamps
+        """
+        if silence_duration is None:
+            silence_duration = self.silence_duration
+
+        timestamp_data = []
+        stats = {}
+        synthesis_start = time.perf_counter()
+        _take_g2p_counters()
+        self.g2p_counters = Counter()
+
+        sinks = []
+        if write_wav and progressive:
+            sinks.append(ProgressiveWavSink(
+                output_audio_path,
+                sample_rate = self.sample_rate,
+                silence_duration = silence_duration,
+                subtype = self.wav_subtype
+            ))
+        elif write_wav:
+            sinks.append(WavSink(
+                output_audio_path,
+                sample_rate = self.sample_rate,
+                silence_duration = silence_duration,
+                subtype = self.wav_subtype
+            ))
+
+        # Encoders receive the same PCM stream, no WAV re-read
+        if export_formats:
+            sinks.extend(create_encoder_sinks(
+                os.path.splitext(output_audio_path)[0],
+                export_formats,
+                sample_rate = self.sample_rate,
+                silence_duration = silence_duration
+            ))
+
+        if segment_dir:
+            sinks.append(SlideSegmentSink(
+                segment_dir,
+                segment_format = self.segment_format,
+                sample_rate = self.sample_rate,
+                silence_duration = silence_duration,
+                max_segment_seconds = self.max_segment_seconds
+            ))
+
+        # Each sentence is written as soon as it is available
+        with MultiSink(sinks) as sink:
+            for timestamp_info, sentence_audio in self._timeline(
+                sentences, audio_stream, stats, silence_duration = silence_duration
+            ):
+                timestamp_data.append(timestamp_info)
+                with span('tts.encode', 'tts', samples = len(sentence_audio)):
+                    sink.write_sentence(timestamp_info, sentence_audio)
+            with span('tts.finalize_outputs', 'tts', outputs = len(sinks)):
+                outputs = sink.close()
+
+        synthesis_report = self._synthesis_report(
+            wall_seconds = time.perf_counter() - synthesis_start,
+            sentence_seconds = stats['synthesis_seconds'],
+            audio_seconds = stats['speech_samples'] / self.sample_rate
+        )
+        self._print_outputs(outputs, write_wav)
 
         # Save JSON metadata
+        sources = stats['sources']
         output_data = {
             "metadata": {
                 "total_sentences": len(timestamp_data),
-                "total_duration": round(current_time - self.silence_duration, 3) if timestamp_data else 0,
+                "total_duration": round(stats['total_duration'], 3),
                 "voice": self.voice,
                 "speed": self.speed,
                 "language_code": self.lang_code,
-                "sample_rate": self.sample_rate
+                "sample_rate": self.sample_rate,
+                "silence_duration": silence_duration,
+                "synthesis": synthesis_report,
+                "g2p": self._g2p_report(self.g2p_counters, stats['synthesis_seconds']),
+                "cache": self._cache_report(sources['cache'], sources['cache'] + sources['synthesized'])
             },
             "timestamps": timestamp_data
         }
 
+        segment_output = next((output for output in outputs if output and 'segments' in output), None)
+        if segment_output:
+            output_data['metadata']['segments'] = {
+                "format": self.segment_format,
+                "count": segment_output['segments'],
+                "manifest": segment_output['path'],
+                "playlist": segment_output['playlist']
+            }
+
         if output_json_path:
-            Path(output_json_path).parent.mkdir(parents = True, exist_ok = True)
-            with open(output_json_path, 'w', encoding = 'utf-8') as f:
-                json.dump(output_data, f, ensure_ascii = False, indent = 2)
-            print(f"✓ Timestamp JSON saved: {output_json_path}")
+            self._save_json(output_data, output_json_path)
 
         return output_data
 
-    def _convert_formats(
+    def generate_speed_variants(
         self,
-        wav_path: str,
-        formats: List[str],
-        wav_size: float
-    ):
+        audio_path: str,
+        json_path: str,
+        speeds: Optional[List[float]] = None,
+        export_formats: Optional[List[str]] = None
+    ) -> Dict[float, Dict[str, any]]:
+        """
+        Produce faster (or slower) versions of a generated lecture by
+        time-stretching instead of re-synthesis.
+
+        Each sentence is stretched independently with pitch-preserving WSOLA
+        and the silence between sentences, as found in the source, is scaled
+        by the same factor, so the rescaled timestamps are exact. Outputs are written next to the
+        source as `<name>_<speed>x.wav` and `<name>_<speed>x.json`.
+
+        Args:
+            audio_path: 1x WAV produced by generate_audio
+            json_path: timestamps.json of the 1x audio
+            speeds: Speed factors relative to the source audio (default 1.25, 1.5, 2.0)
+            export_formats: Optional list of additional formats per variant
+
+        Returns:
+            Dictionary mapping speed factor to variant metadata and timestamps
+        """
+        speeds = speeds or [1.25, 1.5, 2.0]
+
+        with open(json_path, 'r', encoding = 'utf-8') as f:
+            source = json.load(f)
+
+        # Keep original ids and slide numbers
+        entries = source['timestamps']
+        sentences = [
+            {
+                'sentence_id': entry['sentence_id'],
+                'text': entry['text'],
+                'slide_number': entry['slide_number']
+            }
+            for entry in entries
+        ]
+        audio_base = os.path.splitext(audio_path)[0]
+        json_base = os.path.splitext(json_path)[0]
+
+        variants = {}
+        for speed in speeds:
+            print(f"\nCreating {speed:g}x variant by time-stretching...")
+            with sf.SoundFile(audio_path) as source_audio:
+                output_data = self._render(
+                    sentences,
+                    self._stretch_ordered(entries, source_audio, speed),
+                    output_audio_path = f"{audio_base}_{speed:g}x.wav",
+                    export_formats = export_formats,
+                    silence_duration = self._source_silence(source) / speed
+                )
+
+            metadata = output_data['metadata']
+            metadata['speed'] = round(source['metadata'].get('speed', self.speed) * speed, 4)
+            metadata['time_stretch'] = {
+                "method": "wsola",
+                "factor": speed,
+                "source": audio_path
+            }
+            del metadata['cache']
+            self._save_json(output_data, f"{json_base}_{speed:g}x.json")
+            variants[speed] = output_data
+
+        return variants
+
+    def _source_silence(self, source: Dict[str, any]) -> float:
+        """
+        Silence between sentences of a generated lecture, in seconds.
+
+        Taken from the sample positions of the first two sentences, else
+        from the metadata or the rounded timestamps of older files; the
+        processor's own setting is only used for single-sentence files
+        without metadata.
+        """
+        entries = source['timestamps']
+        if len(entries) > 1 and 'start_sample' in entries[0] and 'start_sample' in entries[1]:
+            gap = entries[1]['start_sample'] - entries[0]['start_sample'] - entries[0]['num_samples']
+            return gap / self.sample_rate
+        if 'silence_duration' in source['metadata']:
+            return source['metadata']['silence_duration']
+        if len(entries) > 1:
+            return round(entries[1]['start_time'] - entries[0]['end_time'], 3)
+        return self.silence_duration
+
+    def _stretch_ordered(
+        self,
+        entries: List[Dict[str, any]],
+        source_audio: sf.SoundFile,
+        speed: float
+    ) -> Iterator[Tuple[int, Optional[np.ndarray], float, str]]:
         """
-        Convert WAV to additional formats using ffmpeg.
+        Yield time-stretched sentence audio read from the source recording.
 
         Args:
-            wav_path: Input WAV file path
-            formats: List of formats to convert to
-            wav_size: Original WAV file size in MB
-        """
-        print(f"\nConverting to additional formats...")
-        base_path = os.path.splitext(wav_path)[0]
-
-        for fmt in formats:
-            if fmt.lower() == 'opus':
-                output_path = f"{base_path}.opus"
-                cmd = [
-                    'ffmpeg', '-y', '-i', wav_path,
-                    '-c:a', 'libopus',
-                    '-b:a', '64k',
-                    '-compression_level', '10',
-                    output_path
-                ]
-
-            elif fmt.lower() == 'aac':
-                output_path = f"{base_path}.m4a"
-                cmd = [
-                    'ffmpeg', '-y', '-i', wav_path,
-                    '-c:a', 'aac',
-                    '-b:a', '192k',
-                    '-movflags', '+faststart',
-                    output_path
-                ]
+            entries: Timestamp entries of the source audio
+            source_audio: Open source WAV file
+            speed: Speed factor
 
+        Yields:
+            Tuples of (index, audio, stretch seconds, 'stretched')
+        """
+        for idx, entry in enumerate(entries):
+            if 'start_sample' in entry:
+                start, num_samples = entry['start_sample'], entry['num_samples']
             else:
-                print(f"  ⚠ Unsupported format: {fmt}")
+                # Timestamps written before sample positions were recorded
+                start = int(round(entry['start_time'] * self.sample_rate))
+                num_samples = int(round(entry['duration'] * self.sample_rate))
+            source_audio.seek(start)
+            sentence_audio = source_audio.read(num_samples, dtype = 'float32')
+
+            stretch_start = time.perf_counter()
+            stretched = wsola_stretch(sentence_audio, speed, self.sample_rate)
+            yield idx, stretched, time.perf_counter() - stretch_start, 'stretched'
+
+    def benchmark_speed_variants(
+        self,
+        sentences: List[Dict[str, any]],
+        speeds: Optional[List[float]] = None
+    ) -> Dict[str, any]:
+        """
+        Compare time-stretching against re-synthesis at a different speed.
+
+        For each speed, reports throughput (seconds of audio produced per
+        second of compute) of both methods, the duration ratio between them,
+        and the log-spectral distance (dB) between their long-term average
+        spectra as a coarse timbre/quality measure.
+
+        Args:
+            sentences: List of dicts with 'text' keys (a representative sample)
+            speeds: Speed factors to benchmark (default 1.25, 1.5, 2.0)
+
+        Returns:
+            Dictionary with per-speed benchmark results
+        """
+        speeds = speeds or [1.25, 1.5, 2.0]
+        pipeline = self.pipeline or kokoro.KPipeline(lang_code = self.lang_code)
+        texts = [sentence_info.get('text', '') for sentence_info in sentences]
+
+        base_audio = [_synthesize_text(pipeline, text, self.voice, self.speed, self.phonemes) for text in texts]
+        pairs = [(text, audio) for text, audio in zip(texts, base_audio) if audio is not None]
+
+        results = {}
+        for speed in speeds:
+            stretch_seconds = 0.0
+            synth_seconds = 0.0
+            stretched_all = []
+            synthesized_all = []
+
+            for text, audio in pairs:
+                start = time.perf_counter()
+                stretched_all.append(wsola_stretch(audio, speed, self.sample_rate))
+                stretch_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                synthesized = _synthesize_text(pipeline, text, self.voice, self.speed * speed, self.phonemes)
+                synth_seconds += time.perf_counter() - start
+                if synthesized is not None:
+                    synthesized_all.append(synthesized)
+
+            if not stretched_all or not synthesized_all:
+                print(f"⚠ {speed:g}x: no sentence could be synthesized, skipping")
+                results[f"{speed:g}x"] = None
                 continue
+            stretched = np.concatenate(stretched_all)
+            synthesized = np.concatenate(synthesized_all)
 
-            try:
-                subprocess.run(cmd, check = True, capture_output = True)
-                compressed_size = os.path.getsize(output_path) / (1024 * 1024)
-                compression_ratio = (1 - compressed_size / wav_size) * 100
-                print(f"  ✓ {fmt.upper()} conversion complete: {output_path}")
-                print(f"    - File size: {compressed_size:.2f} MB (compression: {compression_ratio:.1f}%)")
-            except subprocess.CalledProcessError as e:
-                print(f"  ✗ {fmt.upper()} conversion failed: {e.stderr.decode() if e.stderr else str(e)}")
-            except FileNotFoundError:
-                print(f"  ✗ ffmpeg not found. Install ffmpeg to use format conversion.")
-                break
+            results[f"{speed:g}x"] = {
+                "stretch_throughput": round(len(stretched) / self.sample_rate / stretch_seconds, 1),
+                "resynthesis_throughput": round(len(synthesized) / self.sample_rate / synth_seconds, 1),
+                "duration_ratio": round(len(stretched) / len(synthesized), 4),
+                "spectral_distance_db": round(self._spectral_distance(stretched, synthesized), 3)
+            }
+            print(f"{speed:g}x: {results[f'{speed:g}x']}")
+
+        return results
+
+    def _spectral_distance(self, a: np.ndarray, b: np.ndarray, n_fft: int = 1024) -> float:
+        """RMS distance in dB between the long-term average spectra of two signals."""
+        def average_spectrum(audio):
+            frames = sliding_window_view(audio, n_fft)[::n_fft // 2] * np.hanning(n_fft)
+            return np.mean(np.abs(np.fft.rfft(frames, axis = 1)) ** 2, axis = 0) + 1e-10
+
+        difference = 10 * np.log10(average_spectrum(a)) - 10 * np.log10(average_spectrum(b))
+        return float(np.sqrt(np.mean(difference ** 2)))
+
+    def _save_json(self, output_data: Dict[str, any], output_json_path: str):
+        """Write timestamp metadata to a JSON file."""
+        Path(output_json_path).parent.mkdir(parents = True, exist_ok = True)
+        temp_path = f"{output_json_path}.partial"
+        with open(temp_path, 'w', encoding = 'utf-8') as f:
+            json.dump(output_data, f, ensure_ascii = False, indent = 2)
+        os.replace(temp_path, output_json_path)
+        print(f"✓ Timestamp JSON saved: {output_json_path}")
+
+    def _synthesis_report(
+        self,
+        wall_seconds: float,
+        sentence_seconds: float,
+        audio_seconds: float
+    ) -> Dict[str, any]:
+        """
+        Build the real-time-factor report for a synthesis run.
+
+        The serial estimate is the sum of per-sentence synthesis times. With
+        several workers those times are measured under contention, so the
+        reported speedup is a conservative estimate.
+
+        Args:
+            wall_seconds: Elapsed time of the synthesis loop
+            sentence_seconds: Sum of per-sentence synthesis times
+            audio_seconds: Duration of the generated speech
+
+        Returns:
+            Dictionary with timing, real-time factors and speedup
+        """
+        report = {
+            "workers": self.num_workers,
+            "wall_time": round(wall_seconds, 3),
+            "serial_time_estimate": round(sentence_seconds, 3),
+            "real_time_factor": round(wall_seconds / audio_seconds, 4) if audio_seconds else None,
+            "serial_real_time_factor": round(sentence_seconds / audio_seconds, 4) if audio_seconds else None,
+            "speedup": round(sentence_seconds / wall_seconds, 2) if wall_seconds else None
+        }
+
+        print(f"\nSynthesis: {wall_seconds:.1f}s for {audio_seconds:.1f}s of audio "
+              f"(RTF {report['real_time_factor']}, {self.num_workers} workers, "
+              f"speedup {report['speedup']}x over serial estimate)")
+        return report
+
+    def _cache_report(self, hits: int, total: int) -> Dict[str, any]:
+        """Hit-rate metrics of the sentence audio cache."""
+        if self.cache is None:
+            return {"enabled": False}
+
+        report = {
+            "enabled": True,
+            "hits": hits,
+            "misses": total - hits,
+            "hit_rate": round(hits / total, 4) if total else 0.0
+        }
+        print(f"Cache: {hits}/{total} sentences reused ({report['hit_rate'] * 100:.1f}% hit rate)")
+        return report
+
+    def _g2p_report(self, counters: Counter, synthesis_seconds: float) -> Dict[str, any]:
+        """
+        Split synthesis time into G2P and model time, with phoneme cache metrics.
+
+        Saved time is estimated from the average cost of a cache miss, since
+        a hit by definition skips the measurement.
+
+        Args:
+            counters: G2P counters collected during synthesis
+            synthesis_seconds: Sum of per-sentence synthesis times
+
+        Returns:
+            Dictionary with per-stage timing and hit counts
+        """
+        g2p_seconds = float(counters['g2p_seconds'])
+        phrase_hits, phrase_misses = counters['phrase_hits'], counters['phrase_misses']
+        word_hits, word_misses = counters['word_hits'], counters['word_misses']
+
+        saved = 0.0
+        if phrase_misses:
+            saved += phrase_hits * g2p_seconds / phrase_misses
+        if word_misses:
+            saved += word_hits * counters['fallback_seconds'] / word_misses
+
+        report = {
+            "phoneme_cache": self.phonemes is not None,
+            "g2p_seconds": round(g2p_seconds, 3),
+            "model_seconds": round(max(0.0, synthesis_seconds - g2p_seconds), 3),
+            "phrase_hits": phrase_hits,
+            "phrase_misses": phrase_misses,
+            "word_hits": word_hits,
+            "word_misses": word_misses,
+            "estimated_seconds_saved": round(saved, 3)
+        }
+        if self.phonemes is None:
+            print(f"G2P: {g2p_seconds:.2f}s of {synthesis_seconds:.2f}s synthesis (phoneme cache disabled)")
+            return report
+        print(f"G2P: {g2p_seconds:.2f}s of {synthesis_seconds:.2f}s synthesis, "
+              f"{phrase_hits}/{phrase_hits + phrase_misses} sentences and "
+              f"{word_hits}/{word_hits + word_misses} fallback words from the phoneme cache "
+              f"(~{saved:.2f}s saved)")
+        return report
+
+    def _print_outputs(self, outputs: List[Dict[str, any]], write_wav: bool):
+        """Print written files with sizes and compression relative to 16-bit WAV."""
+        outputs = [output for output in outputs if output]
+        if not outputs:
+            return
+
+        first = next((output for output in outputs if 'duration' in output), None)
+        pcm_size = first['duration'] * self.sample_rate * 2 / (1024 * 1024) if first else 0
+
+        for idx, output in enumerate(outputs):
+            if 'segments' in output:
+                print(f"  ✓ {output['segments']} slide segments: {output['playlist'] or output['path']}")
+            elif write_wav and idx == 0:
+                print(f"\n✓ Audio file saved: {output['path']}")
+                print(f"  - Total duration: {output['duration']:.2f}s")
+                print(f"  - WAV file size: {output['size_mb']:.2f} MB")
+            elif 'error' in output:
+                print(f"  ✗ Encoding failed: {output['path']}: {output['error']}")
+            else:
+                compression_ratio = (1 - output['size_mb'] / pcm_size) * 100 if pcm_size else 0
+                print(f"  ✓ Encoded: {output['path']}")
+                print(f"    - File size: {output['size_mb']:.2f} MB (compression: {compression_ratio:.1f}%)")
 
     def generate_from_matching_results(
         self,
         matching_results: List[Dict[str, any]],
         output_audio_path: str = "lecture_audio.wav",
         output_json_path: Optional[str] = None,
-        export_formats: Optional[List[str]] = None
+        export_formats: Optional[List[str]] = None,
+        incremental: bool = False,
+        write_wav: bool = True,
+        segment_dir: Optional[str] = None
     ) -> Dict[str, any]:
         """
         Generate audio from slide matching results.
@@ -255,6 +1412,10 @@ class TTSProcessor:
             output_audio_path: Output WAV file path
             output_json_path: Optional JSON metadata output path
             export_formats: Optional list of additional formats
+            incremental: Only synthesize sentences that changed since the
+                existing output at output_audio_path/output_json_path
+            write_wav: Write the WAV file in addition to export_formats
+            segment_dir: Optional directory for slide-aligned segments
 
         Returns:
             Dictionary with metadata and timestamps
@@ -267,11 +1428,23 @@ class TTSProcessor:
                 'slide_number': result['matched_page']
             })
 
+        if incremental and output_json_path:
+            return self.generate_incremental(
+                sentences = sentences,
+                previous_json_path = output_json_path,
+                previous_audio_path = output_audio_path,
+                export_formats = export_formats,
+                write_wav = write_wav,
+                segment_dir = segment_dir
+            )
+
         return self.generate_audio(
             sentences = sentences,
             output_audio_path = output_audio_path,
             output_json_path = output_json_path,
-            export_formats = export_formats
+            export_formats = export_formats,
+            write_wav = write_wav,
+            segment_dir = segment_dir
         )
 
 